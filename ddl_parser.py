@@ -0,0 +1,546 @@
+"""SQL DDL script splitting and statement parsing for PostgreSQL, Oracle and SQL Server.
+
+Kept out of streamlit_app.py so worker processes can import it without running the app.
+"""
+import codecs
+import io
+import re
+
+# Statement splitting
+DDL_CHUNK_SIZE = 1024 * 1024
+DDL_DEFAULT_SCHEMAS = {"PostgreSQL": "public", "SQL Server": "dbo", "Oracle": ""}
+
+SQL_IDENTIFIER = r'(?:"(?:[^"]|"")+"|\[(?:[^\]]|\]\])+\]|`[^`]+`|[A-Za-z_#@][\w$#@]*)'
+SQL_QUALIFIED_NAME = rf'{SQL_IDENTIFIER}(?:\s*\.\s*{SQL_IDENTIFIER}){{0,2}}'
+ROUTINE_BLOCK_START = re.compile(
+    r"(?:CREATE|ALTER)\s+(?:OR\s+(?:REPLACE|ALTER)\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    r"(?:PROCEDURE|PROC|FUNCTION|PACKAGE|TRIGGER|TYPE\s+BODY)\b", re.I)
+
+def detect_ddl_dialect(sample):
+    """Guess the SQL dialect of a script from its first chunk"""
+    if re.search(r"^[ \t]*GO[ \t]*$", sample, re.M | re.I) or re.search(r"\[dbo\]|\bNVARCHAR\b|\bIDENTITY\s*\(", sample, re.I):
+        return "SQL Server"
+    if re.search(r"\bVARCHAR2\b|\bNUMBER\s*\(|^[ \t]*/[ \t]*$", sample, re.M | re.I):
+        return "Oracle"
+    return "PostgreSQL"
+
+def iter_upload_text(file, chunk_size=DDL_CHUNK_SIZE):
+    """Decode an uploaded file chunk by chunk (UTF-8 or BOM-marked UTF-16)"""
+    file.seek(0)
+    head = file.read(chunk_size)
+    encoding = "utf-16" if head[:2] in (b"\xff\xfe", b"\xfe\xff") else "utf-8-sig"
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    while head:
+        yield decoder.decode(head)
+        head = file.read(chunk_size)
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+class DDLStatementSplitter:
+    """Incrementally split a SQL script into statements.
+
+    Text is fed in arbitrary chunks; complete statements are yielded as soon as their
+    terminator is seen (``;``, a ``GO`` line for SQL Server, a ``/`` line for Oracle).
+    Quotes, comments and PostgreSQL dollar quoting are tracked across chunk boundaries,
+    and only the unfinished statement is kept in memory.
+    """
+
+    # Unscanned text kept at the end of each chunk, long enough to hold a partial token
+    # (``--``, ``/*``, a quote, a dollar tag or a ``GO`` / ``/`` line)
+    LOOKAHEAD = 128
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        tokens = [r"(?P<single>')", r'(?P<double>")', r"(?P<line_comment>--)", r"(?P<block_comment>/\*)",
+                  r"(?P<semicolon>;)"]
+        if dialect == "PostgreSQL":
+            tokens.append(r"(?P<dollar>\$(?:[A-Za-z_][A-Za-z_0-9]*)?\$)")
+        if dialect == "SQL Server":
+            tokens += [r"(?P<bracket>\[)", r"(?P<go>^[ \t]*GO[ \t]*(?:\r?\n|$))"]
+        if dialect == "Oracle":
+            tokens.append(r"(?P<slash>^[ \t]*/[ \t]*(?:\r?\n|$))")
+        self.token_re = re.compile("|".join(tokens), re.M | re.I)
+        self.closers = {"single": "'", "double": '"', "bracket": "]", "line_comment": "\n", "block_comment": "*/"}
+        self.buffer = ""
+        self.parts = []
+        self.start = 0
+        self.pos = 0
+        self.mode = None
+        self.closer = None
+
+    def feed(self, text):
+        """Add text and yield every statement completed by it"""
+        if self.pos:
+            # Scanned text of the unfinished statement moves to ``parts``; the buffer keeps
+            # one scanned character so ``^`` still only matches at a real line start
+            if self.pos > self.start:
+                self.parts.append(self.buffer[self.start:self.pos])
+            self.buffer = self.buffer[self.pos - 1:] + text
+            self.start = self.pos = 1
+        else:
+            self.buffer += text
+        yield from self.scan(len(self.buffer) - self.LOOKAHEAD)
+
+    def close(self):
+        """Flush the final statement at end of input"""
+        yield from self.scan(len(self.buffer))
+        statement = "".join(self.parts) + self.buffer[self.start:]
+        self.buffer, self.parts, self.start, self.pos = "", [], 0, 0
+        statement = statement.strip()
+        if strip_sql_comments(statement).strip():
+            yield statement
+
+    def emit(self, end, resume):
+        """Cut the current statement at ``end`` and continue scanning from ``resume``"""
+        statement = ("".join(self.parts) + self.buffer[self.start:end]).strip()
+        self.parts = []
+        self.start = self.pos = resume
+        return statement if strip_sql_comments(statement).strip() else None
+
+    def is_routine_block(self, end):
+        head = ""
+        for part in self.parts:
+            head += part
+            if len(head) >= 400:
+                break
+        head += self.buffer[self.start:min(end, self.start + 400)]
+        head = strip_sql_comments(head[:400]).lstrip()
+        return bool(ROUTINE_BLOCK_START.match(head))
+
+    def scan(self, limit):
+        # Matches may run past ``limit`` into the lookahead, but only ones starting before it count
+        buffer = self.buffer
+        end = len(buffer)
+        while self.pos < limit:
+            if self.mode is not None:
+                idx = buffer.find(self.closer, self.pos, end)
+                if idx == -1 or idx >= limit:
+                    self.pos = limit
+                    return
+                if self.mode in ("single", "double", "bracket") and idx + 1 < end and buffer.startswith(self.closer, idx + 1):
+                    # Doubled quote is an escaped quote
+                    self.pos = idx + 2
+                    continue
+                self.pos = idx + len(self.closer)
+                self.mode = None
+                continue
+
+            match = self.token_re.search(buffer, self.pos, end)
+            if match is None or match.start() >= limit:
+                self.pos = limit
+                return
+            kind = match.lastgroup
+            if kind in self.closers:
+                self.mode, self.closer = kind, self.closers[kind]
+                self.pos = match.end()
+            elif kind == "dollar":
+                self.mode, self.closer = kind, match.group()
+                self.pos = match.end()
+            elif kind == "semicolon" and self.dialect != "PostgreSQL" and self.is_routine_block(match.start()):
+                # Semicolons inside T-SQL / PL/SQL routine bodies; the batch ends at GO or /
+                self.pos = match.end()
+            else:
+                statement = self.emit(match.start(), match.end())
+                if statement:
+                    yield statement
+
+SQL_COMMENT_OR_LITERAL = re.compile(r"""('(?:[^']|'')*'|"(?:[^"]|"")*")|--[^\n]*|/\*.*?\*/""", re.S)
+SQL_NESTING_CHARS = re.compile(r"""[()'"\[\]]""")
+
+def strip_sql_comments(text):
+    """Remove -- and /* */ comments outside of quoted strings and identifiers"""
+    if "--" not in text and "/*" not in text:
+        return text
+    return SQL_COMMENT_OR_LITERAL.sub(lambda m: m.group(1) or " ", text)
+
+def mask_nested_sql(text):
+    """Blank out everything inside parentheses and quotes, keeping character positions aligned"""
+    pieces = []
+    depth = 0
+    quote = None
+    last = 0
+    for match in SQL_NESTING_CHARS.finditer(text):
+        ch = match.group()
+        i = match.start()
+        if quote:
+            if ch == quote:
+                quote = None
+                if depth == 0:
+                    pieces.append(" " * (i + 1 - last))
+                    last = i + 1
+        elif ch in "'\"[":
+            if depth == 0:
+                pieces.append(text[last:i])
+                last = i
+            quote = "]" if ch == "[" else ch
+        elif ch == "(":
+            if depth == 0:
+                pieces.append(text[last:i])
+                last = i
+            depth += 1
+        elif ch == ")" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                pieces.append(" " * (i + 1 - last))
+                last = i + 1
+    pieces.append(text[last:] if depth == 0 and not quote else " " * (len(text) - last))
+    return "".join(pieces)
+
+def split_top_level(text, separator=","):
+    """Split on a separator that is not nested in parentheses or quotes"""
+    masked = mask_nested_sql(text)
+    parts = []
+    last = 0
+    idx = masked.find(separator)
+    while idx != -1:
+        parts.append(text[last:idx].strip())
+        last = idx + 1
+        idx = masked.find(separator, last)
+    parts.append(text[last:].strip())
+    return [p for p in parts if p]
+
+def find_closing_paren(text, open_idx):
+    """Index of the parenthesis closing the one at ``open_idx``"""
+    depth = 0
+    quote = None
+    for match in SQL_NESTING_CHARS.finditer(text, open_idx):
+        ch = match.group()
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "'\"[":
+            quote = "]" if ch == "[" else ch
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return match.start()
+    return len(text)
+
+def unquote_identifier(identifier):
+    identifier = identifier.strip()
+    if len(identifier) >= 2 and identifier[0] + identifier[-1] in ('""', "[]", "``"):
+        inner = identifier[1:-1]
+        return inner.replace('""', '"') if identifier[0] == '"' else inner.replace("]]", "]")
+    return identifier
+
+SQL_IDENTIFIER_RE = re.compile(SQL_IDENTIFIER)
+SQL_IDENTIFIER_FULL_RE = re.compile(SQL_IDENTIFIER + r"\Z")
+
+def split_qualified_name(qualified_name):
+    """Split [db.]schema.name into (schema, name); schema is None when absent"""
+    parts = [unquote_identifier(p) for p in SQL_IDENTIFIER_RE.findall(qualified_name)]
+    if len(parts) >= 2:
+        return parts[-2], parts[-1]
+    return None, parts[-1] if parts else ""
+
+INDEX_COLUMN_SUFFIX = re.compile(r"\s+(?:ASC|DESC)\b.*$|\s+NULLS\s+(?:FIRST|LAST)$", re.I | re.S)
+
+def parse_identifier_list(text):
+    """Parse '(a, "b" DESC, [c])' into plain column names/expressions"""
+    text = text.strip()
+    if text.startswith("(") and text.endswith(")"):
+        text = text[1:-1]
+    names = []
+    for part in split_top_level(text):
+        part = INDEX_COLUMN_SUFFIX.sub("", part).strip()
+        names.append(unquote_identifier(part) if SQL_IDENTIFIER_FULL_RE.match(part) else part)
+    return names
+
+DDL_TYPE_BRACKETS = re.compile(r"\[([^\]]+)\]")
+DDL_TYPE_SPACING = re.compile(r"\s*([(,])\s*|\s+(\))|\s+")
+
+def normalize_ddl_type(type_text):
+    """Upper-case a column type and drop identifier quoting: [nvarchar] (50) -> NVARCHAR(50)"""
+    if "[" in type_text:
+        type_text = DDL_TYPE_BRACKETS.sub(r"\1", type_text)
+    return DDL_TYPE_SPACING.sub(lambda m: m.group(1) or m.group(2) or " ", type_text.strip()).upper()
+
+COLUMN_CONSTRAINT_KEYWORDS = re.compile(
+    r"\b(NOT\s+NULL|NULL|DEFAULT|CONSTRAINT|PRIMARY\s+KEY|UNIQUE|REFERENCES|CHECK|COLLATE|GENERATED|"
+    r"ENABLE|DISABLE|ENCRYPT|ROWGUIDCOL|SPARSE|FILESTREAM|WITH|VISIBLE|INVISIBLE)\b", re.I)
+TABLE_CONSTRAINT_START = re.compile(r"(?:CONSTRAINT\s|PRIMARY\s+KEY|UNIQUE\b|FOREIGN\s+KEY|CHECK\b|EXCLUDE\b)", re.I)
+TABLE_ELEMENT_SKIPPED = re.compile(r"(?:LIKE|INDEX|KEY|PERIOD)\b", re.I)
+CONSTRAINT_NAME_PREFIX = re.compile(rf"CONSTRAINT\s+({SQL_IDENTIFIER})\s+", re.I)
+PRIMARY_KEY_START = re.compile(r"PRIMARY\s+KEY", re.I)
+UNIQUE_START = re.compile(r"UNIQUE\b", re.I)
+CHECK_START = re.compile(r"CHECK\b", re.I)
+EXCLUDE_START = re.compile(r"EXCLUDE\b", re.I)
+PAREN_LIST = re.compile(r"\(([^)]*)\)")
+FOREIGN_KEY_CLAUSE = re.compile(
+    rf"FOREIGN\s+KEY\s*\(([^)]*)\)\s*REFERENCES\s+({SQL_QUALIFIED_NAME})\s*(?:\(([^)]*)\))?", re.I)
+REFERENCES_CLAUSE = re.compile(rf"({SQL_QUALIFIED_NAME})\s*(?:\(([^)]*)\))?")
+COLUMN_NAME_PREFIX = re.compile(rf"({SQL_IDENTIFIER})\s+")
+WHITESPACE_RUN = re.compile(r"\s+")
+
+def top_level_keyword_positions(text):
+    """Column-constraint keywords that are not inside parentheses or quotes"""
+    return list(COLUMN_CONSTRAINT_KEYWORDS.finditer(mask_nested_sql(text)))
+
+def parse_foreign_key_reference(qualified_name, columns):
+    """(referenced schema, 'table(col, ...)') for a REFERENCES target"""
+    ref_schema, ref_table = split_qualified_name(qualified_name)
+    return ref_schema, f"{ref_table}({', '.join(parse_identifier_list(columns or ''))})"
+
+def parse_check_definition(clause):
+    open_idx = clause.find("(")
+    if open_idx == -1:
+        return clause.strip()
+    return clause[open_idx + 1:find_closing_paren(clause, open_idx)].strip()
+
+def parse_constraint_clause(clause, table_name, dialect):
+    """Parse a table-level (or ALTER TABLE ADD) constraint clause into a constraint dict"""
+    name = None
+    match = CONSTRAINT_NAME_PREFIX.match(clause)
+    if match:
+        name = unquote_identifier(match.group(1))
+        clause = clause[match.end():]
+
+    for start, constraint_type, suffix in ((PRIMARY_KEY_START, "PRIMARY KEY", "pkey"), (UNIQUE_START, "UNIQUE", "key")):
+        if start.match(clause):
+            columns = PAREN_LIST.search(clause)
+            return {"constraint_name": name or f"{table_name}_{suffix}", "constraint_type": constraint_type,
+                    "columns": parse_identifier_list(columns.group(1)) if columns else []}
+    match = FOREIGN_KEY_CLAUSE.match(clause)
+    if match:
+        ref_schema, references = parse_foreign_key_reference(match.group(2), match.group(3))
+        return {"constraint_name": name or f"{table_name}_fkey", "constraint_type": "FOREIGN KEY",
+                "columns": parse_identifier_list(match.group(1)),
+                "references": references, "references_schema": ref_schema}
+    if CHECK_START.match(clause):
+        return {"constraint_name": name or f"{table_name}_check", "constraint_type": "CHECK",
+                "definition": parse_check_definition(clause[5:])}
+    if EXCLUDE_START.match(clause):
+        return {"constraint_name": name or f"{table_name}_excl", "constraint_type": "EXCLUDE", "definition": clause.strip()}
+    return None
+
+def parse_column_definition(definition, table_name, dialect):
+    """Parse a column definition; returns (column dict, inline constraints)"""
+    match = COLUMN_NAME_PREFIX.match(definition)
+    if not match:
+        return None, []
+    column_name = unquote_identifier(match.group(1))
+    rest = definition[match.end():]
+
+    keywords = top_level_keyword_positions(rest)
+    type_end = keywords[0].start() if keywords else len(rest)
+    column = {"column_name": column_name, "data_type": normalize_ddl_type(rest[:type_end]), "is_nullable": True,
+              "default": None, "description": ""}
+    constraints = []
+    constraint_name = None
+    for i, keyword in enumerate(keywords):
+        word = WHITESPACE_RUN.sub(" ", keyword.group(1).upper())
+        segment_end = keywords[i + 1].start() if i + 1 < len(keywords) else len(rest)
+        argument = rest[keyword.end():segment_end].strip()
+        if word == "NOT NULL" or word == "PRIMARY KEY":
+            column["is_nullable"] = False
+        if word == "DEFAULT":
+            column["default"] = strip_sqlserver_default(argument) if dialect == "SQL Server" else argument
+        elif word == "CONSTRAINT":
+            constraint_name = unquote_identifier(argument.split()[0]) if argument else None
+            continue
+        elif word == "PRIMARY KEY":
+            constraints.append({"constraint_name": constraint_name or f"{table_name}_pkey",
+                                "constraint_type": "PRIMARY KEY", "columns": [column_name]})
+        elif word == "UNIQUE":
+            constraints.append({"constraint_name": constraint_name or f"{table_name}_{column_name}_key",
+                                "constraint_type": "UNIQUE", "columns": [column_name]})
+        elif word == "REFERENCES":
+            ref = REFERENCES_CLAUSE.match(argument)
+            if ref:
+                ref_schema, references = parse_foreign_key_reference(ref.group(1), ref.group(2))
+                constraints.append({"constraint_name": constraint_name or f"{table_name}_{column_name}_fkey",
+                                    "constraint_type": "FOREIGN KEY", "columns": [column_name],
+                                    "references": references, "references_schema": ref_schema})
+        elif word == "CHECK":
+            constraints.append({"constraint_name": constraint_name or f"{table_name}_{column_name}_check",
+                                "constraint_type": "CHECK", "definition": parse_check_definition(argument)})
+        constraint_name = None
+    return column, constraints
+
+def constraint_index(constraint):
+    """Primary keys and unique constraints are backed by an index, as in the live catalogs"""
+    return {"index_name": constraint["constraint_name"], "columns": list(constraint["columns"]),
+            "index_type": constraint["constraint_type"], "is_unique": True}
+
+CREATE_TABLE_HEAD = re.compile(
+    rf"CREATE\s+(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMP|TEMPORARY|UNLOGGED)\s+)?TABLE\s+"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?({SQL_QUALIFIED_NAME})\s*\(", re.I)
+CREATE_INDEX_HEAD = re.compile(
+    rf"CREATE\s+(UNIQUE\s+)?(?:(CLUSTERED|NONCLUSTERED|BITMAP)\s+)?INDEX\s+(?:CONCURRENTLY\s+)?"
+    rf"(?:IF\s+NOT\s+EXISTS\s+)?({SQL_QUALIFIED_NAME})\s+ON\s+(?:ONLY\s+)?({SQL_QUALIFIED_NAME})\s*"
+    rf"(?:USING\s+(\w+)\s*)?\(", re.I)
+CREATE_VIEW_HEAD = re.compile(
+    rf"CREATE\s+(?:OR\s+(?:REPLACE|ALTER)\s+)?(?:(?:NO\s+)?FORCE\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    rf"(MATERIALIZED\s+)?VIEW\s+(?:IF\s+NOT\s+EXISTS\s+)?({SQL_QUALIFIED_NAME})", re.I)
+VIEW_AS_KEYWORD = re.compile(r"\bAS\b", re.I)
+ALTER_TABLE_HEAD = re.compile(rf"ALTER\s+TABLE\s+(?:IF\s+EXISTS\s+)?(?:ONLY\s+)?({SQL_QUALIFIED_NAME})\s+(.*)$",
+                              re.I | re.S)
+ALTER_TABLE_CHECK_OPTION = re.compile(r"WITH\s+(?:NO)?CHECK\s+", re.I)
+ALTER_COLUMN_DEFAULT = re.compile(rf"ALTER\s+(?:COLUMN\s+)?({SQL_IDENTIFIER})\s+SET\s+DEFAULT\s+(.*)$", re.I | re.S)
+ALTER_TABLE_ADD = re.compile(r"ADD\s+(?:COLUMN\s+)?(.*)$", re.I | re.S)
+COMMENT_ON_HEAD = re.compile(rf"COMMENT\s+ON\s+(TABLE|VIEW|COLUMN)\s+({SQL_QUALIFIED_NAME})\s+IS\s+'((?:[^']|'')*)'",
+                             re.I | re.S)
+CREATE_ROUTINE_HEAD = re.compile(
+    rf"(?:CREATE|ALTER)\s+(?:OR\s+(?:REPLACE|ALTER)\s+)?(?:(?:NON)?EDITIONABLE\s+)?"
+    rf"(FUNCTION|PROCEDURE|PROC)\s+({SQL_QUALIFIED_NAME})\s*", re.I)
+SQLSERVER_PARAMETERS = re.compile(r"(.*?)\bAS\b", re.I | re.S)
+FUNCTION_RETURNS = re.compile(
+    r"\s*RETURNS?\s+(.+?)(?:\s+(?:AS|IS|LANGUAGE|WITH|BEGIN|DETERMINISTIC|PIPELINED)\b|$)", re.I | re.S)
+
+def parse_create_table(text, match, dialect):
+    schema, name = split_qualified_name(match.group(1))
+    open_idx = match.end() - 1
+    body = text[open_idx + 1:find_closing_paren(text, open_idx)]
+    table = {"table_name": name, "schema": schema, "table_type": "TABLE" if dialect == "Oracle" else "BASE TABLE",
+             "row_count": 0, "size_mb": 0.0, "description": "", "columns": [], "indexes": [], "constraints": []}
+    for element in split_top_level(body):
+        if TABLE_CONSTRAINT_START.match(element):
+            constraint = parse_constraint_clause(element, name, dialect)
+            if constraint:
+                table["constraints"].append(constraint)
+        elif not TABLE_ELEMENT_SKIPPED.match(element):
+            column, constraints = parse_column_definition(element, name, dialect)
+            if column:
+                table["columns"].append(column)
+                table["constraints"].extend(constraints)
+    for constraint in table["constraints"]:
+        if constraint["constraint_type"] in ("PRIMARY KEY", "UNIQUE"):
+            table["indexes"].append(constraint_index(constraint))
+    return [("table", (schema, name), table)]
+
+def parse_alter_table(match, dialect):
+    schema, table_name = split_qualified_name(match.group(1))
+    target = (schema, table_name)
+    action = ALTER_TABLE_CHECK_OPTION.sub("", match.group(2).strip(), count=1)
+    default = ALTER_COLUMN_DEFAULT.match(action)
+    if default:
+        return [("default", target, (unquote_identifier(default.group(1)), default.group(2).strip()))]
+    add = ALTER_TABLE_ADD.match(action)
+    if not add:
+        return []
+    clauses = add.group(1).strip()
+    if clauses.startswith("(") and find_closing_paren(clauses, 0) == len(clauses) - 1:
+        clauses = clauses[1:-1]
+    events = []
+    for clause in split_top_level(clauses):
+        if TABLE_CONSTRAINT_START.match(clause):
+            constraint = parse_constraint_clause(clause, table_name, dialect)
+            if constraint:
+                events.append(("constraint", target, constraint))
+                if constraint["constraint_type"] in ("PRIMARY KEY", "UNIQUE"):
+                    events.append(("index", target, constraint_index(constraint)))
+        else:
+            column, constraints = parse_column_definition(clause, table_name, dialect)
+            if column:
+                events.append(("column", target, column))
+                events.extend(("constraint", target, c) for c in constraints)
+    return events
+
+def parse_create_routine(text, match, dialect):
+    schema, name = split_qualified_name(match.group(2))
+    rest = text[match.end():]
+    parameters = ""
+    if rest.startswith("("):
+        close_idx = find_closing_paren(rest, 0)
+        parameters = WHITESPACE_RUN.sub(" ", rest[1:close_idx]).strip()
+        rest = rest[close_idx + 1:]
+    elif dialect == "SQL Server":
+        params_match = SQLSERVER_PARAMETERS.match(rest)
+        parameters = WHITESPACE_RUN.sub(" ", params_match.group(1)).strip() if params_match else ""
+    if match.group(1).upper() == "FUNCTION":
+        returns = FUNCTION_RETURNS.match(rest)
+        return [("function", (schema, name), {
+            "function_name": name, "schema": schema,
+            "return_type": normalize_ddl_type(returns.group(1)) if returns else "",
+            "parameters": parameters, "description": ""})]
+    return [("procedure", (schema, name), {
+        "procedure_name": name, "schema": schema, "parameters": parameters, "description": ""})]
+
+def parse_ddl_statement(statement, dialect):
+    """Parse one DDL statement into schema events: (kind, (schema, table) or None, payload)"""
+    text = strip_sql_comments(statement).strip().rstrip(";").strip()
+    keyword = text[:7].upper()
+
+    if keyword.startswith("CREATE"):
+        match = CREATE_TABLE_HEAD.match(text)
+        if match:
+            return parse_create_table(text, match, dialect)
+        match = CREATE_INDEX_HEAD.match(text)
+        if match:
+            _, index_name = split_qualified_name(match.group(3))
+            schema, table_name = split_qualified_name(match.group(4))
+            open_idx = match.end() - 1
+            is_unique = bool(match.group(1))
+            default_type = {"PostgreSQL": "BTREE", "SQL Server": "NONCLUSTERED", "Oracle": "NORMAL"}[dialect]
+            return [("index", (schema, table_name), {
+                "index_name": index_name,
+                "columns": parse_identifier_list(text[open_idx:find_closing_paren(text, open_idx) + 1]),
+                "index_type": "UNIQUE" if is_unique else (match.group(2) or match.group(5) or default_type).upper(),
+                "is_unique": is_unique})]
+        match = CREATE_VIEW_HEAD.match(text)
+        if match:
+            schema, name = split_qualified_name(match.group(2))
+            as_match = VIEW_AS_KEYWORD.search(text, match.end())
+            return [("view", (schema, name), {"view_name": name, "schema": schema,
+                                              "definition": text[as_match.end():].strip() if as_match else "",
+                                              "description": ""})]
+
+    if keyword.startswith("ALTER"):
+        match = ALTER_TABLE_HEAD.match(text)
+        if match:
+            return parse_alter_table(match, dialect)
+
+    if keyword.startswith("COMMENT"):
+        match = COMMENT_ON_HEAD.match(text)
+        if match:
+            comment = match.group(3).replace("''", "'")
+            parts = [unquote_identifier(p) for p in SQL_IDENTIFIER_RE.findall(match.group(2))]
+            if match.group(1).upper() == "COLUMN" and len(parts) >= 2:
+                schema = parts[-3] if len(parts) >= 3 else None
+                return [("column_comment", (schema, parts[-2]), (parts[-1], comment))]
+            if match.group(1).upper() == "TABLE":
+                return [("table_comment", split_qualified_name(match.group(2)), comment)]
+        return []
+
+    match = CREATE_ROUTINE_HEAD.match(text)
+    if match:
+        return parse_create_routine(text, match, dialect)
+    return []
+
+def iter_ddl_statements(chunks, dialect):
+    """Split an iterable of text chunks into complete statements"""
+    splitter = DDLStatementSplitter(dialect)
+    for chunk in chunks:
+        yield from splitter.feed(chunk)
+    yield from splitter.close()
+
+def strip_sqlserver_default(definition):
+    """Remove the redundant outer parentheses SQL Server stores around default definitions"""
+    if definition is None:
+        return None
+    definition = definition.strip()
+    while definition.startswith("(") and definition.endswith(")"):
+        depth = 0
+        for i, ch in enumerate(definition):
+            depth += 1 if ch == "(" else -1 if ch == ")" else 0
+            if depth == 0 and i < len(definition) - 1:
+                return definition
+        definition = definition[1:-1].strip()
+    return definition
+
+# Process-pool workers
+def parse_ddl_statement_batch(statements, dialect):
+    """Process-pool worker: parse statements into (statement count, schema events)"""
+    count = 0
+    events = []
+    for statement in statements:
+        count += 1
+        events.extend(parse_ddl_statement(statement, dialect))
+    return count, events
+
+def parse_ddl_file_bytes(data, dialect):
+    """Process-pool worker: split and parse a whole script"""
+    return parse_ddl_statement_batch(iter_ddl_statements(iter_upload_text(io.BytesIO(data)), dialect), dialect)
@@ -0,0 +1,333 @@
+"""Streaming importers for JSON and XML schema exports.
+
+Kept out of streamlit_app.py, like ddl_parser, so worker processes can import it without running the app.
+"""
+import io
+import json
+import re
+import xml.etree.ElementTree as ET
+
+from ddl_parser import iter_upload_text
+
+# Field mapping
+IMPORT_FIELD_ALIASES = {
+    "table": {
+        "table_name": ("table_name", "name", "table"),
+        "schema": ("schema", "schema_name", "owner"),
+        "table_type": ("table_type", "type"),
+        "row_count": ("row_count", "rows", "num_rows"),
+        "size_mb": ("size_mb",),
+        "description": ("description", "comment", "comments", "remarks"),
+    },
+    "column": {
+        "column_name": ("column_name", "name"),
+        "data_type": ("data_type", "type"),
+        "is_nullable": ("is_nullable", "nullable"),
+        "default": ("default", "column_default", "default_value"),
+        "description": ("description", "comment", "comments", "remarks"),
+    },
+    "index": {
+        "index_name": ("index_name", "name"),
+        "columns": ("columns", "column"),
+        "index_type": ("index_type", "type"),
+        "is_unique": ("is_unique", "unique"),
+    },
+    "constraint": {
+        "constraint_name": ("constraint_name", "name"),
+        "constraint_type": ("constraint_type", "type"),
+        "columns": ("columns", "column"),
+        "references": ("references",),
+        "definition": ("definition", "condition"),
+    },
+    "view": {
+        "view_name": ("view_name", "name"),
+        "schema": ("schema", "schema_name", "owner"),
+        "definition": ("definition", "sql", "text"),
+        "description": ("description", "comment", "comments"),
+    },
+    "function": {
+        "function_name": ("function_name", "name"),
+        "schema": ("schema", "schema_name", "owner"),
+        "return_type": ("return_type", "returns"),
+        "parameters": ("parameters", "arguments"),
+        "description": ("description", "comment", "comments"),
+    },
+    "procedure": {
+        "procedure_name": ("procedure_name", "name"),
+        "schema": ("schema", "schema_name", "owner"),
+        "parameters": ("parameters", "arguments"),
+        "description": ("description", "comment", "comments"),
+    },
+}
+IMPORT_BOOLEAN_FIELDS = {"is_nullable", "is_unique"}
+IMPORT_NUMERIC_FIELDS = {"row_count": int, "size_mb": float}
+IMPORT_OPTIONAL_FIELDS = {"constraint": {"references", "definition"}}
+IMPORT_CHILD_COLLECTIONS = {"column": "columns", "index": "indexes", "constraint": "constraints"}
+IMPORT_FIELD_DEFAULTS = {
+    "table_type": "BASE TABLE", "row_count": 0, "size_mb": 0.0, "is_nullable": True, "is_unique": False,
+    "index_type": "INDEX", "constraint_type": "CONSTRAINT", "description": "", "definition": "",
+    "parameters": "", "return_type": "",
+}
+
+def normalize_imported_names(value):
+    """Column lists arrive as lists of names, lists of {"name": ...} records or comma-separated text"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if isinstance(value, dict):
+        value = [value]
+    return [v.get("name") or v.get("column_name") or "" if isinstance(v, dict) else str(v) for v in value]
+
+def normalize_imported_object(kind, record):
+    """Map an exported object's fields onto the db_data model"""
+    lowered = None
+    optional = IMPORT_OPTIONAL_FIELDS.get(kind, ())
+    normalized = {}
+    for field, aliases in IMPORT_FIELD_ALIASES[kind].items():
+        if field in record:
+            value = record[field]
+        else:
+            # Exports from other tools: match aliases case-insensitively
+            if lowered is None:
+                lowered = {str(k).lower(): v for k, v in record.items()}
+            value = next((lowered[a] for a in aliases if a in lowered), None)
+        if field == "columns":
+            value = normalize_imported_names(value)
+        elif value is None:
+            if field in optional:
+                continue
+            value = IMPORT_FIELD_DEFAULTS.get(field)
+        elif field in IMPORT_BOOLEAN_FIELDS and not isinstance(value, bool):
+            value = str(value).strip().lower() in ("true", "yes", "y", "1")
+        elif field in IMPORT_NUMERIC_FIELDS and not isinstance(value, (int, float)):
+            try:
+                value = IMPORT_NUMERIC_FIELDS[field](value)
+            except (TypeError, ValueError):
+                value = IMPORT_FIELD_DEFAULTS[field]
+        normalized[field] = value
+
+    if kind == "table":
+        for child_kind, collection in IMPORT_CHILD_COLLECTIONS.items():
+            children = record.get(collection)
+            if children is None and lowered is not None:
+                children = lowered.get(collection)
+            if isinstance(children, dict):
+                children = [children]
+            normalized[collection] = [
+                normalize_imported_object(child_kind, child) for child in children or [] if isinstance(child, dict)
+            ]
+    return normalized
+
+def detect_import_platform(database_info):
+    """Platform label from an export's database info, e.g. its version string"""
+    text = " ".join(str(database_info.get(k, "")) for k in ("platform", "version", "name")).lower()
+    for platform in ("PostgreSQL", "Oracle", "SQL Server"):
+        if platform.lower() in text or (platform == "SQL Server" and "microsoft" in text):
+            return platform
+    return "Imported"
+
+# JSON exports
+JSON_IMPORT_KEYS = {"tables": "table", "views": "view", "functions": "function", "procedures": "procedure",
+                    "database": "database", "database_info": "database"}
+JSON_WHITESPACE = re.compile(r"\s*")
+# Nested arrays that can be long enough to be worth reading element by element
+JSON_STREAMED_KEYS = set(IMPORT_CHILD_COLLECTIONS.values())
+
+class JSONStreamReader:
+    """Incremental reader over decoded text chunks for a top-level JSON object.
+
+    Array members are decoded one element at a time with ``raw_decode`` so that only the
+    element being read, not the whole document, is held in memory.
+    """
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self, size=0):
+        """Read at least one more chunk, and until ``size`` characters are unread, dropping consumed text"""
+        parts = [self.buffer[self.pos:]]
+        unread = len(parts[0])
+        while True:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.eof = True
+                break
+            parts.append(chunk)
+            unread += len(chunk)
+            if unread >= size:
+                break
+        self.buffer = "".join(parts)
+        self.pos = 0
+        return len(parts) > 1
+
+    def peek(self):
+        """Next non-whitespace character (without consuming it), or '' at end of input"""
+        while True:
+            self.pos = JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars):
+        ch = self.peek()
+        if ch not in chars:
+            raise ValueError(f"Invalid JSON export: expected {' or '.join(repr(c) for c in chars)} at {ch!r}")
+        self.pos += 1
+        return ch
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input until it is complete"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number or literal cut at the chunk boundary decodes "successfully" too short
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Double the unread text before retrying, so a large value is decoded O(log n) times
+            self.fill(2 * (len(self.buffer) - self.pos))
+
+    def record(self, streamed=()):
+        """Decode the next value; arrays under the object keys in ``streamed`` are read element by element"""
+        if not streamed or self.peek() != "{":
+            return self.value()
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            if end < len(self.buffer):
+                self.pos = end
+                return value
+        except json.JSONDecodeError:
+            # Runs past the buffered text: read it member by member instead
+            pass
+        self.pos += 1
+        record = {}
+        if self.peek() == "}":
+            self.pos += 1
+            return record
+        while True:
+            key = self.value()
+            self.expect(":")
+            if str(key).lower() in streamed and self.peek() == "[":
+                record[key] = list(self.items())
+            else:
+                record[key] = self.value()
+            if self.expect(",}") == "}":
+                return record
+
+    def items(self, streamed=()):
+        """Yield each element of the array starting at the current position"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.record(streamed)
+            if self.expect(",]") == "]":
+                return
+
+def iter_json_export(chunks):
+    """Yield (kind, record) pairs from a JSON schema export (db_data or convert_to_json_schema format)"""
+    reader = JSONStreamReader(chunks)
+    if reader.peek() == "[":
+        for record in reader.items(JSON_STREAMED_KEYS):
+            yield "table", record
+        return
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        kind = JSON_IMPORT_KEYS.get(str(key).lower())
+        if kind and kind != "database" and reader.peek() == "[":
+            for record in reader.items(JSON_STREAMED_KEYS):
+                if isinstance(record, dict):
+                    yield kind, record
+        else:
+            value = reader.value()
+            if kind == "database" and isinstance(value, dict):
+                yield "database", value
+        if reader.expect(",}") == "}":
+            return
+
+# XML exports
+XML_OBJECT_TAGS = {"table": "table", "view": "view", "function": "function", "procedure": "procedure"}
+XML_DATABASE_TAGS = {"database", "database_info", "schema_export"}
+XML_CHILD_TAGS = {"column": "columns", "field": "columns", "index": "indexes", "constraint": "constraints"}
+
+def xml_local_name(tag):
+    return tag.rsplit("}", 1)[-1].lower()
+
+def xml_element_to_record(elem):
+    """Convert an element (attributes, text-only children, repeated object children) into a dict"""
+    record = {xml_local_name(k): v for k, v in elem.attrib.items()}
+    for child in elem:
+        tag = xml_local_name(child.tag)
+        if tag in XML_CHILD_TAGS.values() and (len(child) or not (child.text or "").strip()):
+            # Container such as <columns><column .../></columns>
+            record.setdefault(tag, []).extend(xml_element_to_record(c) if len(c) or c.attrib else (c.text or "").strip()
+                                              for c in child)
+        elif tag in XML_CHILD_TAGS and (len(child) or child.attrib):
+            record.setdefault(XML_CHILD_TAGS[tag], []).append(xml_element_to_record(child))
+        elif tag in record and isinstance(record[tag], list):
+            record[tag].append((child.text or "").strip())
+        elif tag in record:
+            record[tag] = [record[tag], (child.text or "").strip()]
+        else:
+            record[tag] = (child.text or "").strip()
+    return record
+
+def iter_xml_export(file):
+    """Yield (kind, record) pairs from an XML schema export using iterparse.
+
+    Each table/view/routine element is converted when it closes and then removed from its
+    parent, so memory stays bounded by the largest single object.
+    """
+    file.seek(0)
+    stack = []
+    for event, elem in ET.iterparse(file, events=("start", "end")):
+        if event == "start":
+            if not stack and xml_local_name(elem.tag) in XML_DATABASE_TAGS and elem.attrib:
+                yield "database", {xml_local_name(k): v for k, v in elem.attrib.items()}
+            stack.append(elem)
+            continue
+
+        stack.pop()
+        tag = xml_local_name(elem.tag)
+        if any(xml_local_name(e.tag) in XML_OBJECT_TAGS for e in stack):
+            continue
+        if tag in XML_OBJECT_TAGS:
+            yield XML_OBJECT_TAGS[tag], xml_element_to_record(elem)
+        elif tag in XML_DATABASE_TAGS and stack:
+            yield "database", xml_element_to_record(elem)
+        else:
+            continue
+        elem.clear()
+        if stack:
+            stack[-1].remove(elem)
+
+# Schema events
+def iter_schema_export_events(file, name):
+    """Yield SchemaBuilder events (kind, target, payload) from a JSON or XML schema export"""
+    objects = iter_xml_export(file) if name.lower().endswith(".xml") else iter_json_export(iter_upload_text(file))
+    for kind, record in objects:
+        if kind == "database":
+            yield "database", None, record
+            continue
+        record = normalize_imported_object(kind, record)
+        yield kind, (record.get("schema"), str(record.get(f"{kind}_name") or "")), record
+
+# Process-pool workers
+def parse_schema_export_bytes(data, name):
+    """Process-pool worker: import a whole export into (statement count, schema events)"""
+    return 0, list(iter_schema_export_events(io.BytesIO(data), name))
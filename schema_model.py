@@ -0,0 +1,145 @@
+"""Compact __slots__ object model for extracted schemas.
+
+Kept out of streamlit_app.py, which Streamlit re-executes on every rerun, so the record classes are
+created once and records held in session state or a resource cache stay instances of them.
+"""
+import sys
+from collections.abc import MutableMapping
+
+# Compact schema object model
+class SchemaRecord(MutableMapping):
+    """Base class for the compact schema model.
+
+    Known fields live in ``__slots__`` instead of a per-object dict, and repeated strings
+    (types, schemas, column names) are interned. The mapping interface keeps records
+    usable anywhere a schema dict was: ``record["columns"]``, ``.get()``, ``in``,
+    ``dict(record)`` and ``pd.DataFrame(records)``. Keys outside FIELDS are kept in a
+    small overflow dict.
+    """
+    __slots__ = ("_extra",)
+    FIELDS = ()
+    INTERNED = frozenset()
+    CHILDREN = {}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a schema dict (records of this class are returned unchanged)"""
+        if isinstance(data, cls):
+            return data
+        record = cls.__new__(cls)
+        record._extra = None
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+    def __setitem__(self, key, value):
+        if key in self.FIELD_SET:
+            if key in self.CHILDREN and isinstance(value, list):
+                child = self.CHILDREN[key]
+                value = [child.from_dict(v) for v in value]
+            elif key in self.INTERNED:
+                if type(value) is str:
+                    value = sys.intern(value)
+                elif type(value) is list:
+                    value = [sys.intern(v) if type(v) is str else v for v in value]
+            setattr(self, key, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __getitem__(self, key):
+        if key in self.FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __delitem__(self, key):
+        if key in self.FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra and key in self._extra:
+            del self._extra[key]
+        else:
+            raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in self.FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra else default
+
+    def __contains__(self, key):
+        if key in self.FIELD_SET:
+            return hasattr(self, key)
+        return bool(self._extra) and key in self._extra
+
+    def __iter__(self):
+        for field in self.FIELDS:
+            if hasattr(self, field):
+                yield field
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.FIELD_SET = frozenset(cls.FIELDS)
+
+class Column(SchemaRecord):
+    FIELDS = ("column_name", "data_type", "is_nullable", "default", "description")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"column_name", "data_type"})
+
+class Index(SchemaRecord):
+    FIELDS = ("index_name", "columns", "index_type", "is_unique")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"columns", "index_type"})
+
+class Constraint(SchemaRecord):
+    FIELDS = ("constraint_name", "constraint_type", "columns", "references", "definition")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"constraint_type", "columns"})
+
+class Table(SchemaRecord):
+    FIELDS = ("table_name", "schema", "table_type", "row_count", "size_mb", "description",
+              "columns", "indexes", "constraints", "fingerprint")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"schema", "table_type"})
+    CHILDREN = {"columns": Column, "indexes": Index, "constraints": Constraint}
+
+class View(SchemaRecord):
+    FIELDS = ("view_name", "schema", "definition", "description", "fingerprint")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"schema"})
+
+class Routine(SchemaRecord):
+    FIELDS = ("function_name", "procedure_name", "schema", "return_type", "parameters", "description", "fingerprint")
+    __slots__ = FIELDS
+    INTERNED = frozenset({"schema", "return_type"})
+
+class Database(SchemaRecord):
+    FIELDS = ("database_info", "tables", "views", "functions", "procedures")
+    # _derived caches structures built from the schema (catalog, index); it is not a schema field
+    __slots__ = FIELDS + ("_derived",)
+    CHILDREN = {"tables": Table, "views": View, "functions": Routine, "procedures": Routine}
+
+def compact_schema(db_data):
+    """Convert a db_data dict (possibly already partly compact) into the slotted model"""
+    return Database.from_dict(db_data)
+
+def schema_json_default(value):
+    """json.dumps hook that serializes compact schema records as plain objects"""
+    if isinstance(value, SchemaRecord):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
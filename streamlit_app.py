@@ -1,13 +1,40 @@
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import anthropic
 import json
 import time
+import asyncio
+import random
 from datetime import datetime
 import io
 import base64
 from typing import Dict, List, Any, Optional
 import hashlib
+import html
+import tempfile
+import zipfile
+import os
+import re
+import xml.etree.ElementTree as ET
+import sqlite3
+import threading
+import weakref
+import tracemalloc
+import multiprocessing
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+
+from ddl_parser import (DDL_DEFAULT_SCHEMAS, SQL_IDENTIFIER_RE, WHITESPACE_RUN, detect_ddl_dialect,
+                        iter_ddl_statements, iter_upload_text, normalize_ddl_type, parse_ddl_file_bytes,
+                        parse_ddl_statement, parse_ddl_statement_batch, strip_sqlserver_default,
+                        unquote_identifier)
+from schema_import import detect_import_platform, iter_schema_export_events, parse_schema_export_bytes
+from schema_model import Database, compact_schema, schema_json_default
 
 # Page configuration
 st.set_page_config(
@@ -640,7 +667,8 @@ def main():
                 "📊 Live Database Connection",
                 "🎯 Demo Mode (Sample Data)",
                 "📁 Schema File Upload",
-                "🔄 Cross-Platform Comparison"
+                "🔄 Cross-Platform Comparison",
+                "💾 Saved Snapshots"
             ]
         )
         
@@ -664,17 +692,24 @@ def main():
         st.metric("Schema Objects", "847", "+23%")
         st.metric("Documentation Pages", "156", "+89%")
         st.metric("Cross-Platform Mappings", "342", "+156%")
+        
+        show_memory_benchmark()
 
     # Main content based on mode
     if doc_mode == "🎯 Demo Mode (Sample Data)":
         show_demo_mode(claude_client, include_ai_descriptions, include_diagrams, 
                       include_data_dictionary, include_performance_notes, include_security_analysis)
     elif doc_mode == "📊 Live Database Connection":
-        show_live_connection_mode()
+        show_live_connection_mode(claude_client, include_ai_descriptions, include_diagrams,
+                                  include_data_dictionary, include_performance_notes, include_security_analysis)
     elif doc_mode == "📁 Schema File Upload":
-        show_file_upload_mode()
+        show_file_upload_mode(claude_client, include_ai_descriptions, include_diagrams,
+                              include_data_dictionary, include_performance_notes, include_security_analysis)
     elif doc_mode == "🔄 Cross-Platform Comparison":
         show_cross_platform_comparison()
+    elif doc_mode == "💾 Saved Snapshots":
+        show_snapshot_store_mode(claude_client, include_ai_descriptions, include_diagrams,
+                                 include_data_dictionary, include_performance_notes, include_security_analysis)
 
 def show_demo_mode(claude_client, include_ai_descriptions, include_diagrams, 
                    include_data_dictionary, include_performance_notes, include_security_analysis):
@@ -709,23 +744,22 @@ def show_demo_mode(claude_client, include_ai_descriptions, include_diagrams,
 
 def show_database_documentation(db_name, db_data, claude_client, include_ai_descriptions, 
                                include_diagrams, include_data_dictionary, include_performance_notes, 
-                               include_security_analysis):
+                               include_security_analysis, snapshot_id=None):
     """Show comprehensive documentation for a single database"""
     
     # Database overview
     st.subheader(f"📊 {db_name} Database Overview")
     
+    totals = schema_catalog(db_data).totals()
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Tables", len(db_data.get("tables", [])))
+        st.metric("Tables", totals["tables"])
     with col2:
         st.metric("Views", len(db_data.get("views", [])))
     with col3:
-        total_rows = sum(table.get("row_count", 0) for table in db_data.get("tables", []))
-        st.metric("Total Rows", f"{total_rows:,}")
+        st.metric("Total Rows", f"{totals['rows']:,}")
     with col4:
-        total_size = sum(table.get("size_mb", 0) for table in db_data.get("tables", []))
-        st.metric("Total Size", f"{total_size:.1f} MB")
+        st.metric("Total Size", f"{totals['size_mb']:.1f} MB")
     
     # Database info card
     db_info = db_data.get("database_info", {})
@@ -740,14 +774,19 @@ def show_database_documentation(db_name, db_data, claude_client, include_ai_desc
     </div>
     """, unsafe_allow_html=True)
     
+    if include_data_dictionary:
+        show_column_analytics(db_name, db_data)
+    
+    if include_diagrams:
+        show_er_diagrams(db_name, db_data)
+    
     # Tables documentation
     if db_data.get("tables"):
         st.subheader("📋 Tables Documentation")
-        
-        for table in db_data["tables"]:
-            with st.expander(f"📊 {table['table_name']} ({table['row_count']:,} rows, {table['size_mb']:.1f} MB)"):
-                show_table_documentation(table, db_name, claude_client, include_ai_descriptions,
-                                       include_data_dictionary, include_performance_notes)
+        if include_ai_descriptions:
+            show_ai_description_generator(db_name, db_data, claude_client, snapshot_id)
+        show_table_browser(db_name, db_data, claude_client, include_ai_descriptions,
+                           include_data_dictionary, include_performance_notes)
     
     # Views documentation
     if db_data.get("views"):
@@ -775,8 +814,107 @@ def show_database_documentation(db_name, db_data, claude_client, include_ai_desc
                                           include_data_dictionary, include_performance_notes,
                                           include_security_analysis)
 
+TABLE_BROWSER_SORTS = {
+    "Name": ("table_name", False),
+    "Rows (largest first)": ("row_count", True),
+    "Size (largest first)": ("size_mb", True),
+    "Columns (most first)": ("column_count", True),
+}
+TABLE_BROWSER_PAGE_SIZES = (25, 50, 100, 250)
+
+def show_table_browser(db_name, db_data, claude_client, include_ai_descriptions,
+                       include_data_dictionary, include_performance_notes):
+    """Filterable, paged table list with full documentation for the selected table only.
+
+    Filtering and sorting run over the Arrow catalog and only one page of rows plus one table's
+    details are sent to the browser, so a rerun costs the same for 50 tables or 50,000.
+    """
+    catalog = schema_catalog(db_data)
+    key_prefix = f"table_browser_{db_name}"
+    schemas = sorted(s for s in catalog.tables["schema"].unique().to_pylist() if s)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        name_contains = st.text_input("Table name contains", key=f"{key_prefix}_name")
+    with col2:
+        selected_schemas = st.multiselect("Schemas", schemas, key=f"{key_prefix}_schemas")
+    with col3:
+        min_size_mb = st.number_input("Minimum size (MB)", min_value=0.0, value=0.0, step=10.0,
+                                      key=f"{key_prefix}_size")
+    with col4:
+        sort_label = st.selectbox("Sort by", list(TABLE_BROWSER_SORTS), key=f"{key_prefix}_sort")
+    
+    sort_by, descending = TABLE_BROWSER_SORTS[sort_label]
+    matched = catalog.filter_tables(name_contains, selected_schemas, min_size_mb=min_size_mb,
+                                    sort_by=sort_by, descending=descending)
+    if not matched.num_rows:
+        st.info("No tables match the filters")
+        return
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        page_size = st.selectbox("Tables per page", TABLE_BROWSER_PAGE_SIZES, key=f"{key_prefix}_page_size")
+    pages = -(-matched.num_rows // page_size)
+    page_key = f"{key_prefix}_page"
+    if st.session_state.get(page_key, 1) > pages:
+        st.session_state[page_key] = pages
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, key=page_key)
+    with col3:
+        first = (page - 1) * page_size
+        st.caption(f"Tables {first + 1:,}–{min(first + page_size, matched.num_rows):,} of {matched.num_rows:,} "
+                   f"matching ({catalog.tables.num_rows:,} total)")
+    
+    page_rows = matched.slice(first, page_size)
+    page_df = page_rows.select(["schema", "table_name", "row_count", "size_mb", "column_count", "index_count"]).to_pandas()
+    page_df.columns = ["Schema", "Table", "Rows", "Size (MB)", "Columns", "Indexes"]
+    st.dataframe(page_df, use_container_width=True, hide_index=True)
+    
+    tables = db_data["tables"]
+    table_ids = page_rows["table_id"].to_pylist()
+    table_id = st.selectbox(
+        "Table details", table_ids, key=f"{key_prefix}_selected",
+        format_func=lambda i: f"📊 {qualified_object_name(tables[i], 'table_name')} "
+                              f"({tables[i].get('row_count') or 0:,} rows, {tables[i].get('size_mb') or 0:.1f} MB)")
+    if table_id is not None:
+        show_table_documentation(tables[table_id], db_name, claude_client, include_ai_descriptions,
+                                 include_data_dictionary, include_performance_notes, schema_index(db_data))
+
+def table_fingerprint(table):
+    """Catalog fingerprint of a table, or a hash of its contents when it was not extracted live"""
+    if table.get("fingerprint"):
+        return table["fingerprint"]
+    content = json.dumps(table, default=schema_json_default, sort_keys=True)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:20]
+
+def display_frame(records, fields, labels):
+    """Frame of schema records for display: column lists joined, missing values blank, every cell text"""
+    frame = pd.DataFrame(list(records), columns=list(fields))
+    if "columns" in frame:
+        frame["columns"] = frame["columns"].map(lambda v: ", ".join(v) if isinstance(v, list) else v)
+    if "references" in frame:
+        frame["definition"] = frame["definition"].where(frame["definition"].notna(), frame["references"])
+        frame = frame.drop(columns="references")
+    return frame.astype(object).where(frame.notna(), "").astype(str).set_axis(list(labels), axis=1)
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def table_detail_frames(fingerprint, _table):
+    """Columns, indexes and constraints frames for one table, cached by its fingerprint"""
+    return (
+        display_frame(_table.get("columns") or [],
+                      ("column_name", "data_type", "is_nullable", "default", "description"),
+                      ("Column Name", "Data Type", "Nullable", "Default", "Description")),
+        display_frame(_table.get("indexes") or [],
+                      ("index_name", "columns", "index_type", "is_unique"),
+                      ("Index Name", "Columns", "Type", "Unique")),
+        # Definition falls back to the references target for foreign keys
+        display_frame(_table.get("constraints") or [],
+                      ("constraint_name", "constraint_type", "columns", "definition", "references"),
+                      ("Constraint Name", "Type", "Columns", "Definition")),
+    )
+
 def show_table_documentation(table, db_name, claude_client, include_ai_descriptions,
-                           include_data_dictionary, include_performance_notes):
+                           include_data_dictionary, include_performance_notes, index=None):
     """Show detailed table documentation"""
     
     # Table overview
@@ -798,62 +936,33 @@ def show_table_documentation(table, db_name, claude_client, include_ai_descripti
             {table['description']}
             """)
     
+    columns_df, indexes_df, constraints_df = table_detail_frames(table_fingerprint(table), table)
+    
     # Columns documentation
-    if include_data_dictionary and table.get('columns'):
+    if include_data_dictionary and len(columns_df):
         st.markdown("#### 📝 Columns")
-        
-        columns_data = []
-        for col in table['columns']:
-            columns_data.append({
-                'Column Name': str(col.get('column_name', '')),
-                'Data Type': str(col.get('data_type', '')),
-                'Nullable': str(col.get('is_nullable', '')),
-                'Default': str(col.get('default', '') if col.get('default') is not None else ''),
-                'Description': str(col.get('description', ''))
-            })
-        
-        if columns_data:
-            columns_df = pd.DataFrame(columns_data)
-            st.dataframe(columns_df, use_container_width=True, hide_index=True)
+        st.dataframe(columns_df, use_container_width=True, hide_index=True)
     
     # Indexes documentation
-    if table.get('indexes'):
+    if len(indexes_df):
         st.markdown("#### 🔍 Indexes")
-        
-        indexes_data = []
-        for idx in table['indexes']:
-            # Convert columns list to string
-            columns_str = ', '.join(idx.get('columns', [])) if isinstance(idx.get('columns'), list) else str(idx.get('columns', ''))
-            indexes_data.append({
-                'Index Name': str(idx.get('index_name', '')),
-                'Columns': columns_str,
-                'Type': str(idx.get('index_type', '')),
-                'Unique': str(idx.get('is_unique', ''))
-            })
-        
-        if indexes_data:
-            indexes_df = pd.DataFrame(indexes_data)
-            st.dataframe(indexes_df, use_container_width=True, hide_index=True)
+        st.dataframe(indexes_df, use_container_width=True, hide_index=True)
     
     # Constraints documentation
-    if table.get('constraints'):
+    if len(constraints_df):
         st.markdown("#### 🔒 Constraints")
-        
-        constraints_data = []
-        for constraint in table['constraints']:
-            # Convert columns list to string
-            columns_str = ', '.join(constraint.get('columns', [])) if isinstance(constraint.get('columns'), list) else str(constraint.get('columns', ''))
-            
-            constraints_data.append({
-                'Constraint Name': str(constraint.get('constraint_name', '')),
-                'Type': str(constraint.get('constraint_type', '')),
-                'Columns': columns_str,
-                'Definition': str(constraint.get('definition', constraint.get('references', '')))
-            })
-        
-        if constraints_data:
-            constraints_df = pd.DataFrame(constraints_data)
-            st.dataframe(constraints_df, use_container_width=True, hide_index=True)
+        st.dataframe(constraints_df, use_container_width=True, hide_index=True)
+    
+    # Incoming foreign keys
+    referenced_by = index.referenced_by(table['table_name'], table.get('schema') or "") if index else []
+    if referenced_by:
+        st.markdown("#### 🔗 Referenced By")
+        st.dataframe(pd.DataFrame([{
+            'Table': ".".join(part for part in edge['table'] if part),
+            'Columns': ', '.join(edge['columns']),
+            'Referenced Columns': ', '.join(edge['referenced_columns']),
+            'Constraint': str(edge['constraint_name'] or '')
+        } for edge in referenced_by]), use_container_width=True, hide_index=True)
     
     # Performance notes
     if include_performance_notes:
@@ -892,29 +1001,13 @@ def show_function_documentation(func, db_name, func_type):
         - **Description:** {func.get('description', 'N/A')}
         """)
 
-def show_performance_analysis(table, db_name, claude_client):
-    """Show AI-powered performance analysis"""
-    
-    if claude_client:
-        with st.expander("⚡ Performance Analysis"):
-            with st.spinner("🤖 Analyzing table performance..."):
-                try:
-                    # Create performance analysis prompt
-                    prompt = f"""Analyze the performance characteristics of this {db_name} table:
-
-Table: {table['table_name']}
-Row Count: {table.get('row_count', 0):,}
-Size: {table.get('size_mb', 0):.1f} MB
-Columns: {len(table.get('columns', []))}
-Indexes: {len(table.get('indexes', []))}
-
-Columns:
-{json.dumps(table.get('columns', []), indent=2)}
-
-Indexes:
-{json.dumps(table.get('indexes', []), indent=2)}
-
-Provide:
+# Compact prompt encoding
+PERFORMANCE_PROMPT_TOKEN_BUDGET = 6000
+PROMPT_CELL_CHARS = 60
+COLUMN_PROMPT_FIELDS = (("column_name", "name"), ("data_type", "type"), ("is_nullable", "null"),
+                        ("default", "default"), ("description", "description"))
+INDEX_PROMPT_FIELDS = (("index_name", "name"), ("columns", "columns"), ("index_type", "type"), ("is_unique", "unique"))
+PERFORMANCE_INSTRUCTIONS = """Provide:
 1. Performance assessment (Good/Warning/Critical)
 2. Potential bottlenecks
 3. Index optimization recommendations
@@ -923,15 +1016,92 @@ Provide:
 
 Keep it concise and actionable."""
 
-                    message = claude_client.messages.create(
-                        model="claude-3-5-sonnet-20241022",
-                        max_tokens=1000,
-                        temperature=0.1,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    
-                    analysis = message.content[0].text
+def prompt_cell(value):
+    """One cell of a compact prompt row: booleans as Y/N, lists comma-joined, whitespace collapsed, capped length"""
+    if isinstance(value, bool):
+        return "Y" if value else "N"
+    if isinstance(value, (list, tuple)):
+        value = ",".join(map(str, value))
+    text = " ".join(str(value).split()).replace("|", "/") if value is not None else ""
+    return text if len(text) <= PROMPT_CELL_CHARS else text[:PROMPT_CELL_CHARS - 1] + "…"
+
+def compact_rows(records, fields, token_budget, keep=frozenset()):
+    """Records as a pipe-separated header and rows, dropping fields no record fills.
+
+    When the rows exceed token_budget, records whose position is in ``keep`` are listed first and the
+    rest only while they fit. Returns (lines, positions of records left out).
+    """
+    used = [(field, label) for field, label in fields if any(r.get(field) not in (None, "", []) for r in records)]
+    if not records or not used:
+        return [], []
+    header = "|".join(label for _, label in used)
+    rows = ["|".join(prompt_cell(r.get(field)) for field, _ in used) for r in records]
+    tokens = estimate_prompt_tokens(header)
+    if tokens + sum(estimate_prompt_tokens(row) for row in rows) <= token_budget:
+        return [header, *rows], []
+    listed = set()
+    for i in sorted(range(len(rows)), key=lambda i: i not in keep):
+        tokens += estimate_prompt_tokens(rows[i])
+        if tokens > token_budget:
+            break
+        listed.add(i)
+    return [header, *(rows[i] for i in sorted(listed))], [i for i in range(len(rows)) if i not in listed]
+
+def record_column_names(record):
+    columns = record.get("columns") or []
+    return [columns] if isinstance(columns, str) else columns
+
+def performance_analysis_prompt(db_name, table, token_budget=PERFORMANCE_PROMPT_TOKEN_BUDGET):
+    """Performance analysis prompt with columns and indexes as compact rows, fitted to token_budget.
+
+    Tables too large for the budget keep their key and indexed columns (then as many others as fit);
+    the columns left out are summarized by data type, so one prompt still covers the whole table.
+    """
+    columns = table.get("columns") or []
+    indexes = table.get("indexes") or []
+    head = f"""Analyze the performance characteristics of this {db_name} table:
+
+Table: {table['table_name']}
+Row Count: {table.get('row_count') or 0:,}
+Size: {table.get('size_mb') or 0:.1f} MB
+Columns: {len(columns)}
+Indexes: {len(indexes)}
+"""
+    # Reserve room for the instructions and the summary lines of anything left out
+    available = token_budget - estimate_prompt_tokens(head + PERFORMANCE_INSTRUCTIONS) - 100
+    index_lines, omitted_indexes = compact_rows(indexes, INDEX_PROMPT_FIELDS, available // 4)
+    key_names = {str(name).lower() for record in (*indexes, *(table.get("constraints") or []))
+                 for name in record_column_names(record)}
+    keep = {i for i, c in enumerate(columns) if str(c.get("column_name", "")).lower() in key_names}
+    column_lines, omitted_columns = compact_rows(columns, COLUMN_PROMPT_FIELDS,
+                                                 available - estimate_prompt_tokens("\n".join(index_lines)), keep)
+    if omitted_columns:
+        types = Counter(str(columns[i].get("data_type") or "unknown").split("(")[0].lower() for i in omitted_columns)
+        column_lines.append(f"... {len(omitted_columns):,} more columns not listed, by type: "
+                            + ", ".join(f"{name} {count:,}" for name, count in types.most_common(15)))
+    if omitted_indexes:
+        index_lines.append(f"... {len(omitted_indexes):,} more indexes not listed")
+    columns_text = "\n".join(column_lines) or "(none)"
+    indexes_text = "\n".join(index_lines) or "(none)"
+    return f"{head}\nColumns:\n{columns_text}\n\nIndexes:\n{indexes_text}\n\n{PERFORMANCE_INSTRUCTIONS}"
+
+def show_performance_analysis(table, db_name, claude_client):
+    """Show AI-powered performance analysis"""
+    
+    if table.get("performance_analysis"):
+        with st.expander("⚡ Performance Analysis"):
+            st.markdown(table["performance_analysis"])
+            st.caption("📦 From a bulk analysis job")
+    elif claude_client:
+        with st.expander("⚡ Performance Analysis"):
+            with st.spinner("🤖 Analyzing table performance..."):
+                try:
+                    prompt = performance_analysis_prompt(db_name, table)
+                    analysis, from_cache = cached_claude_text(claude_client, prompt, table_fingerprint(table))
                     st.markdown(analysis)
+                    if from_cache:
+                        st.caption("⚡ Cached analysis")
+                    show_ai_cache_stats()
                     
                 except Exception as e:
                     st.warning(f"Could not generate performance analysis: {str(e)}")
@@ -947,55 +1117,42 @@ def show_cross_platform_analysis(sample_data, claude_client):
     # Data type comparison
     st.markdown("#### 📊 Data Type Mappings")
     
-    # Create comparison table for customer table
-    customers_comparison = []
+    platforms = ("PostgreSQL", "Oracle", "SQL Server")
+    indexes = {platform: schema_index(sample_data[platform]) for platform in platforms}
+    table_names = [t["table_name"] for t in sample_data["PostgreSQL"]["tables"]
+                   if all(indexes[platform].find_table(t["table_name"]) for platform in platforms[1:])]
+    table_name = st.selectbox("Table", table_names, key="type_mapping_table")
     
-    # Get customer table from each database
-    pg_customers = next((t for t in sample_data["PostgreSQL"]["tables"] if t["table_name"] == "customers"), None)
-    oracle_customers = next((t for t in sample_data["Oracle"]["tables"] if t["table_name"] == "CUSTOMERS"), None)
-    sql_customers = next((t for t in sample_data["SQL Server"]["tables"] if t["table_name"] == "Customers"), None)
-    
-    if pg_customers and oracle_customers and sql_customers:
-        # Compare primary key columns
-        customers_comparison.append({
-            "Column Purpose": "Primary Key",
-            "PostgreSQL": "SERIAL (customer_id)",
-            "Oracle": "NUMBER(10) + SEQUENCE (CUSTOMER_ID)", 
-            "SQL Server": "INT IDENTITY(1,1) (CustomerID)",
-            "Compatibility": "🟡 Different approaches"
-        })
-        
-        customers_comparison.append({
-            "Column Purpose": "Text Fields",
-            "PostgreSQL": "VARCHAR(50) (first_name, last_name)",
-            "Oracle": "VARCHAR2(50) (FIRST_NAME, LAST_NAME)",
-            "SQL Server": "NVARCHAR(50) (FirstName, LastName)",
-            "Compatibility": "🟢 Compatible"
-        })
-        
-        customers_comparison.append({
-            "Column Purpose": "JSON Data",
-            "PostgreSQL": "JSONB (address)",
-            "Oracle": "CLOB (ADDRESS_DATA)",
-            "SQL Server": "NVARCHAR(MAX) (AddressData)",
-            "Compatibility": "🔴 Requires conversion"
-        })
-        
-        customers_comparison.append({
-            "Column Purpose": "Boolean",
-            "PostgreSQL": "BOOLEAN (is_active)",
-            "Oracle": "NUMBER(1) (IS_ACTIVE)",
-            "SQL Server": "BIT (IsActive)",
-            "Compatibility": "🟡 Different implementations"
-        })
+    # One row per PostgreSQL column, matched by normalized name and then by position
+    customers_comparison = []
+    if table_name:
+        tables = {platform: indexes[platform].find_table(table_name) for platform in platforms}
+        base_columns = tables["PostgreSQL"]["columns"]
+        matches = {}
+        for platform in platforms[1:]:
+            columns = tables[platform]["columns"]
+            ordinals = {id(c): i for i, c in enumerate(base_columns)}
+            ordinals.update({id(c): i for i, c in enumerate(columns)})
+            pairs, _, _ = hash_join(base_columns, columns,
+                                    (lambda c: loose_name_key(c["column_name"]), lambda c: ordinals[id(c)]))
+            matches[platform] = {id(source): target for source, target in pairs}
         
-        customers_comparison.append({
-            "Column Purpose": "Timestamps",
-            "PostgreSQL": "TIMESTAMP (registration_date)",
-            "Oracle": "DATE (REGISTRATION_DATE)",
-            "SQL Server": "DATETIME2 (RegistrationDate)",
-            "Compatibility": "🟡 Precision differences"
-        })
+        severity = list(TYPE_COMPATIBILITY_LABELS)
+        for column in base_columns:
+            row = {"Column": column["column_name"],
+                   "PostgreSQL": f"{column['data_type']} ({column['column_name']})"}
+            worst = "compatible"
+            for platform in platforms[1:]:
+                target = matches[platform].get(id(column))
+                if target is None:
+                    row[platform] = "—"
+                    worst = "conversion"
+                    continue
+                row[platform] = f"{target['data_type']} ({target['column_name']})"
+                verdict = compare_data_types(column["data_type"], "PostgreSQL", target["data_type"], platform)
+                worst = max(worst, verdict, key=severity.index)
+            row["Compatibility"] = TYPE_COMPATIBILITY_LABELS[worst]
+            customers_comparison.append(row)
     
     comparison_df = pd.DataFrame(customers_comparison)
     # Ensure all columns are strings to avoid PyArrow issues
@@ -1093,14 +1250,7 @@ def show_cross_platform_analysis(sample_data, claude_client):
 
 Focus on practical, actionable recommendations for database administrators."""
 
-                    message = claude_client.messages.create(
-                        model="claude-3-5-sonnet-20241022",
-                        max_tokens=2000,
-                        temperature=0.1,
-                        messages=[{"role": "user", "content": prompt}]
-                    )
-                    
-                    recommendations = message.content[0].text
+                    recommendations, _ = cached_claude_text(claude_client, prompt, max_tokens=2000)
                     
                     st.markdown("""
                     <div class="success-banner">
@@ -1113,203 +1263,5036 @@ Focus on practical, actionable recommendations for database administrators."""
                 except Exception as e:
                     st.error(f"Could not generate migration analysis: {str(e)}")
 
-def show_live_connection_mode():
-    """Show live database connection interface"""
-    
-    st.header("📊 Live Database Connection")
-    st.markdown("**Connect to your live databases for real-time schema documentation**")
-    
-    # Connection tabs
-    conn_tabs = st.tabs(["🐘 PostgreSQL", "🔶 Oracle", "🟦 SQL Server"])
-    
-    with conn_tabs[0]:
-        show_postgres_connection()
-    
-    with conn_tabs[1]:
-        show_oracle_connection()
-    
-    with conn_tabs[2]:
-        show_sqlserver_connection()
+# Compact schema object model
+def generate_synthetic_schema(table_count, columns_per_table):
+    """Plain-dict schema shaped like an extracted catalog, for memory benchmarks.
 
-def show_postgres_connection():
-    """PostgreSQL connection interface"""
-    
-    st.subheader("🐘 PostgreSQL Connection")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        pg_host = st.text_input("Host", value="localhost", key="pg_host")
-        pg_port = st.number_input("Port", value=5432, key="pg_port")
-        pg_database = st.text_input("Database", key="pg_database")
-    
-    with col2:
-        pg_username = st.text_input("Username", key="pg_username")
-        pg_password = st.text_input("Password", type="password", key="pg_password")
-        pg_schema = st.text_input("Schema (optional)", value="public", key="pg_schema")
-    
-    if st.button("🔗 Connect to PostgreSQL", type="primary"):
-        # Simulate connection (in real app, use psycopg2 or similar)
-        with st.spinner("Connecting to PostgreSQL..."):
-            time.sleep(2)
-            st.success("✅ Connected successfully!")
-            st.info("📊 Schema extraction would begin here in the full implementation")
+    Strings are built per row, as database drivers return them, rather than shared literals.
+    """
+    types = ("integer", "bigint", "varchar", "numeric", "timestamp", "text", "boolean")
+    tables = []
+    for t in range(table_count):
+        schema = "".join(["sales", "_", str(t % 8)])
+        columns = [
+            {
+                "column_name": "".join(["col_", str(c)]),
+                "data_type": types[c % len(types)] + ("(255)" if c % len(types) == 2 else ""),
+                "is_nullable": c != 0,
+                "default": None,
+                "description": ""
+            }
+            for c in range(columns_per_table)
+        ]
+        tables.append({
+            "table_name": f"table_{t}",
+            "schema": schema,
+            "table_type": "".join(["BASE", " ", "TABLE"]),
+            "row_count": t * 100,
+            "size_mb": t / 10,
+            "description": "",
+            "columns": columns,
+            "indexes": [{"index_name": f"table_{t}_pkey", "columns": ["".join(["col_", "0"])],
+                         "index_type": "".join(["PRIMARY", " KEY"]), "is_unique": True}],
+            "constraints": [{"constraint_name": f"table_{t}_pkey", "constraint_type": "".join(["PRIMARY", " KEY"]),
+                             "columns": ["".join(["col_", "0"])]}]
+        })
+    return {"database_info": {"name": "benchmark"}, "tables": tables, "views": [], "functions": [], "procedures": []}
 
-def show_oracle_connection():
-    """Oracle connection interface"""
-    
-    st.subheader("🔶 Oracle Connection")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        oracle_host = st.text_input("Host", value="localhost", key="oracle_host")
-        oracle_port = st.number_input("Port", value=1521, key="oracle_port")
-        oracle_service = st.text_input("Service Name", key="oracle_service")
-    
-    with col2:
-        oracle_username = st.text_input("Username", key="oracle_username")
-        oracle_password = st.text_input("Password", type="password", key="oracle_password")
-        oracle_schema = st.text_input("Schema (optional)", key="oracle_schema")
-    
-    if st.button("🔗 Connect to Oracle", type="primary"):
-        with st.spinner("Connecting to Oracle..."):
-            time.sleep(2)
-            st.success("✅ Connected successfully!")
-            st.info("📊 Schema extraction would begin here in the full implementation")
+def measure_schema_memory(table_count, columns_per_table):
+    """Retained memory (bytes) of the same schema as nested dicts and as the compact model"""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        as_dicts = generate_synthetic_schema(table_count, columns_per_table)
+        dict_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        del as_dicts
 
-def show_sqlserver_connection():
-    """SQL Server connection interface"""
-    
-    st.subheader("🟦 SQL Server Connection")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        sql_server = st.text_input("Server", value="localhost", key="sql_server")
-        sql_port = st.number_input("Port", value=1433, key="sql_port")
-        sql_database = st.text_input("Database", key="sql_database")
-    
-    with col2:
-        sql_username = st.text_input("Username", key="sql_username")
-        sql_password = st.text_input("Password", type="password", key="sql_password")
-        sql_auth = st.selectbox("Authentication", ["SQL Server", "Windows"], key="sql_auth")
-    
-    if st.button("🔗 Connect to SQL Server", type="primary"):
-        with st.spinner("Connecting to SQL Server..."):
-            time.sleep(2)
-            st.success("✅ Connected successfully!")
-            st.info("📊 Schema extraction would begin here in the full implementation")
+        baseline = tracemalloc.get_traced_memory()[0]
+        as_model = compact_schema(generate_synthetic_schema(table_count, columns_per_table))
+        model_bytes = tracemalloc.get_traced_memory()[0] - baseline
+        del as_model
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    return {"columns": table_count * columns_per_table, "dict_bytes": dict_bytes, "model_bytes": model_bytes}
 
-def show_file_upload_mode():
-    """Show file upload interface for schema files"""
-    
-    st.header("📁 Schema File Upload")
-    st.markdown("**Upload schema files or DDL scripts for documentation generation**")
-    
-    # File upload area
-    uploaded_files = st.file_uploader(
-        "Choose schema files",
-        accept_multiple_files=True,
-        type=['sql', 'ddl', 'json', 'xml', 'txt'],
-        help="Upload DDL scripts, schema exports, or metadata files"
-    )
-    
-    if uploaded_files:
-        st.subheader("📋 Uploaded Files")
-        
-        for file in uploaded_files:
-            with st.expander(f"📄 {file.name} ({file.size} bytes)"):
-                # Show file preview
-                if file.type == "text/plain" or file.name.endswith(('.sql', '.ddl')):
-                    content = str(file.read(), "utf-8")
-                    st.code(content[:1000] + "..." if len(content) > 1000 else content, language="sql")
-                    
-                    if st.button(f"📊 Parse {file.name}", key=f"parse_{file.name}"):
-                        with st.spinner(f"Parsing {file.name}..."):
-                            time.sleep(2)
-                            st.success(f"✅ Successfully parsed {file.name}")
-                            st.info("📖 Documentation generation would begin here")
+def show_memory_benchmark():
+    """Sidebar diagnostic comparing dict and compact schema memory use"""
+    with st.expander("🧪 Diagnostics"):
+        table_count = st.number_input("Tables", min_value=10, max_value=100000, value=2000, step=100,
+                                      key="bench_tables")
+        columns_per_table = st.number_input("Columns per table", min_value=1, max_value=500, value=50,
+                                            key="bench_columns")
+        if st.button("📏 Run Memory Benchmark", key="bench_run"):
+            with st.spinner("Measuring..."):
+                result = measure_schema_memory(int(table_count), int(columns_per_table))
+            st.metric("Nested dicts", f"{result['dict_bytes'] / (1024 * 1024):,.1f} MB",
+                      f"{result['dict_bytes'] / result['columns']:,.0f} B/column", delta_color="off")
+            st.metric("Compact model", f"{result['model_bytes'] / (1024 * 1024):,.1f} MB",
+                      f"{result['model_bytes'] / result['columns']:,.0f} B/column", delta_color="off")
+            st.caption(f"{result['dict_bytes'] / max(result['model_bytes'], 1):.1f}x smaller "
+                       f"for {result['columns']:,} columns")
 
-def show_cross_platform_comparison():
-    """Show cross-platform comparison interface"""
-    
-    st.header("🔄 Cross-Platform Schema Comparison")
-    st.markdown("**Compare schemas across different database platforms**")
-    
-    # Source and target selection
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.subheader("📊 Source Database")
-        source_db = st.selectbox("Source Platform", ["PostgreSQL", "Oracle", "SQL Server"], key="source")
-        source_schema = st.text_input("Source Schema/Database", key="source_schema")
-    
-    with col2:
-        st.subheader("🎯 Target Database")
-        target_db = st.selectbox("Target Platform", ["PostgreSQL", "Oracle", "SQL Server"], key="target")
-        target_schema = st.text_input("Target Schema/Database", key="target_schema")
-    
-    # Comparison options
-    st.subheader("🔧 Comparison Options")
-    
-    col1, col2, col3 = st.columns(3)
-    
+# Columnar data dictionary
+DATA_TYPE_PATTERN = (r"^(?P<base_type>[^(]*)(?:\(\s*(?P<precision>\d*)[^,)]*(?:,\s*(?P<scale>-?\d+))?[^)]*\))?"
+                     r"(?P<suffix>.*)$")
+DECIMAL_TYPE_NAMES = ["NUMERIC", "DECIMAL", "DEC", "NUMBER"]
+
+def empty_to_null_int(values):
+    """Cast regex-extracted digit strings to int32, with '' as null"""
+    return pc.cast(pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values), pa.int32())
+
+class SchemaCatalog:
+    """Arrow tables for the tables, columns and indexes of one or more schemas.
+
+    ``columns`` and ``indexes`` reference ``tables`` through ``table_id``, so aggregates,
+    filters and group-bys run vectorized in pyarrow.compute instead of Python loops.
+    """
+
+    def __init__(self, tables, columns, indexes):
+        self.tables = tables
+        self.columns = columns
+        self.indexes = indexes
+
+    @classmethod
+    def from_schema(cls, db_data, database=None):
+        table_cols = {k: [] for k in ("table_id", "schema", "table_name", "table_type", "row_count", "size_mb",
+                                      "column_count", "index_count", "constraint_count")}
+        column_cols = {k: [] for k in ("table_id", "ordinal", "column_name", "data_type", "is_nullable", "has_default")}
+        index_cols = {k: [] for k in ("table_id", "index_name", "index_type", "is_unique", "column_count")}
+
+        for table_id, table in enumerate(db_data.get("tables", [])):
+            columns = table.get("columns") or []
+            indexes = table.get("indexes") or []
+            table_cols["table_id"].append(table_id)
+            table_cols["schema"].append(table.get("schema"))
+            table_cols["table_name"].append(table.get("table_name"))
+            table_cols["table_type"].append(table.get("table_type"))
+            table_cols["row_count"].append(table.get("row_count") or 0)
+            table_cols["size_mb"].append(float(table.get("size_mb") or 0))
+            table_cols["column_count"].append(len(columns))
+            table_cols["index_count"].append(len(indexes))
+            table_cols["constraint_count"].append(len(table.get("constraints") or []))
+            for ordinal, col in enumerate(columns, 1):
+                column_cols["table_id"].append(table_id)
+                column_cols["ordinal"].append(ordinal)
+                column_cols["column_name"].append(col.get("column_name"))
+                column_cols["data_type"].append(col.get("data_type") or "")
+                column_cols["is_nullable"].append(bool(col.get("is_nullable")))
+                column_cols["has_default"].append(col.get("default") is not None)
+            for idx in indexes:
+                index_cols["table_id"].append(table_id)
+                index_cols["index_name"].append(idx.get("index_name"))
+                index_cols["index_type"].append(idx.get("index_type"))
+                index_cols["is_unique"].append(bool(idx.get("is_unique")))
+                index_cols["column_count"].append(len(idx.get("columns") or []))
+
+        tables = pa.table({
+            "table_id": pa.array(table_cols["table_id"], pa.int32()),
+            "schema": pa.array(table_cols["schema"], pa.string()),
+            "table_name": pa.array(table_cols["table_name"], pa.string()),
+            "table_type": pa.array(table_cols["table_type"], pa.string()),
+            "row_count": pa.array(table_cols["row_count"], pa.int64()),
+            "size_mb": pa.array(table_cols["size_mb"], pa.float64()),
+            "column_count": pa.array(table_cols["column_count"], pa.int32()),
+            "index_count": pa.array(table_cols["index_count"], pa.int32()),
+            "constraint_count": pa.array(table_cols["constraint_count"], pa.int32()),
+        })
+        if database is not None:
+            tables = tables.append_column("database", pa.array([database] * tables.num_rows, pa.string()))
+
+        data_type = pc.utf8_upper(pa.array(column_cols["data_type"], pa.string()))
+        parts = pc.extract_regex(data_type, DATA_TYPE_PATTERN)
+        columns = pa.table({
+            "table_id": pa.array(column_cols["table_id"], pa.int32()),
+            "ordinal": pa.array(column_cols["ordinal"], pa.int32()),
+            "column_name": pa.array(column_cols["column_name"], pa.string()),
+            "data_type": data_type,
+            "base_type": pc.utf8_trim_whitespace(parts.field("base_type")),
+            # Length for character types, precision for numerics
+            "precision": empty_to_null_int(parts.field("precision")),
+            "scale": empty_to_null_int(parts.field("scale")),
+            "is_nullable": pa.array(column_cols["is_nullable"], pa.bool_()),
+            "has_default": pa.array(column_cols["has_default"], pa.bool_()),
+        })
+        indexes = pa.table({
+            "table_id": pa.array(index_cols["table_id"], pa.int32()),
+            "index_name": pa.array(index_cols["index_name"], pa.string()),
+            "index_type": pa.array(index_cols["index_type"], pa.string()),
+            "is_unique": pa.array(index_cols["is_unique"], pa.bool_()),
+            "column_count": pa.array(index_cols["column_count"], pa.int32()),
+        })
+        return cls(tables, columns, indexes)
+
+    @classmethod
+    def combine(cls, catalogs):
+        """Concatenate per-database catalogs (built with ``database=``), renumbering table ids"""
+        parts = ([], [], [])
+        offset = pa.scalar(0, pa.int32())
+        for catalog in catalogs:
+            for part, table in zip(parts, (catalog.tables, catalog.columns, catalog.indexes)):
+                part.append(table.set_column(0, "table_id", pc.add(table["table_id"], offset)))
+            offset = pa.scalar(offset.as_py() + catalog.tables.num_rows, pa.int32())
+        return cls(*(pa.concat_tables(part) for part in parts))
+
+    def totals(self):
+        """Schema-wide counts and sums"""
+        return {
+            "tables": self.tables.num_rows,
+            "rows": pc.sum(self.tables["row_count"]).as_py() or 0,
+            "size_mb": pc.sum(self.tables["size_mb"]).as_py() or 0.0,
+            "columns": self.columns.num_rows,
+            "indexes": self.indexes.num_rows,
+            "nullable_columns": pc.sum(self.columns["is_nullable"]).as_py() or 0,
+        }
+
+    def type_summary(self):
+        """Column count per base data type, most common first"""
+        summary = self.columns.group_by("base_type").aggregate([("column_name", "count"), ("precision", "max")])
+        return (summary.select(["base_type", "column_name_count", "precision_max"])
+                .rename_columns(["base_type", "columns", "max_precision"])
+                .sort_by([("columns", "descending")]))
+
+    def filter_tables(self, name_contains=None, schemas=None, min_rows=None, min_size_mb=None,
+                      sort_by="table_name", descending=False):
+        """Tables matching the filters, sorted by one catalog column (ties keep catalog order)"""
+        mask = pa.scalar(True)
+        if name_contains:
+            mask = pc.and_(mask, pc.match_substring(self.tables["table_name"], name_contains, ignore_case=True))
+        if schemas:
+            mask = pc.and_kleene(mask, pc.is_in(self.tables["schema"], value_set=pa.array(schemas, pa.string())))
+        if min_rows:
+            mask = pc.and_(mask, pc.greater_equal(self.tables["row_count"], pa.scalar(min_rows, pa.int64())))
+        if min_size_mb:
+            mask = pc.and_(mask, pc.greater_equal(self.tables["size_mb"], pa.scalar(float(min_size_mb))))
+        if isinstance(mask, pa.Scalar):
+            matched = self.tables
+        else:
+            matched = self.tables.filter(pc.fill_null(mask, False))
+        return matched.sort_by([(sort_by, "descending" if descending else "ascending"), ("table_id", "ascending")])
+
+    def filter_columns(self, base_types=None, min_precision=None, nullable_only=False, name_contains=None):
+        """Columns matching the filters, joined with their table's schema and name"""
+        mask = pa.scalar(True)
+        if base_types:
+            mask = pc.and_(mask, pc.is_in(self.columns["base_type"], value_set=pa.array(base_types, pa.string())))
+        if min_precision:
+            mask = pc.and_kleene(mask, pc.greater(self.columns["precision"], pa.scalar(min_precision, pa.int32())))
+        if nullable_only:
+            mask = pc.and_(mask, self.columns["is_nullable"])
+        if name_contains:
+            mask = pc.and_(mask, pc.match_substring(self.columns["column_name"], name_contains, ignore_case=True))
+        if isinstance(mask, pa.Scalar):
+            matched = self.columns
+        else:
+            matched = self.columns.filter(pc.fill_null(mask, False))
+        table_keys = [c for c in ("table_id", "database", "schema", "table_name") if c in self.tables.column_names]
+        joined = matched.join(self.tables.select(table_keys), "table_id")
+        return joined.select([c for c in joined.column_names if c != "table_id"])
+
+def derived_schema_data(db_data, key, build):
+    """Build a structure derived from a schema once per compact Database record"""
+    if not isinstance(db_data, Database):
+        return build(db_data)
+    derived = getattr(db_data, "_derived", None)
+    if derived is None:
+        derived = db_data._derived = {}
+    if key not in derived:
+        derived[key] = build(db_data)
+    return derived[key]
+
+def schema_catalog(db_data):
+    """Columnar catalog for a schema; built once per compact Database record"""
+    return derived_schema_data(db_data, "catalog", SchemaCatalog.from_schema)
+
+def show_column_filters(catalog, key_prefix):
+    """Vectorized column search over a catalog"""
+    base_types = sorted(t for t in catalog.columns["base_type"].unique().to_pylist() if t)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
-        compare_tables = st.checkbox("📋 Compare Tables", value=True)
-        compare_columns = st.checkbox("📝 Compare Columns", value=True)
-        compare_indexes = st.checkbox("🔍 Compare Indexes", value=True)
-    
+        selected_types = st.multiselect("Data types", base_types, key=f"{key_prefix}_types")
     with col2:
-        compare_constraints = st.checkbox("🔒 Compare Constraints", value=True)
-        compare_views = st.checkbox("👁️ Compare Views", value=True)
-        compare_procedures = st.checkbox("⚙️ Compare Procedures", value=True)
-    
+        min_precision = st.number_input("Precision/length greater than", min_value=0, value=0,
+                                        key=f"{key_prefix}_precision")
     with col3:
-        show_differences = st.checkbox("🔍 Show Only Differences", value=False)
-        include_migration_script = st.checkbox("📜 Generate Migration Script", value=True)
-        include_mapping_report = st.checkbox("📊 Include Mapping Report", value=True)
-    
-    # Generate comparison
-    if st.button("🔄 Generate Comparison Report", type="primary", use_container_width=True):
-        if source_db == target_db:
-            st.warning("⚠️ Source and target databases are the same!")
+        name_contains = st.text_input("Column name contains", key=f"{key_prefix}_name")
+    with col4:
+        nullable_only = st.checkbox("Nullable only", key=f"{key_prefix}_nullable")
+
+    started_at = time.perf_counter()
+    matched = catalog.filter_columns(selected_types, int(min_precision), nullable_only, name_contains)
+    st.caption(f"{matched.num_rows:,} of {catalog.columns.num_rows:,} columns matched in "
+               f"{(time.perf_counter() - started_at) * 1000:.0f} ms")
+    st.dataframe(matched.slice(0, 1000).to_pandas(), use_container_width=True, hide_index=True)
+
+def show_column_analytics(db_name, db_data):
+    """Type distribution and column search for one schema"""
+    catalog = schema_catalog(db_data)
+    if not catalog.columns.num_rows:
+        return
+    with st.expander("📈 Column Analytics"):
+        st.dataframe(catalog.type_summary().to_pandas(), use_container_width=True, hide_index=True)
+        show_column_filters(catalog, f"analytics_{db_name}")
+
+# Schema name and relationship index
+FOREIGN_KEY_TARGET = re.compile(r"^\s*(?:(?P<schema>[^.(]+)\.)?(?P<table>[^(]+?)\s*(?:\((?P<columns>[^)]*)\))?\s*$")
+
+def split_reference_target(references):
+    """Split a 'schema.table(col, ...)' references string into (schema, table, columns)"""
+    match = FOREIGN_KEY_TARGET.match(references or "")
+    if not match:
+        return None, None, []
+    columns = [c.strip() for c in (match.group("columns") or "").split(",") if c.strip()]
+    return match.group("schema"), match.group("table"), columns
+
+class SchemaIndex:
+    """Name maps and foreign-key adjacency for one schema.
+
+    Tables are keyed by (schema, table_name). Lookups try the exact name first and fall back to a
+    case-insensitive match, so an unquoted "customers" finds CUSTOMERS in Oracle or Customers in
+    SQL Server, while a quoted mixed-case name that exists as written still wins.
+    """
+
+    def __init__(self, db_data):
+        self.tables = {}
+        self.table_names = {}
+        self.folded_table_names = {}
+        self.routines = {}
+        self.folded_routines = {}
+        self.outgoing = {}
+        self.incoming = {}
+        self.unresolved = []
+        self._columns = {}
+
+        for table in db_data.get("tables", []):
+            key = (table.get("schema") or "", table["table_name"])
+            self.tables[key] = table
+            self.table_names.setdefault(key[1], []).append(key)
+            self.folded_table_names.setdefault(key[1].casefold(), []).append(key)
+
+        for kind, name_field in (("functions", "function_name"), ("procedures", "procedure_name")):
+            for routine in db_data.get(kind, []):
+                name = routine.get(name_field)
+                if name:
+                    self.routines.setdefault(name, []).append(routine)
+                    self.folded_routines.setdefault(name.casefold(), []).append(routine)
+
+        for key, table in self.tables.items():
+            for constraint in table.get("constraints") or []:
+                if constraint.get("constraint_type") != "FOREIGN KEY" or not constraint.get("references"):
+                    continue
+                ref_schema, ref_table, ref_columns = split_reference_target(constraint["references"])
+                edge = {
+                    "constraint_name": constraint.get("constraint_name"),
+                    "table": key,
+                    "columns": list(constraint.get("columns") or []),
+                    "referenced_table": self.table_key(ref_table, ref_schema, prefer_schema=key[0]) if ref_table else None,
+                    "referenced_columns": ref_columns
+                }
+                self.outgoing.setdefault(key, []).append(edge)
+                if edge["referenced_table"] is None:
+                    self.unresolved.append(edge)
+                else:
+                    self.incoming.setdefault(edge["referenced_table"], []).append(edge)
+
+    def table_key(self, name, schema=None, prefer_schema=None):
+        """Resolve a table name to its (schema, table_name) key, or None"""
+        if schema is not None:
+            if (schema, name) in self.tables:
+                return (schema, name)
+            folded_schema = schema.casefold()
+            candidates = [k for k in self.folded_table_names.get(name.casefold(), ())
+                          if k[0].casefold() == folded_schema]
         else:
-            generate_comparison_report(source_db, target_db, source_schema, target_schema,
-                                     compare_tables, compare_columns, compare_indexes, 
-                                     compare_constraints, compare_views, compare_procedures,
-                                     show_differences, include_migration_script, include_mapping_report)
+            candidates = self.table_names.get(name) or self.folded_table_names.get(name.casefold(), ())
+            if len(candidates) > 1 and prefer_schema is not None:
+                candidates = [k for k in candidates if k[0] == prefer_schema] or candidates
+        return candidates[0] if candidates else None
 
-def generate_comparison_report(source_db, target_db, source_schema, target_schema,
-                             compare_tables, compare_columns, compare_indexes, 
-                             compare_constraints, compare_views, compare_procedures,
-                             show_differences, include_migration_script, include_mapping_report):
-    """Generate cross-platform comparison report"""
+    def find_table(self, name, schema=None):
+        key = self.table_key(name, schema)
+        return self.tables[key] if key else None
+
+    def find_column(self, table_name, column_name, schema=None):
+        """Look up a column by table and column name; per-table maps are built on first use"""
+        key = self.table_key(table_name, schema)
+        if key is None:
+            return None
+        columns = self._columns.get(key)
+        if columns is None:
+            exact, folded = {}, {}
+            for column in self.tables[key].get("columns") or []:
+                exact[column["column_name"]] = column
+                folded.setdefault(column["column_name"].casefold(), column)
+            columns = self._columns[key] = (exact, folded)
+        return columns[0].get(column_name) or columns[1].get(column_name.casefold())
+
+    def find_routines(self, name):
+        """All functions/procedures with this name (overloads included)"""
+        return self.routines.get(name) or self.folded_routines.get(name.casefold(), [])
+
+    def references_from(self, table_name, schema=None):
+        """Foreign keys declared on a table"""
+        key = self.table_key(table_name, schema)
+        return self.outgoing.get(key, []) if key else []
+
+    def referenced_by(self, table_name, schema=None, column_name=None):
+        """Foreign keys in other tables that point at a table (optionally at one of its columns)"""
+        key = self.table_key(table_name, schema)
+        edges = self.incoming.get(key, []) if key else []
+        if column_name is not None:
+            folded = column_name.casefold()
+            edges = [e for e in edges if any(c.casefold() == folded for c in e["referenced_columns"])]
+        return edges
+
+def schema_index(db_data):
+    """Name and relationship index for a schema; built once per compact Database record"""
+    return derived_schema_data(db_data, "index", SchemaIndex)
+
+# ER diagrams
+ER_CLUSTER_MAX_TABLES = 40
+ER_MAX_ROW_TABLES = 6
+ER_MAX_COLUMNS = 8
+ER_CHAR_WIDTH = 7
+ER_MARGIN = 20
+ER_GAP_X = 40
+ER_GAP_Y = 60
+
+def compute_schema_fingerprint(db_data):
+    """Hash of every table's name, columns and constraints (or its catalog fingerprint when known)"""
+    digest = hashlib.sha256()
+    for table in db_data.get("tables", []):
+        digest.update(f"{table.get('schema')}|{table['table_name']}|".encode("utf-8"))
+        if table.get("fingerprint"):
+            digest.update(table["fingerprint"].encode("utf-8"))
+        else:
+            for column in table.get("columns") or []:
+                digest.update(f"{column.get('column_name')}:{column.get('data_type')}:{column.get('is_nullable')};".encode("utf-8"))
+            for constraint in table.get("constraints") or []:
+                digest.update(f"{constraint.get('constraint_type')}:{constraint.get('columns')}:"
+                              f"{constraint.get('references')};".encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:20]
+
+def schema_fingerprint(db_data):
+    """Content fingerprint for a schema; built once per compact Database record"""
+    return derived_schema_data(db_data, "fingerprint", compute_schema_fingerprint)
+
+def er_clusters(index, max_tables=ER_CLUSTER_MAX_TABLES):
+    """Partition the FK graph into diagrams of at most max_tables tables.
+
+    Connected components that fit are kept whole; larger ones are split by breadth-first growth
+    from their best-connected remaining table. Tables without relationships are grouped separately.
+    """
+    neighbors = {key: set() for key in index.tables}
+    for key, edges in index.outgoing.items():
+        for edge in edges:
+            target = edge["referenced_table"]
+            if target is not None and target != key:
+                neighbors[key].add(target)
+                neighbors[target].add(key)
+
+    clusters, standalone, seen = [], [], set()
+    for start in index.tables:
+        if start in seen:
+            continue
+        if not neighbors[start]:
+            seen.add(start)
+            standalone.append(start)
+            continue
+        component, queue = [start], deque([start])
+        seen.add(start)
+        while queue:
+            for neighbor in neighbors[queue.popleft()]:
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    component.append(neighbor)
+                    queue.append(neighbor)
+        if len(component) <= max_tables:
+            clusters.append(component)
+            continue
+
+        parts, owner = [], {}
+        for seed in sorted(component, key=lambda k: len(neighbors[k]), reverse=True):
+            if seed in owner:
+                continue
+            cluster, queue = [seed], deque([seed])
+            owner[seed] = len(parts)
+            while queue and len(cluster) < max_tables:
+                for neighbor in neighbors[queue.popleft()]:
+                    if neighbor not in owner and len(cluster) < max_tables:
+                        owner[neighbor] = len(parts)
+                        cluster.append(neighbor)
+                        queue.append(neighbor)
+            parts.append(cluster)
+
+        # Fold the small fragments growth leaves behind into the best-linked cluster with room,
+        # then pack whatever is left together
+        fragments = []
+        for i in sorted(range(len(parts)), key=lambda i: len(parts[i])):
+            part = parts[i]
+            if len(part) >= max_tables // 4:
+                break
+            links = Counter(owner[n] for key in part for n in neighbors[key] if owner[n] != i)
+            for j, _ in links.most_common():
+                if parts[j] and len(parts[j]) + len(part) <= max_tables:
+                    parts[j].extend(part)
+                    for key in part:
+                        owner[key] = j
+                    break
+            else:
+                fragments.extend(part)
+            parts[i] = []
+        clusters.extend(part for part in parts if part)
+        clusters.extend(fragments[i:i + max_tables] for i in range(0, len(fragments), max_tables))
+
+    clusters.sort(key=len, reverse=True)
+    return ([{"tables": c, "connected": True} for c in clusters] +
+            [{"tables": standalone[i:i + max_tables], "connected": False}
+             for i in range(0, len(standalone), max_tables)])
+
+def er_table_lines(table):
+    """Column lines for a diagram box: key columns first, the rest up to ER_MAX_COLUMNS"""
+    primary, foreign = set(), set()
+    for constraint in table.get("constraints") or []:
+        if constraint.get("constraint_type") == "PRIMARY KEY":
+            primary.update(constraint.get("columns") or [])
+        elif constraint.get("constraint_type") == "FOREIGN KEY":
+            foreign.update(constraint.get("columns") or [])
+    columns = table.get("columns") or []
+    ordered = sorted(columns, key=lambda c: (c["column_name"] not in primary, c["column_name"] not in foreign))
+    lines = []
+    for column in ordered[:ER_MAX_COLUMNS]:
+        name = column["column_name"]
+        marker = "PK " if name in primary else "FK " if name in foreign else ""
+        lines.append(f"{marker}{name}: {column.get('data_type', '')}")
+    if len(columns) > ER_MAX_COLUMNS:
+        lines.append(f"… {len(columns) - ER_MAX_COLUMNS} more columns")
+    return lines
+
+def layout_er_cluster(index, keys):
+    """Layered layout: referenced tables sit above the tables that reference them"""
+    members = set(keys)
+    parents = {key: [] for key in keys}
+    children = {key: [] for key in keys}
+    edges, external = [], []
+    for key in keys:
+        for edge in index.outgoing.get(key, []):
+            target = edge["referenced_table"]
+            if target in members:
+                edges.append((key, target))
+                if target != key:
+                    parents[key].append(target)
+                    children[target].append(key)
+            else:
+                external.append(edge)
+
+    # Longest-path ranking; edges that close a cycle are ignored
+    rank = {}
+    for root in keys:
+        if root in rank:
+            continue
+        stack, visiting = [(root, iter(parents[root]))], {root}
+        while stack:
+            key, pending = stack[-1]
+            for parent in pending:
+                if parent not in rank and parent not in visiting:
+                    visiting.add(parent)
+                    stack.append((parent, iter(parents[parent])))
+                    break
+            else:
+                stack.pop()
+                visiting.discard(key)
+                rank[key] = 1 + max((rank[p] for p in parents[key] if p in rank), default=-1)
+
+    layers = [[] for _ in range(max(rank.values()) + 1)]
+    for key in sorted(keys, key=lambda k: k[1].casefold()):
+        layers[rank[key]].append(key)
+
+    # Barycenter ordering: one sweep down using parents, one sweep up using children
+    position = {}
+    for layer in layers:
+        for i, key in enumerate(layer):
+            position[key] = i
+    for sweep, related in ((range(1, len(layers)), parents), (range(len(layers) - 2, -1, -1), children)):
+        for i in sweep:
+            layer = layers[i]
+            layer.sort(key=lambda k: (sum(position[r] for r in related[k]) / len(related[k])
+                                      if related[k] else position[k]))
+            for j, key in enumerate(layer):
+                position[key] = j
+
+    nodes = {}
+    rows = [layer[i:i + ER_MAX_ROW_TABLES] for layer in layers for i in range(0, len(layer), ER_MAX_ROW_TABLES)]
+    for key in keys:
+        table = index.tables[key]
+        lines = er_table_lines(table)
+        title = ".".join(part for part in key if part)
+        chars = max([len(title)] + [len(line) for line in lines])
+        nodes[key] = {"title": title, "lines": lines,
+                      "w": min(max(chars * ER_CHAR_WIDTH + 20, 140), 320), "h": 30 + 16 * len(lines)}
+
+    row_widths = [sum(nodes[k]["w"] for k in row) + ER_GAP_X * (len(row) - 1) for row in rows]
+    width = max(row_widths) + 2 * ER_MARGIN
+    y = ER_MARGIN
+    for row, row_width in zip(rows, row_widths):
+        x = (width - row_width) / 2
+        for key in row:
+            nodes[key]["x"], nodes[key]["y"] = x, y
+            x += nodes[key]["w"] + ER_GAP_X
+        y += max(nodes[k]["h"] for k in row) + ER_GAP_Y
+    return {"width": width, "height": y - ER_GAP_Y + ER_MARGIN, "nodes": nodes, "edges": edges, "external": external}
+
+def render_er_svg(layout):
+    """Render a cluster layout as a standalone SVG document"""
+    width, height = int(layout["width"]), int(layout["height"])
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+             f'viewBox="0 0 {width} {height}" font-family="Inter, Arial, sans-serif" font-size="11">',
+             '<defs><marker id="er-arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="7" markerHeight="7" '
+             'orient="auto"><path d="M0,0 L10,5 L0,10 z" fill="#667eea"/></marker></defs>',
+             f'<rect width="{width}" height="{height}" fill="#ffffff"/>']
+    nodes = layout["nodes"]
+    for source, target in layout["edges"]:
+        a, b = nodes[source], nodes[target]
+        if source == target:
+            x, y = a["x"] + a["w"], a["y"] + 12
+            path = f"M{x:.0f},{y} C{x + 30:.0f},{y - 20} {x + 30:.0f},{y + 30} {x:.0f},{y + 14}"
+        elif a["y"] == b["y"]:
+            x1, x2, y1 = a["x"] + a["w"] / 2, b["x"] + b["w"] / 2, a["y"]
+            path = f"M{x1:.0f},{y1} C{x1:.0f},{y1 - 40} {x2:.0f},{y1 - 40} {x2:.0f},{y1}"
+        else:
+            x1, x2 = a["x"] + a["w"] / 2, b["x"] + b["w"] / 2
+            y1, y2 = (a["y"], b["y"] + b["h"]) if a["y"] > b["y"] else (a["y"] + a["h"], b["y"])
+            mid = (y1 + y2) / 2
+            path = f"M{x1:.0f},{y1:.0f} C{x1:.0f},{mid:.0f} {x2:.0f},{mid:.0f} {x2:.0f},{y2:.0f}"
+        parts.append(f'<path d="{path}" fill="none" stroke="#667eea" stroke-width="1.3" marker-end="url(#er-arrow)"/>')
+    for node in nodes.values():
+        x, y, w, h = node["x"], node["y"], node["w"], node["h"]
+        max_chars = (w - 16) // ER_CHAR_WIDTH
+        parts.append(f'<g transform="translate({x:.0f},{y:.0f})">'
+                     f'<rect width="{w}" height="{h}" rx="6" fill="#f8f9fa" stroke="#667eea"/>'
+                     f'<rect width="{w}" height="22" rx="6" fill="#667eea"/>'
+                     f'<text x="8" y="15" fill="#ffffff" font-weight="600">{html.escape(node["title"][:max_chars])}</text>')
+        for i, line in enumerate(node["lines"]):
+            text = line if len(line) <= max_chars else line[:max_chars - 1] + "…"
+            parts.append(f'<text x="8" y="{38 + 16 * i}" fill="#2c3e50">{html.escape(text)}</text>')
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "".join(parts)
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_er_diagrams(fingerprint, _db_data, max_tables=ER_CLUSTER_MAX_TABLES):
+    """Cluster, lay out and render a schema's ER diagrams (cached by schema fingerprint)"""
+    index = schema_index(_db_data)
+    diagrams = []
+    for number, cluster in enumerate(er_clusters(index, max_tables), 1):
+        layout = layout_er_cluster(index, cluster["tables"])
+        names = [key[1] for key in cluster["tables"][:3]]
+        more = f", … (+{len(cluster['tables']) - 3})" if len(cluster["tables"]) > 3 else ""
+        kind = "Cluster" if cluster["connected"] else "Standalone tables"
+        diagrams.append({
+            "title": f"{kind} {number}: {', '.join(names)}{more}",
+            "tables": len(cluster["tables"]),
+            "svg": render_er_svg(layout),
+            "external": [f"{edge['table'][1]} → {edge['referenced_table'][1] if edge['referenced_table'] else '?'}"
+                         for edge in layout["external"]]
+        })
+    return diagrams
+
+def schema_er_diagrams(db_data):
+    return build_er_diagrams(schema_fingerprint(db_data), db_data)
+
+def er_diagram_image(svg):
+    """Embed an SVG as a data-URI image so its markup bypasses Markdown processing"""
+    encoded = base64.b64encode(svg.encode("utf-8")).decode("ascii")
+    return f'<img src="data:image/svg+xml;base64,{encoded}" style="max-width: none;"/>'
+
+def er_diagrams_html(diagrams):
+    """HTML section with every diagram, for the documentation export"""
+    sections = ["<h2>🗺️ Entity Relationship Diagrams</h2>"]
+    for diagram in diagrams:
+        sections.append(f"<h3>{html.escape(diagram['title'])}</h3>"
+                        f'<div style="overflow-x: auto;">{er_diagram_image(diagram["svg"])}</div>')
+    return "\n".join(sections)
+
+def show_er_diagrams(db_name, db_data):
+    """Per-cluster ER diagrams built from the foreign key constraints"""
+    if not db_data.get("tables"):
+        return
+    with st.expander("🗺️ ER Diagrams"):
+        started_at = time.perf_counter()
+        diagrams = schema_er_diagrams(db_data)
+        st.caption(f"{len(diagrams)} diagrams for {len(db_data['tables']):,} tables "
+                   f"({(time.perf_counter() - started_at) * 1000:.0f} ms)")
+        choice = st.selectbox("Diagram", range(len(diagrams)), format_func=lambda i: diagrams[i]["title"],
+                              key=f"er_{db_name}")
+        diagram = diagrams[choice]
+        st.markdown(f'<div style="overflow-x: auto;">{er_diagram_image(diagram["svg"])}</div>',
+                    unsafe_allow_html=True)
+        if diagram["external"]:
+            st.caption("References to tables in other diagrams: " + ", ".join(diagram["external"][:20]) +
+                       (" …" if len(diagram["external"]) > 20 else ""))
+        st.download_button("⬇️ Download SVG", diagram["svg"], file_name=f"{db_name.lower()}_er_{choice + 1}.svg",
+                           mime="image/svg+xml", key=f"er_download_{db_name}")
+
+# Live schema extraction
+CATALOG_FETCH_SIZE = 5000
+
+def iter_cursor_rows(cursor, batch_size=CATALOG_FETCH_SIZE):
+    """Yield catalog rows in fetchmany batches so large result sets are never materialized at once"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+def parse_schema_list(schema_text: str) -> Optional[List[str]]:
+    """Split a comma-separated schema input into a list (None means all schemas)"""
+    schemas = [s.strip() for s in (schema_text or "").split(",") if s.strip()]
+    return schemas or None
+
+def connect_postgres(host, port, database, username, password):
+    """Open a read-only PostgreSQL connection"""
+    try:
+        import psycopg2
+    except ImportError:
+        raise Exception("psycopg2 not available for PostgreSQL connections")
+
+    conn = psycopg2.connect(
+        host=host,
+        port=int(port),
+        dbname=database,
+        user=username,
+        password=password,
+        connect_timeout=10,
+        application_name="multidbschemadoc"
+    )
+    conn.set_session(readonly=True, autocommit=True)
+    return conn
+
+POSTGRES_TABLE_TYPES = {"r": "BASE TABLE", "p": "PARTITIONED TABLE", "f": "FOREIGN TABLE"}
+POSTGRES_CONSTRAINT_TYPES = {"p": "PRIMARY KEY", "u": "UNIQUE", "f": "FOREIGN KEY", "c": "CHECK", "x": "EXCLUDE"}
+
+def postgres_schema_filter(schemas):
+    """Build the pg_namespace filter shared by every catalog query"""
+    if schemas:
+        return "n.nspname = ANY(%(schemas)s)"
+    return "n.nspname <> 'information_schema' AND n.nspname !~ '^pg_(catalog$|toast|temp_)'"
+
+def postgres_object_filter(name_column, objects):
+    """Restrict a catalog query to specific (schema, name) pairs"""
+    if objects is None:
+        return ""
+    return (f" AND (n.nspname, {name_column}) IN "
+            "(SELECT * FROM unnest(%(object_schemas)s::text[], %(object_names)s::text[]))")
+
+def extract_postgres_schema(conn, schemas=None, objects=None):
+    """Extract tables, columns, indexes, constraints, views and routines with bulk pg_catalog queries.
+
+    Every query covers all requested schemas at once and rows are assembled client-side
+    by relation OID, so the number of round trips does not grow with the number of tables.
+    ``objects`` optionally restricts extraction to (schema, name) pairs for incremental refreshes.
+    """
+    objects = list(objects) if objects is not None else None
+    params = {
+        "schemas": list(schemas) if schemas else None,
+        "object_schemas": [schema for schema, _ in objects] if objects is not None else None,
+        "object_names": [name for _, name in objects] if objects is not None else None
+    }
+    schema_filter = postgres_schema_filter(schemas)
+    relation_filter = postgres_object_filter("c.relname", objects)
+    routine_filter = postgres_object_filter("p.proname", objects)
+    cursor = conn.cursor()
+
+    cursor.execute("""
+        SELECT current_database(), version(), pg_size_pretty(pg_database_size(current_database()))
+    """)
+    db_name, db_version, db_size = cursor.fetchone()
+
+    # Tables
+    tables_by_oid = {}
+    cursor.execute(f"""
+        SELECT c.oid, n.nspname, c.relname, c.relkind, GREATEST(c.reltuples, 0)::bigint,
+               pg_total_relation_size(c.oid), d.description
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_description d
+               ON d.objoid = c.oid AND d.classoid = 'pg_class'::regclass AND d.objsubid = 0
+        WHERE c.relkind IN ('r', 'p', 'f') AND {schema_filter}{relation_filter}
+        ORDER BY n.nspname, c.relname
+    """, params)
+    for oid, schema, name, relkind, row_count, size_bytes, description in iter_cursor_rows(cursor):
+        tables_by_oid[oid] = {
+            "table_name": name,
+            "schema": schema,
+            "table_type": POSTGRES_TABLE_TYPES.get(relkind, "BASE TABLE"),
+            "row_count": int(row_count or 0),
+            "size_mb": round((size_bytes or 0) / (1024 * 1024), 2),
+            "description": description or "",
+            "columns": [],
+            "indexes": [],
+            "constraints": []
+        }
+
+    # Columns
+    cursor.execute(f"""
+        SELECT a.attrelid, a.attname, upper(format_type(a.atttypid, a.atttypmod)), a.attnotnull,
+               pg_get_expr(ad.adbin, ad.adrelid), d.description
+        FROM pg_attribute a
+        JOIN pg_class c ON c.oid = a.attrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_attrdef ad ON ad.adrelid = a.attrelid AND ad.adnum = a.attnum
+        LEFT JOIN pg_description d
+               ON d.objoid = a.attrelid AND d.classoid = 'pg_class'::regclass AND d.objsubid = a.attnum
+        WHERE a.attnum > 0 AND NOT a.attisdropped
+          AND c.relkind IN ('r', 'p', 'f') AND {schema_filter}{relation_filter}
+        ORDER BY a.attrelid, a.attnum
+    """, params)
+    for relid, name, data_type, not_null, default, description in iter_cursor_rows(cursor):
+        table = tables_by_oid.get(relid)
+        if table is not None:
+            table["columns"].append({
+                "column_name": name,
+                "data_type": data_type,
+                "is_nullable": not not_null,
+                "default": default,
+                "description": description or ""
+            })
+
+    # Indexes
+    cursor.execute(f"""
+        SELECT i.indrelid, ic.relname, upper(am.amname), i.indisunique, i.indisprimary,
+               ARRAY(SELECT pg_get_indexdef(i.indexrelid, k, true)
+                     FROM generate_series(1, i.indnkeyatts) AS k ORDER BY k)
+        FROM pg_index i
+        JOIN pg_class ic ON ic.oid = i.indexrelid
+        JOIN pg_am am ON am.oid = ic.relam
+        JOIN pg_class c ON c.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p', 'f') AND {schema_filter}{relation_filter}
+        ORDER BY i.indrelid, ic.relname
+    """, params)
+    for relid, name, access_method, is_unique, is_primary, columns in iter_cursor_rows(cursor):
+        table = tables_by_oid.get(relid)
+        if table is not None:
+            if is_primary:
+                index_type = "PRIMARY KEY"
+            elif is_unique:
+                index_type = "UNIQUE"
+            else:
+                index_type = access_method
+            table["indexes"].append({
+                "index_name": name,
+                "columns": list(columns or []),
+                "index_type": index_type,
+                "is_unique": bool(is_unique)
+            })
+
+    # Constraints
+    cursor.execute(f"""
+        SELECT con.conrelid, con.conname, con.contype,
+               ARRAY(SELECT a.attname
+                     FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                     JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                     ORDER BY k.ord),
+               n.nspname, fn.nspname, fc.relname,
+               ARRAY(SELECT a.attname
+                     FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                     JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                     ORDER BY k.ord),
+               pg_get_constraintdef(con.oid, true)
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_class fc ON fc.oid = con.confrelid
+        LEFT JOIN pg_namespace fn ON fn.oid = fc.relnamespace
+        WHERE con.contype IN ('p', 'u', 'f', 'c', 'x') AND {schema_filter}{relation_filter}
+        ORDER BY con.conrelid, con.conname
+    """, params)
+    for relid, name, contype, columns, schema, ref_schema, ref_table, ref_columns, definition in iter_cursor_rows(cursor):
+        table = tables_by_oid.get(relid)
+        if table is None:
+            continue
+        constraint = {
+            "constraint_name": name,
+            "constraint_type": POSTGRES_CONSTRAINT_TYPES[contype],
+            "columns": list(columns or [])
+        }
+        if contype == "f":
+            ref_name = ref_table if ref_schema == schema else f"{ref_schema}.{ref_table}"
+            constraint["references"] = f"{ref_name}({', '.join(ref_columns or [])})"
+        elif contype in ("c", "x"):
+            constraint["definition"] = definition
+        table["constraints"].append(constraint)
+
+    # Views
+    views = []
+    cursor.execute(f"""
+        SELECT n.nspname, c.relname, pg_get_viewdef(c.oid, true), d.description
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_description d
+               ON d.objoid = c.oid AND d.classoid = 'pg_class'::regclass AND d.objsubid = 0
+        WHERE c.relkind IN ('v', 'm') AND {schema_filter}{relation_filter}
+        ORDER BY n.nspname, c.relname
+    """, params)
+    for schema, name, definition, description in iter_cursor_rows(cursor):
+        views.append({
+            "view_name": name,
+            "schema": schema,
+            "definition": (definition or "").strip(),
+            "description": description or ""
+        })
+
+    # Functions and procedures (members of installed extensions are skipped)
+    functions = []
+    procedures = []
+    cursor.execute(f"""
+        SELECT n.nspname, p.proname, p.prokind, pg_get_function_result(p.oid),
+               pg_get_function_arguments(p.oid), d.description
+        FROM pg_proc p
+        JOIN pg_namespace n ON n.oid = p.pronamespace
+        LEFT JOIN pg_description d ON d.objoid = p.oid AND d.classoid = 'pg_proc'::regclass
+        WHERE p.prokind IN ('f', 'p') AND {schema_filter}{routine_filter}
+          AND NOT EXISTS (SELECT 1 FROM pg_depend dep
+                          WHERE dep.classid = 'pg_proc'::regclass AND dep.objid = p.oid AND dep.deptype = 'e')
+        ORDER BY n.nspname, p.proname
+    """, params)
+    for schema, name, prokind, return_type, arguments, description in iter_cursor_rows(cursor):
+        if prokind == "p":
+            procedures.append({
+                "procedure_name": name,
+                "schema": schema,
+                "parameters": arguments or "",
+                "description": description or ""
+            })
+        else:
+            functions.append({
+                "function_name": name,
+                "schema": schema,
+                "return_type": (return_type or "").upper(),
+                "parameters": arguments or "",
+                "description": description or ""
+            })
+
+    cursor.close()
+
+    return {
+        "database_info": {
+            "name": db_name,
+            "version": db_version.split(" on ")[0].split(",")[0],
+            "size": db_size,
+            "created": "N/A",
+            "last_backup": "N/A"
+        },
+        "tables": list(tables_by_oid.values()),
+        "views": views,
+        "functions": functions,
+        "procedures": procedures
+    }
+
+SQLSERVER_FETCH_SIZE = 20000
+
+def connect_sqlserver(server, port, database, username, password, auth_mode="SQL Server"):
+    """Open a SQL Server connection with pyodbc, falling back to pymssql"""
+    try:
+        import pyodbc
+    except ImportError:
+        pyodbc = None
+
+    if pyodbc is not None:
+        drivers = [d for d in pyodbc.drivers() if "SQL Server" in d]
+        if drivers:
+            conn_str = (
+                f"DRIVER={{{sorted(drivers)[-1]}}};SERVER={server},{int(port)};DATABASE={database};"
+                "TrustServerCertificate=yes;ApplicationIntent=ReadOnly;"
+            )
+            if auth_mode == "Windows":
+                conn_str += "Trusted_Connection=yes;"
+            else:
+                conn_str += f"UID={username};PWD={password};"
+            return pyodbc.connect(conn_str, timeout=10, autocommit=True)
+
+    try:
+        import pymssql
+    except ImportError:
+        raise Exception("pyodbc (with a SQL Server ODBC driver) or pymssql is required for SQL Server connections")
+
+    return pymssql.connect(server=server, port=str(int(port)), user=username, password=password,
+                           database=database, login_timeout=10, autocommit=True)
+
+def format_sqlserver_type(type_name, max_length, precision, scale, is_identity=False,
+                          seed_value=None, increment_value=None):
+    """Render a sys.types name with its length/precision the way SSMS scripts it"""
+    type_name = type_name.upper()
+    if type_name in ("NVARCHAR", "NCHAR"):
+        data_type = f"{type_name}({'MAX' if max_length == -1 else max_length // 2})"
+    elif type_name in ("VARCHAR", "CHAR", "VARBINARY", "BINARY"):
+        data_type = f"{type_name}({'MAX' if max_length == -1 else max_length})"
+    elif type_name in ("DECIMAL", "NUMERIC"):
+        data_type = f"{type_name}({precision},{scale})"
+    elif type_name in ("DATETIME2", "TIME", "DATETIMEOFFSET") and scale != 7:
+        data_type = f"{type_name}({scale})"
+    else:
+        data_type = type_name
+    if is_identity:
+        data_type += f" IDENTITY({seed_value or 1},{increment_value or 1})"
+    return data_type
+
+def extract_sqlserver_schema(conn, schemas=None, objects=None):
+    """Extract a SQL Server database from the sys.* catalog views in bulk.
+
+    Each catalog view is read with one query and large fetchmany batches; rows are folded
+    straight into the table records keyed by object_id, so only one batch of any result
+    set is held in memory at a time. ``objects`` optionally restricts extraction to
+    (schema, name) pairs for incremental refreshes.
+    """
+    placeholder = "%s" if type(conn).__module__.startswith("pymssql") else "?"
+    if schemas:
+        schema_filter = f"s.name IN ({', '.join([placeholder] * len(schemas))})"
+        params = tuple(schemas)
+    else:
+        schema_filter = "s.name NOT IN ('sys', 'INFORMATION_SCHEMA')"
+        params = ()
+
+    objects = list(objects) if objects is not None else None
+
+    def object_filter(name_column):
+        if objects is None:
+            return ""
+        if not objects:
+            return " AND 1 = 0"
+        values = ", ".join([f"({placeholder}, {placeholder})"] * len(objects))
+        return (f" AND EXISTS (SELECT 1 FROM (VALUES {values}) AS o_filter(schema_name, object_name) "
+                f"WHERE o_filter.schema_name = s.name AND o_filter.object_name = {name_column})")
+
+    if objects:
+        params += tuple(value for pair in objects for value in pair)
+
+    cursor = conn.cursor()
+    cursor.arraysize = SQLSERVER_FETCH_SIZE
+
+    def run(sql):
+        cursor.execute(sql, params) if params else cursor.execute(sql)
+        return iter_cursor_rows(cursor, SQLSERVER_FETCH_SIZE)
+
+    cursor.execute("""
+        SELECT DB_NAME(), @@VERSION,
+               (SELECT SUM(CAST(size AS bigint)) * 8 / 1024 FROM sys.database_files),
+               (SELECT create_date FROM sys.databases WHERE database_id = DB_ID())
+    """)
+    db_name, db_version, db_size_mb, db_created = cursor.fetchone()
+
+    # Tables
+    tables_by_id = {}
+    for object_id, schema, name, row_count, used_pages, description in run(f"""
+        SELECT t.object_id, s.name, t.name, ISNULL(r.row_count, 0), ISNULL(u.used_pages, 0),
+               CAST(ep.value AS nvarchar(4000))
+        FROM sys.tables t
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        LEFT JOIN (SELECT object_id, SUM(rows) AS row_count
+                   FROM sys.partitions WHERE index_id IN (0, 1) GROUP BY object_id) r
+               ON r.object_id = t.object_id
+        LEFT JOIN (SELECT p.object_id, SUM(a.used_pages) AS used_pages
+                   FROM sys.partitions p JOIN sys.allocation_units a ON a.container_id = p.partition_id
+                   GROUP BY p.object_id) u
+               ON u.object_id = t.object_id
+        LEFT JOIN sys.extended_properties ep
+               ON ep.class = 1 AND ep.major_id = t.object_id AND ep.minor_id = 0 AND ep.name = 'MS_Description'
+        WHERE t.is_ms_shipped = 0 AND {schema_filter}{object_filter('t.name')}
+        ORDER BY s.name, t.name
+    """):
+        tables_by_id[object_id] = {
+            "table_name": name,
+            "schema": schema,
+            "table_type": "BASE TABLE",
+            "row_count": int(row_count),
+            "size_mb": round(used_pages * 8 / 1024, 2),
+            "description": description or "",
+            "columns": [],
+            "indexes": [],
+            "constraints": []
+        }
+
+    # Columns
+    for (object_id, name, type_name, max_length, precision, scale, is_nullable, is_identity,
+         seed_value, increment_value, default, description) in run(f"""
+        SELECT c.object_id, c.name, ty.name, c.max_length, c.precision, c.scale, c.is_nullable,
+               c.is_identity, CAST(ic.seed_value AS nvarchar(50)), CAST(ic.increment_value AS nvarchar(50)),
+               dc.definition, CAST(ep.value AS nvarchar(4000))
+        FROM sys.columns c
+        JOIN sys.tables t ON t.object_id = c.object_id
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        JOIN sys.types ty ON ty.user_type_id = c.user_type_id
+        LEFT JOIN sys.identity_columns ic ON ic.object_id = c.object_id AND ic.column_id = c.column_id
+        LEFT JOIN sys.default_constraints dc
+               ON dc.parent_object_id = c.object_id AND dc.parent_column_id = c.column_id
+        LEFT JOIN sys.extended_properties ep
+               ON ep.class = 1 AND ep.major_id = c.object_id AND ep.minor_id = c.column_id AND ep.name = 'MS_Description'
+        WHERE t.is_ms_shipped = 0 AND {schema_filter}{object_filter('t.name')}
+        ORDER BY c.object_id, c.column_id
+    """):
+        table = tables_by_id.get(object_id)
+        if table is not None:
+            table["columns"].append({
+                "column_name": name,
+                "data_type": format_sqlserver_type(type_name, max_length, precision, scale,
+                                                   is_identity, seed_value, increment_value),
+                "is_nullable": bool(is_nullable),
+                "default": strip_sqlserver_default(default),
+                "description": description or ""
+            })
+
+    # Indexes (sys.indexes + sys.index_columns); primary keys and unique constraints are backed by an index
+    current_key = None
+    for (object_id, index_id, name, type_desc, is_unique, is_primary_key, is_unique_constraint,
+         column_name) in run(f"""
+        SELECT i.object_id, i.index_id, i.name, i.type_desc, i.is_unique, i.is_primary_key,
+               i.is_unique_constraint, col.name
+        FROM sys.indexes i
+        JOIN sys.tables t ON t.object_id = i.object_id
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+        JOIN sys.columns col ON col.object_id = ic.object_id AND col.column_id = ic.column_id
+        WHERE i.index_id > 0 AND i.is_hypothetical = 0 AND ic.is_included_column = 0
+          AND t.is_ms_shipped = 0 AND {schema_filter}{object_filter('t.name')}
+        ORDER BY i.object_id, i.index_id, ic.key_ordinal
+    """):
+        table = tables_by_id.get(object_id)
+        if table is None:
+            continue
+        if current_key != (object_id, index_id):
+            current_key = (object_id, index_id)
+            if is_primary_key:
+                index_type = "PRIMARY KEY"
+            elif is_unique_constraint:
+                index_type = "UNIQUE"
+            else:
+                index_type = type_desc
+            index = {"index_name": name, "columns": [], "index_type": index_type, "is_unique": bool(is_unique)}
+            table["indexes"].append(index)
+            constraint = None
+            if is_primary_key or is_unique_constraint:
+                constraint = {"constraint_name": name, "constraint_type": index_type, "columns": []}
+                table["constraints"].append(constraint)
+        index["columns"].append(column_name)
+        if constraint is not None:
+            constraint["columns"].append(column_name)
+
+    # Foreign keys (sys.foreign_keys + sys.foreign_key_columns)
+    current_fk = None
+    for (object_id, fk_id, name, column_name, ref_schema, ref_table, ref_column,
+         parent_schema) in run(f"""
+        SELECT fk.parent_object_id, fk.object_id, fk.name, pc.name, rs.name, rt.name, rc.name, s.name
+        FROM sys.foreign_keys fk
+        JOIN sys.tables t ON t.object_id = fk.parent_object_id
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        JOIN sys.foreign_key_columns fkc ON fkc.constraint_object_id = fk.object_id
+        JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+        JOIN sys.tables rt ON rt.object_id = fk.referenced_object_id
+        JOIN sys.schemas rs ON rs.schema_id = rt.schema_id
+        JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+        WHERE t.is_ms_shipped = 0 AND {schema_filter}{object_filter('t.name')}
+        ORDER BY fk.parent_object_id, fk.object_id, fkc.constraint_column_id
+    """):
+        table = tables_by_id.get(object_id)
+        if table is None:
+            continue
+        if current_fk != fk_id:
+            current_fk = fk_id
+            ref_name = ref_table if ref_schema == parent_schema else f"{ref_schema}.{ref_table}"
+            ref_columns = []
+            fk = {"constraint_name": name, "constraint_type": "FOREIGN KEY", "columns": []}
+            table["constraints"].append(fk)
+        fk["columns"].append(column_name)
+        ref_columns.append(ref_column)
+        fk["references"] = f"{ref_name}({', '.join(ref_columns)})"
+
+    # Check constraints
+    for object_id, name, column_name, definition in run(f"""
+        SELECT cc.parent_object_id, cc.name, col.name, cc.definition
+        FROM sys.check_constraints cc
+        JOIN sys.tables t ON t.object_id = cc.parent_object_id
+        JOIN sys.schemas s ON s.schema_id = t.schema_id
+        LEFT JOIN sys.columns col ON col.object_id = cc.parent_object_id AND col.column_id = cc.parent_column_id
+        WHERE t.is_ms_shipped = 0 AND {schema_filter}{object_filter('t.name')}
+        ORDER BY cc.parent_object_id, cc.name
+    """):
+        table = tables_by_id.get(object_id)
+        if table is not None:
+            table["constraints"].append({
+                "constraint_name": name,
+                "constraint_type": "CHECK",
+                "columns": [column_name] if column_name else [],
+                "definition": strip_sqlserver_default(definition)
+            })
+
+    # Views (sys.views + sys.sql_modules)
+    views = []
+    for schema, name, definition, description in run(f"""
+        SELECT s.name, v.name, m.definition, CAST(ep.value AS nvarchar(4000))
+        FROM sys.views v
+        JOIN sys.schemas s ON s.schema_id = v.schema_id
+        LEFT JOIN sys.sql_modules m ON m.object_id = v.object_id
+        LEFT JOIN sys.extended_properties ep
+               ON ep.class = 1 AND ep.major_id = v.object_id AND ep.minor_id = 0 AND ep.name = 'MS_Description'
+        WHERE v.is_ms_shipped = 0 AND {schema_filter}{object_filter('v.name')}
+        ORDER BY s.name, v.name
+    """):
+        views.append({
+            "view_name": name,
+            "schema": schema,
+            "definition": (definition or "").strip(),
+            "description": description or ""
+        })
+
+    # Procedures and functions; parameters are folded in as they stream past
+    routines_by_id = {}
+    functions = []
+    procedures = []
+    for object_id, schema, name, object_type, description in run(f"""
+        SELECT o.object_id, s.name, o.name, RTRIM(o.type), CAST(ep.value AS nvarchar(4000))
+        FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        LEFT JOIN sys.extended_properties ep
+               ON ep.class = 1 AND ep.major_id = o.object_id AND ep.minor_id = 0 AND ep.name = 'MS_Description'
+        WHERE o.type IN ('P', 'FN', 'IF', 'TF') AND o.is_ms_shipped = 0 AND {schema_filter}{object_filter('o.name')}
+        ORDER BY s.name, o.name
+    """):
+        if object_type == "P":
+            routine = {"procedure_name": name, "schema": schema, "parameters": "", "description": description or ""}
+            procedures.append(routine)
+        else:
+            routine = {
+                "function_name": name,
+                "schema": schema,
+                "return_type": "TABLE" if object_type in ("IF", "TF") else "",
+                "parameters": "",
+                "description": description or ""
+            }
+            functions.append(routine)
+        routines_by_id[object_id] = routine
+
+    for object_id, parameter_id, name, type_name, max_length, precision, scale, is_output in run(f"""
+        SELECT p.object_id, p.parameter_id, p.name, ty.name, p.max_length, p.precision, p.scale, p.is_output
+        FROM sys.parameters p
+        JOIN sys.objects o ON o.object_id = p.object_id
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        JOIN sys.types ty ON ty.user_type_id = p.user_type_id
+        WHERE o.type IN ('P', 'FN', 'IF', 'TF') AND o.is_ms_shipped = 0 AND {schema_filter}{object_filter('o.name')}
+        ORDER BY p.object_id, p.parameter_id
+    """):
+        routine = routines_by_id.get(object_id)
+        if routine is None:
+            continue
+        data_type = format_sqlserver_type(type_name, max_length, precision, scale)
+        if parameter_id == 0:
+            routine["return_type"] = data_type
+            continue
+        parameter = f"{name} {data_type}" + (" OUTPUT" if is_output else "")
+        routine["parameters"] = f"{routine['parameters']}, {parameter}" if routine["parameters"] else parameter
+
+    cursor.close()
+
+    return {
+        "database_info": {
+            "name": db_name,
+            "version": db_version.split(" - ")[0].replace("Microsoft ", "").split(" (")[0],
+            "size": f"{(db_size_mb or 0) / 1024:.1f} GB",
+            "created": db_created.strftime("%Y-%m-%d") if db_created else "N/A",
+            "last_backup": "N/A"
+        },
+        "tables": list(tables_by_id.values()),
+        "views": views,
+        "functions": functions,
+        "procedures": procedures
+    }
+
+ORACLE_FETCH_SIZE = 10000
+
+def connect_oracle(host, port, service_name, username, password):
+    """Open an Oracle connection with python-oracledb (thin mode)"""
+    try:
+        import oracledb
+    except ImportError:
+        raise Exception("python-oracledb not available for Oracle connections")
+
+    # Fetch CLOB/NCLOB dictionary text as plain strings instead of LOB locators, for this connection only
+    lob_types = {oracledb.DB_TYPE_CLOB: oracledb.DB_TYPE_LONG, oracledb.DB_TYPE_NCLOB: oracledb.DB_TYPE_LONG_NVARCHAR}
+
+    def output_type_handler(cursor, name, default_type, size, precision, scale):
+        if default_type in lob_types:
+            return cursor.var(lob_types[default_type], arraysize=cursor.arraysize)
+
+    conn = oracledb.connect(
+        user=username,
+        password=password,
+        dsn=oracledb.makedsn(host, int(port), service_name=service_name),
+        tcp_connect_timeout=10
+    )
+    conn.outputtypehandler = output_type_handler
+    return conn
+
+def format_oracle_type(data_type, data_length, data_precision, data_scale, char_length):
+    """Render an ALL_TAB_COLUMNS type with its length/precision the way Oracle DDL spells it"""
+    if data_type in ("VARCHAR2", "NVARCHAR2", "CHAR", "NCHAR"):
+        return f"{data_type}({char_length or data_length})"
+    if data_type == "RAW":
+        return f"RAW({data_length})"
+    if data_type == "NUMBER" and data_precision is not None:
+        return f"NUMBER({data_precision})" if not data_scale else f"NUMBER({data_precision},{data_scale})"
+    if data_type == "NUMBER" and data_scale == 0:
+        return "INTEGER"
+    if data_type == "FLOAT" and data_precision is not None:
+        return f"FLOAT({data_precision})"
+    return data_type
+
+def list_oracle_owners(conn):
+    """List schemas owned by application users (Oracle-maintained accounts are skipped)"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT DISTINCT t.owner
+        FROM all_tables t
+        JOIN all_users u ON u.username = t.owner
+        WHERE u.oracle_maintained = 'N'
+        ORDER BY t.owner
+    """)
+    owners = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return owners
+
+def oracle_view_readable(conn, view):
+    """Whether the connected user may query a (DBA_*) dictionary view"""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT 1 FROM {view} WHERE ROWNUM = 1")
+        cursor.fetchall()
+        return True
+    except Exception:
+        return False
+    finally:
+        cursor.close()
+
+def oracle_size_from_tables(tables):
+    """Oracle database size reported as the total segment size of the extracted tables"""
+    return f"{sum(t['size_mb'] for t in tables) / 1024:.1f} GB"
+
+def extract_oracle_schema(conn, schemas=None, objects=None):
+    """Extract Oracle schemas from the ALL_* dictionary views, one bulk query per view and owner.
+
+    Dictionary views are slow when probed per object, so every query is filtered by owner
+    on the server, fetched with large prefetch/array sizes and assembled into tables
+    client-side. ``objects`` optionally restricts extraction to (owner, name) pairs for
+    incremental refreshes.
+    """
+    owners = [s.upper() for s in schemas] if schemas else list_oracle_owners(conn)
+    objects = list(objects) if objects is not None else None
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT SYS_CONTEXT('USERENV', 'DB_NAME'),
+               (SELECT banner FROM v$version WHERE banner LIKE 'Oracle%' AND ROWNUM = 1)
+        FROM dual
+    """)
+    db_name, db_version = cursor.fetchone()
+    cursor.close()
+
+    # Table sizes come from segment bytes (which also cover partitioned tables); DBA_SEGMENTS sees every
+    # owner, USER_SEGMENTS only the connected user's. Without a segment, blocks times the tablespace block size.
+    if oracle_view_readable(conn, "dba_segments"):
+        segments = "dba_segments WHERE owner = :owner"
+    else:
+        segments = "user_segments WHERE :owner = USER"
+    tablespaces = "dba_tablespaces" if oracle_view_readable(conn, "dba_tablespaces") else "user_tablespaces"
+
+    tables = []
+    views = []
+    functions = []
+    procedures = []
+
+    for owner in owners:
+        name_binds = {}
+        if objects is not None:
+            names = [name for schema, name in objects if schema == owner]
+            if not names:
+                continue
+            name_binds = {f"n{i}": name for i, name in enumerate(names)}
+
+        def name_filter(name_column):
+            if not name_binds:
+                return ""
+            return f" AND {name_column} IN ({', '.join(':' + bind for bind in name_binds)})"
+
+        cursor = conn.cursor()
+        cursor.prefetchrows = ORACLE_FETCH_SIZE + 1
+        cursor.arraysize = ORACLE_FETCH_SIZE
+
+        def run(sql):
+            cursor.execute(sql, owner=owner, **name_binds)
+            return iter_cursor_rows(cursor, ORACLE_FETCH_SIZE)
+
+        # Tables
+        owner_tables = {}
+        for name, num_rows, size_bytes, description in run(f"""
+            SELECT t.table_name, NVL(t.num_rows, 0),
+                   NVL(seg.bytes, NVL(t.blocks, 0) * NVL(ts.block_size, 8192)), c.comments
+            FROM all_tables t
+            LEFT JOIN (SELECT segment_name, SUM(bytes) AS bytes FROM {segments}
+                         AND segment_type IN ('TABLE', 'TABLE PARTITION', 'TABLE SUBPARTITION')
+                       GROUP BY segment_name) seg ON seg.segment_name = t.table_name
+            LEFT JOIN {tablespaces} ts ON ts.tablespace_name = t.tablespace_name
+            LEFT JOIN all_tab_comments c ON c.owner = t.owner AND c.table_name = t.table_name
+            WHERE t.owner = :owner AND t.nested = 'NO' AND t.secondary = 'N' AND t.dropped = 'NO'{name_filter('t.table_name')}
+            ORDER BY t.table_name
+        """):
+            owner_tables[name] = {
+                "table_name": name,
+                "schema": owner,
+                "table_type": "TABLE",
+                "row_count": int(num_rows),
+                "size_mb": round(size_bytes / (1024 * 1024), 2),
+                "description": description or "",
+                "columns": [],
+                "indexes": [],
+                "constraints": []
+            }
+
+        # Columns
+        for (table_name, name, data_type, data_length, data_precision, data_scale, char_length,
+             nullable, default, description) in run(f"""
+            SELECT c.table_name, c.column_name, c.data_type, c.data_length, c.data_precision, c.data_scale,
+                   c.char_length, c.nullable, c.data_default, cc.comments
+            FROM all_tab_columns c
+            LEFT JOIN all_col_comments cc
+                   ON cc.owner = c.owner AND cc.table_name = c.table_name AND cc.column_name = c.column_name
+            WHERE c.owner = :owner{name_filter('c.table_name')}
+            ORDER BY c.table_name, c.column_id
+        """):
+            table = owner_tables.get(table_name)
+            if table is not None:
+                table["columns"].append({
+                    "column_name": name,
+                    "data_type": format_oracle_type(data_type, data_length, data_precision, data_scale, char_length),
+                    "is_nullable": nullable == "Y",
+                    "default": default.strip() if default else None,
+                    "description": description or ""
+                })
+
+        # Constraints; referenced key columns are resolved on the server by position
+        pk_indexes = set()
+        current_key = None
+        for (table_name, name, constraint_type, generated, condition, index_name, column_name,
+             ref_owner, ref_table, ref_column) in run(f"""
+            SELECT c.table_name, c.constraint_name, c.constraint_type, c.generated, c.search_condition,
+                   c.index_name, cc.column_name, rc.owner, rc.table_name, rcc.column_name
+            FROM all_constraints c
+            LEFT JOIN all_cons_columns cc ON cc.owner = c.owner AND cc.constraint_name = c.constraint_name
+            LEFT JOIN all_constraints rc ON rc.owner = c.r_owner AND rc.constraint_name = c.r_constraint_name
+            LEFT JOIN all_cons_columns rcc
+                   ON rcc.owner = rc.owner AND rcc.constraint_name = rc.constraint_name AND rcc.position = cc.position
+            WHERE c.owner = :owner AND c.constraint_type IN ('P', 'U', 'R', 'C'){name_filter('c.table_name')}
+            ORDER BY c.table_name, c.constraint_name, cc.position
+        """):
+            table = owner_tables.get(table_name)
+            if table is None:
+                continue
+            if constraint_type == "C" and generated == "GENERATED NAME" and (condition or "").rstrip().upper().endswith("IS NOT NULL"):
+                continue
+            if current_key != (table_name, name):
+                current_key = (table_name, name)
+                ref_columns = []
+                constraint = {
+                    "constraint_name": name,
+                    "constraint_type": {"P": "PRIMARY KEY", "U": "UNIQUE", "R": "FOREIGN KEY", "C": "CHECK"}[constraint_type],
+                    "columns": []
+                }
+                if constraint_type == "C":
+                    constraint["definition"] = (condition or "").strip()
+                if constraint_type == "P" and index_name:
+                    pk_indexes.add(index_name)
+                table["constraints"].append(constraint)
+            if column_name:
+                constraint["columns"].append(column_name)
+            if constraint_type == "R" and ref_table:
+                ref_columns.append(ref_column)
+                ref_name = ref_table if ref_owner == owner else f"{ref_owner}.{ref_table}"
+                constraint["references"] = f"{ref_name}({', '.join(ref_columns)})"
+
+        # Indexes
+        current_key = None
+        for table_name, name, index_type, uniqueness, column_name in run(f"""
+            SELECT i.table_name, i.index_name, i.index_type, i.uniqueness, ic.column_name
+            FROM all_indexes i
+            JOIN all_ind_columns ic ON ic.index_owner = i.owner AND ic.index_name = i.index_name
+            WHERE i.table_owner = :owner AND i.index_type <> 'LOB'{name_filter('i.table_name')}
+            ORDER BY i.table_name, i.index_name, ic.column_position
+        """):
+            table = owner_tables.get(table_name)
+            if table is None:
+                continue
+            if current_key != (table_name, name):
+                current_key = (table_name, name)
+                if name in pk_indexes:
+                    index_type = "PRIMARY KEY"
+                elif uniqueness == "UNIQUE":
+                    index_type = "UNIQUE"
+                index = {"index_name": name, "columns": [], "index_type": index_type, "is_unique": uniqueness == "UNIQUE"}
+                table["indexes"].append(index)
+            index["columns"].append(column_name)
+
+        tables.extend(owner_tables.values())
+
+        # Views
+        for name, definition, description in run(f"""
+            SELECT v.view_name, v.text, c.comments
+            FROM all_views v
+            LEFT JOIN all_tab_comments c ON c.owner = v.owner AND c.table_name = v.view_name
+            WHERE v.owner = :owner{name_filter('v.view_name')}
+            ORDER BY v.view_name
+        """):
+            views.append({
+                "view_name": name,
+                "schema": owner,
+                "definition": (definition or "").strip(),
+                "description": description or ""
+            })
+
+        # Standalone procedures and functions with their arguments
+        routines = {}
+        for name, object_type in run(f"""
+            SELECT object_name, object_type
+            FROM all_procedures
+            WHERE owner = :owner AND object_type IN ('PROCEDURE', 'FUNCTION') AND procedure_name IS NULL{name_filter('object_name')}
+            ORDER BY object_name
+        """):
+            if object_type == "PROCEDURE":
+                routine = {"procedure_name": name, "schema": owner, "parameters": "", "description": ""}
+                procedures.append(routine)
+            else:
+                routine = {"function_name": name, "schema": owner, "return_type": "", "parameters": "", "description": ""}
+                functions.append(routine)
+            routines[name] = routine
+
+        for object_name, argument_name, position, in_out, data_type in run(f"""
+            SELECT object_name, argument_name, position, in_out, data_type
+            FROM all_arguments
+            WHERE owner = :owner AND package_name IS NULL AND data_level = 0{name_filter('object_name')}
+            ORDER BY object_name, subprogram_id, sequence
+        """):
+            routine = routines.get(object_name)
+            if routine is None or data_type is None:
+                continue
+            if position == 0:
+                routine["return_type"] = data_type
+                continue
+            parameter = f"{argument_name} {in_out.replace('/', ' ')} {data_type}"
+            routine["parameters"] = f"{routine['parameters']}, {parameter}" if routine["parameters"] else parameter
+
+        cursor.close()
+
+    return {
+        "database_info": {
+            "name": db_name,
+            "version": (db_version or "Oracle Database").split(" - ")[0].split(" Release")[0],
+            "size": oracle_size_from_tables(tables),
+            "created": "N/A",
+            "last_backup": "N/A"
+        },
+        "tables": tables,
+        "views": views,
+        "functions": functions,
+        "procedures": procedures
+    }
+
+# Pooled live connections
+CONNECTION_POOL_MAX_SIZE = 8
+CONNECTION_POOL_IDLE_TIMEOUT = 300
+CONNECTION_HEALTH_CHECK_INTERVAL = 30
+HEALTH_CHECK_SQL = {
+    "PostgreSQL": "SELECT 1",
+    "SQL Server": "SELECT 1",
+    "Oracle": "SELECT 1 FROM dual"
+}
+
+class ConnectionPool:
+    """Thread-safe pool of warm connections to one server/database/user.
+
+    Connections idle for longer than ``idle_timeout`` are closed, connections idle for longer
+    than ``health_check_interval`` are pinged before being handed out, and at most
+    ``max_size`` connections (idle plus in use) exist at any time. Idle connections are closed
+    by close(), or when the pool is garbage collected after st.cache_resource evicts it.
+    """
+
+    def __init__(self, connect, health_check_sql, max_size=CONNECTION_POOL_MAX_SIZE,
+                 idle_timeout=CONNECTION_POOL_IDLE_TIMEOUT,
+                 health_check_interval=CONNECTION_HEALTH_CHECK_INTERVAL):
+        self.connect = connect
+        self.health_check_sql = health_check_sql
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.idle = []
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+        self.closed = False
+        self.lock = threading.Condition()
+        self.finalizer = weakref.finalize(self, ConnectionPool.close_idle, self.lock, self.idle)
+
+    @staticmethod
+    def close_connection(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @staticmethod
+    def close_idle(lock, idle):
+        with lock:
+            connections = [conn for conn, _ in idle]
+            idle.clear()
+        for conn in connections:
+            ConnectionPool.close_connection(conn)
+
+    def close(self):
+        """Close the idle connections now; connections in use are closed when they are released"""
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+        self.finalizer()
+
+    def evict_idle(self):
+        """Close connections that have been idle past the idle timeout"""
+        now = time.monotonic()
+        with self.lock:
+            expired = [conn for conn, last_used in self.idle if now - last_used > self.idle_timeout]
+            self.idle[:] = [(conn, last_used) for conn, last_used in self.idle if now - last_used <= self.idle_timeout]
+            if expired:
+                self.lock.notify_all()
+        for conn in expired:
+            self.close_connection(conn)
+
+    def is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.health_check_sql)
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=30):
+        """Check out a healthy connection, opening a new one if the pool has room"""
+        self.evict_idle()
+        deadline = time.monotonic() + timeout
+        while True:
+            with self.lock:
+                while not self.idle and self.in_use >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise Exception(f"No pooled connection available within {timeout}s (max {self.max_size})")
+                    self.lock.wait(remaining)
+                self.in_use += 1
+                pooled = self.idle.pop() if self.idle else None
+
+            if pooled is None:
+                try:
+                    conn = self.connect()
+                except Exception:
+                    self.release(None, broken=True)
+                    raise
+                with self.lock:
+                    self.created += 1
+                return conn
+
+            conn, last_used = pooled
+            if time.monotonic() - last_used < self.health_check_interval or self.is_healthy(conn):
+                with self.lock:
+                    self.reused += 1
+                return conn
+
+            # Stale connection: drop it and try again
+            self.release(conn, broken=True)
+
+    def release(self, conn, broken=False):
+        """Return a connection to the pool (broken connections are closed instead)"""
+        with self.lock:
+            self.in_use -= 1
+            broken = broken or self.closed
+            if conn is not None and not broken:
+                self.idle.append((conn, time.monotonic()))
+            self.lock.notify()
+        if conn is not None and broken:
+            self.close_connection(conn)
+
+    @contextmanager
+    def connection(self, timeout=30):
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except BaseException:
+            # Includes Streamlit's rerun/stop exceptions; the connection may be mid-query
+            broken = True
+            raise
+        finally:
+            self.release(conn, broken)
+
+    def stats(self):
+        with self.lock:
+            return {
+                "idle": len(self.idle),
+                "in_use": self.in_use,
+                "max_size": self.max_size,
+                "created": self.created,
+                "reused": self.reused
+            }
+
+def open_database_connection(db_type, host, port, database, username, password, auth_mode=None):
+    """Open a new connection for the given platform"""
+    if db_type == "PostgreSQL":
+        return connect_postgres(host, port, database, username, password)
+    if db_type == "Oracle":
+        return connect_oracle(host, port, database, username, password)
+    if db_type == "SQL Server":
+        return connect_sqlserver(host, port, database, username, password, auth_mode or "SQL Server")
+    raise Exception(f"Unsupported database platform: {db_type}")
+
+@st.cache_resource(max_entries=32, ttl=3600)
+def create_connection_pool(db_type, host, port, database, username, password_digest, auth_mode, _password):
+    """Create the shared connection pool for one server/database/user (cached across reruns and sessions)"""
+    return ConnectionPool(
+        lambda: open_database_connection(db_type, host, port, database, username, _password, auth_mode),
+        HEALTH_CHECK_SQL[db_type]
+    )
+
+def get_connection_pool(db_type, host, port, database, username, password, auth_mode=None):
+    """Get the warm connection pool keyed by host/port/database/user.
+
+    A digest of the password is part of the key so a session can never borrow connections
+    that were authenticated with credentials it did not supply.
+    """
+    password_digest = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+    return create_connection_pool(db_type, host, int(port), database, username, password_digest,
+                                  auth_mode, password)
+
+def show_pool_status(pool):
+    """Show a one-line summary of a connection pool"""
+    stats = pool.stats()
+    st.caption(f"🔌 Connection pool: {stats['idle']} idle, {stats['in_use']} in use, max {stats['max_size']} "
+               f"· {stats['created']} opened, {stats['reused']} reused")
+
+def record_extraction_stats(db_data, started_at):
+    """Attach object counts and extraction throughput to an extracted schema"""
+    tables = db_data.get("tables", [])
+    objects = (
+        len(tables)
+        + sum(len(t.get("columns", [])) + len(t.get("indexes", [])) + len(t.get("constraints", [])) for t in tables)
+        + len(db_data.get("views", []))
+        + len(db_data.get("functions", []))
+        + len(db_data.get("procedures", []))
+    )
+    elapsed = max(time.perf_counter() - started_at, 1e-6)
+    db_data["extraction_stats"] = {
+        "objects": objects,
+        "seconds": round(elapsed, 2),
+        "objects_per_sec": round(objects / elapsed, 1)
+    }
+    return db_data["extraction_stats"]
+
+def show_extraction_summary(db_data):
+    """Show extracted object counts and throughput"""
+    stats = db_data.get("extraction_stats", {})
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Tables", f"{len(db_data.get('tables', [])):,}")
+    with col2:
+        st.metric("Objects Extracted", f"{stats.get('objects', 0):,}")
+    with col3:
+        st.metric("Extraction Time", f"{stats.get('seconds', 0):.1f} s")
+    with col4:
+        st.metric("Throughput", f"{stats.get('objects_per_sec', 0):,.0f} objects/s")
+
+def list_postgres_schemas(conn):
+    """List user schemas that contain relations or routines"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT n.nspname FROM pg_namespace n
+        WHERE {postgres_schema_filter(None)}
+        ORDER BY n.nspname
+    """)
+    schemas = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return schemas
+
+def list_sqlserver_schemas(conn):
+    """List schemas that own at least one user object"""
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT s.name FROM sys.schemas s
+        WHERE s.name NOT IN ('sys', 'INFORMATION_SCHEMA')
+          AND EXISTS (SELECT 1 FROM sys.objects o WHERE o.schema_id = s.schema_id AND o.is_ms_shipped = 0)
+        ORDER BY s.name
+    """)
+    schemas = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    return schemas
+
+SCHEMA_EXTRACTORS = {
+    "PostgreSQL": (list_postgres_schemas, extract_postgres_schema),
+    "Oracle": (list_oracle_owners, extract_oracle_schema),
+    "SQL Server": (list_sqlserver_schemas, extract_sqlserver_schema)
+}
+
+def merge_schema_data(parts):
+    """Merge per-schema extraction results into a single db_data model"""
+    merged = {
+        "database_info": dict(parts[0]["database_info"]) if parts else {},
+        "tables": [],
+        "views": [],
+        "functions": [],
+        "procedures": []
+    }
+    for part in parts:
+        for key in ("tables", "views", "functions", "procedures"):
+            merged[key].extend(part.get(key, []))
+    return merged
+
+def extract_schemas_parallel(db_type, pool, schemas, max_workers, on_schema_done=None):
+    """Extract schemas concurrently, one pooled connection per worker.
+
+    ``max_workers`` caps the concurrency against the server (and never exceeds the pool
+    size). ``on_schema_done(schema, part, seconds, error)`` is called from the calling
+    thread as each schema finishes, so it can safely update the UI.
+    """
+    extract = SCHEMA_EXTRACTORS[db_type][1]
+
+    def extract_one(schema):
+        started_at = time.perf_counter()
+        with pool.connection() as conn:
+            part = extract(conn, [schema])
+        return part, time.perf_counter() - started_at
+
+    parts = {}
+    workers = max(1, min(max_workers, pool.max_size, len(schemas)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"extract-{db_type}") as executor:
+        futures = {executor.submit(extract_one, schema): schema for schema in schemas}
+        for future in as_completed(futures):
+            schema = futures[future]
+            try:
+                part, seconds = future.result()
+            except Exception as e:
+                if on_schema_done:
+                    on_schema_done(schema, None, 0, e)
+                continue
+            parts[schema] = part
+            if on_schema_done:
+                on_schema_done(schema, part, seconds, None)
+
+    # Keep the requested schema order regardless of completion order
+    merged = merge_schema_data([parts[schema] for schema in schemas if schema in parts])
+    if db_type == "Oracle" and merged["tables"]:
+        merged["database_info"]["size"] = oracle_size_from_tables(merged["tables"])
+    return merged
+
+# Incremental refresh
+INCREMENTAL_MAX_OBJECTS = 1000
+
+def fetch_postgres_change_markers(conn, schemas=None):
+    """Per-object change markers from pg_class/pg_proc xmin and relfilenode plus dependent catalog rows"""
+    schema_filter = postgres_schema_filter(schemas)
+    params = {"schemas": list(schemas) if schemas else None}
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        SELECT CASE WHEN c.relkind IN ('v', 'm') THEN 'view' ELSE 'table' END, n.nspname, c.relname,
+               concat_ws(':', c.xmin::text, c.relfilenode::text, a.marker, i.marker, con.marker, d.marker, r.marker)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN (SELECT attrelid, md5(string_agg(xmin::text, ',' ORDER BY attnum)) AS marker
+                   FROM pg_attribute WHERE attnum > 0 GROUP BY attrelid) a ON a.attrelid = c.oid
+        LEFT JOIN (SELECT indrelid, md5(string_agg(indexrelid::text || '/' || xmin::text, ',' ORDER BY indexrelid)) AS marker
+                   FROM pg_index GROUP BY indrelid) i ON i.indrelid = c.oid
+        LEFT JOIN (SELECT conrelid, md5(string_agg(oid::text || '/' || xmin::text, ',' ORDER BY oid)) AS marker
+                   FROM pg_constraint GROUP BY conrelid) con ON con.conrelid = c.oid
+        LEFT JOIN (SELECT objoid, md5(string_agg(objsubid::text || '/' || xmin::text, ',' ORDER BY objsubid)) AS marker
+                   FROM pg_description WHERE classoid = 'pg_class'::regclass GROUP BY objoid) d ON d.objoid = c.oid
+        LEFT JOIN (SELECT ev_class, md5(string_agg(xmin::text, ',' ORDER BY oid)) AS marker
+                   FROM pg_rewrite GROUP BY ev_class) r ON r.ev_class = c.oid
+        WHERE c.relkind IN ('r', 'p', 'f', 'v', 'm') AND {schema_filter}
+        UNION ALL
+        SELECT 'routine', n.nspname, p.proname, md5(string_agg(p.oid::text || '/' || p.xmin::text, ',' ORDER BY p.oid))
+        FROM pg_proc p
+        JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE p.prokind IN ('f', 'p') AND {schema_filter}
+          AND NOT EXISTS (SELECT 1 FROM pg_depend dep
+                          WHERE dep.classid = 'pg_proc'::regclass AND dep.objid = p.oid AND dep.deptype = 'e')
+        GROUP BY n.nspname, p.proname
+    """, params)
+    markers = {(kind, schema, name): marker for kind, schema, name, marker in iter_cursor_rows(cursor)}
+    cursor.close()
+    return markers
+
+def fetch_oracle_change_markers(conn, schemas=None):
+    """Per-object change markers from ALL_OBJECTS.LAST_DDL_TIME"""
+    owners = [s.upper() for s in schemas] if schemas else list_oracle_owners(conn)
+    kinds = {"TABLE": "table", "VIEW": "view", "PROCEDURE": "routine", "FUNCTION": "routine"}
+    markers = {}
+    cursor = conn.cursor()
+    cursor.prefetchrows = ORACLE_FETCH_SIZE + 1
+    cursor.arraysize = ORACLE_FETCH_SIZE
+    for owner in owners:
+        cursor.execute("""
+            SELECT object_type, object_name, TO_CHAR(last_ddl_time, 'YYYY-MM-DD HH24:MI:SS')
+            FROM all_objects
+            WHERE owner = :owner AND object_type IN ('TABLE', 'VIEW', 'PROCEDURE', 'FUNCTION')
+              AND generated = 'N' AND secondary = 'N'
+        """, owner=owner)
+        for object_type, name, last_ddl_time in iter_cursor_rows(cursor, ORACLE_FETCH_SIZE):
+            markers[(kinds[object_type], owner, name)] = last_ddl_time
+    cursor.close()
+    return markers
+
+def fetch_sqlserver_change_markers(conn, schemas=None):
+    """Per-object change markers from sys.objects.modify_date plus a checksum of MS_Description properties.
+
+    Adding or editing an extended property does not touch modify_date, so description edits need the checksum.
+    """
+    placeholder = "%s" if type(conn).__module__.startswith("pymssql") else "?"
+    if schemas:
+        schema_filter = f"s.name IN ({', '.join([placeholder] * len(schemas))})"
+    else:
+        schema_filter = "s.name NOT IN ('sys', 'INFORMATION_SCHEMA')"
+    cursor = conn.cursor()
+    cursor.arraysize = SQLSERVER_FETCH_SIZE
+    sql = f"""
+        SELECT CASE RTRIM(o.type) WHEN 'U' THEN 'table' WHEN 'V' THEN 'view' ELSE 'routine' END,
+               s.name, o.name,
+               CONVERT(nvarchar(30), o.modify_date, 126) + ':' + ISNULL(CONVERT(nvarchar(12), ep.marker), '')
+        FROM sys.objects o
+        JOIN sys.schemas s ON s.schema_id = o.schema_id
+        LEFT JOIN (SELECT major_id, CHECKSUM_AGG(CHECKSUM(minor_id, CONVERT(nvarchar(4000), value))) AS marker
+                   FROM sys.extended_properties WHERE class = 1 AND name = 'MS_Description'
+                   GROUP BY major_id) ep ON ep.major_id = o.object_id
+        WHERE o.type IN ('U', 'V', 'P', 'FN', 'IF', 'TF') AND o.is_ms_shipped = 0 AND {schema_filter}
+    """
+    cursor.execute(sql, tuple(schemas)) if schemas else cursor.execute(sql)
+    markers = {(kind, schema, name): marker for kind, schema, name, marker in iter_cursor_rows(cursor, SQLSERVER_FETCH_SIZE)}
+    cursor.close()
+    return markers
+
+CHANGE_MARKER_FETCHERS = {
+    "PostgreSQL": fetch_postgres_change_markers,
+    "Oracle": fetch_oracle_change_markers,
+    "SQL Server": fetch_sqlserver_change_markers
+}
+
+def compute_object_fingerprint(kind, schema, name, marker):
+    """Fingerprint one catalog object from its change marker"""
+    return hashlib.sha256(f"{kind}|{schema}|{name}|{marker}".encode("utf-8")).hexdigest()[:20]
+
+def fetch_object_fingerprints(db_type, conn, schemas=None):
+    """Fingerprint every table, view and routine in the requested schemas with one catalog query"""
+    markers = CHANGE_MARKER_FETCHERS[db_type](conn, schemas)
+    return {key: compute_object_fingerprint(*key, marker) for key, marker in markers.items()}
+
+def iter_schema_objects(db_data):
+    """Yield ((kind, schema, name), record) for every table, view and routine"""
+    for table in db_data.get("tables", []):
+        yield ("table", table.get("schema"), table["table_name"]), table
+    for view in db_data.get("views", []):
+        yield ("view", view.get("schema"), view["view_name"]), view
+    for func in db_data.get("functions", []):
+        yield ("routine", func.get("schema"), func["function_name"]), func
+    for proc in db_data.get("procedures", []):
+        yield ("routine", proc.get("schema"), proc["procedure_name"]), proc
+
+def apply_object_fingerprints(db_data, fingerprints):
+    """Stamp each extracted object with its catalog fingerprint"""
+    for key, record in iter_schema_objects(db_data):
+        if key in fingerprints:
+            record["fingerprint"] = fingerprints[key]
+    return db_data
+
+def refresh_schema_data(db_type, conn, db_data, schemas=None):
+    """Re-extract only the objects whose fingerprint changed since ``db_data`` was extracted.
+
+    Returns the refreshed db_data and a summary of changed/added/removed/unchanged objects.
+    When more than INCREMENTAL_MAX_OBJECTS objects changed, the affected schemas are
+    re-extracted in bulk instead, which is cheaper than a very long object filter.
+    """
+    current = fetch_object_fingerprints(db_type, conn, schemas)
+    previous = {key: record.get("fingerprint") for key, record in iter_schema_objects(db_data)}
+
+    changed = {key for key, fingerprint in current.items() if key in previous and previous[key] != fingerprint}
+    added = {key for key in current if key not in previous}
+    removed = {key for key in previous if key not in current}
+    summary = {
+        "changed": len(changed),
+        "added": len(added),
+        "removed": len(removed),
+        "unchanged": len(current) - len(changed) - len(added)
+    }
+    stale = changed | added | removed
+    if not stale:
+        return db_data, summary
+
+    extract = SCHEMA_EXTRACTORS[db_type][1]
+    to_extract = sorted({(schema, name) for _, schema, name in changed | added})
+    affected_schemas = sorted({schema for schema, _ in to_extract})
+    if not to_extract:
+        partial = {"tables": [], "views": [], "functions": [], "procedures": []}
+    elif len(to_extract) > INCREMENTAL_MAX_OBJECTS:
+        partial = extract(conn, affected_schemas)
+    else:
+        partial = extract(conn, affected_schemas, to_extract)
+    apply_object_fingerprints(partial, current)
+
+    wanted = changed | added
+    refreshed = {"database_info": db_data.get("database_info", {})}
+    for key, records in (("tables", "table"), ("views", "view"), ("functions", "routine"), ("procedures", "routine")):
+        name_key = {"tables": "table_name", "views": "view_name", "functions": "function_name",
+                    "procedures": "procedure_name"}[key]
+        kept = [r for r in db_data.get(key, []) if (records, r.get("schema"), r[name_key]) not in stale]
+        fresh = [r for r in partial.get(key, []) if (records, r.get("schema"), r[name_key]) in wanted]
+        refreshed[key] = sorted(kept + fresh, key=lambda r: (r.get("schema") or "", r[name_key]))
+    return refreshed, summary
+
+def refresh_live_schema(db_type, pool, schemas):
+    """Refresh a previously extracted live schema, re-extracting only changed objects"""
+    db_data = st.session_state.get("live_schemas", {}).get(db_type)
+    if not db_data:
+        st.warning(f"⚠️ Extract the {db_type} schema before refreshing it")
+        return
+
+    with st.spinner(f"♻️ Checking {db_type} catalog fingerprints..."):
+        started_at = time.perf_counter()
+        try:
+            with pool.connection() as conn:
+                refreshed, summary = refresh_schema_data(db_type, conn, db_data, schemas)
+        except Exception as e:
+            st.error(f"❌ Incremental refresh failed: {str(e)}")
+            return
+        elapsed = time.perf_counter() - started_at
+
+    refreshed = compact_schema(refreshed)
+    refreshed["extraction_stats"] = db_data.get("extraction_stats", {})
+    st.session_state["live_schemas"][db_type] = refreshed
+    st.success(f"♻️ Refreshed in {elapsed:.1f}s: {summary['changed']:,} changed, {summary['added']:,} added, "
+               f"{summary['removed']:,} removed, {summary['unchanged']:,} unchanged")
+    show_pool_status(pool)
+    if summary["changed"] or summary["added"] or summary["removed"]:
+        save_snapshot_quietly(db_type, refreshed, label="incremental refresh")
+
+def show_parallel_extraction_options(key_prefix):
+    """Parallel extraction controls shared by the live connection forms"""
+    col1, col2 = st.columns(2)
+    with col1:
+        parallel = st.checkbox("⚡ Parallel extraction (one worker per schema)", value=True,
+                               key=f"{key_prefix}_parallel")
+    with col2:
+        max_workers = st.number_input("Max concurrent workers per server", min_value=1,
+                                      max_value=CONNECTION_POOL_MAX_SIZE, value=4,
+                                      key=f"{key_prefix}_workers", disabled=not parallel)
+    return parallel, int(max_workers)
+
+def extract_live_schema(db_type, pool, schemas, parallel, max_workers):
+    """Connect through the pool, extract a live schema and store it for documentation"""
+    list_schemas, extract = SCHEMA_EXTRACTORS[db_type]
+
+    # The pooled connection is held only inside this block; UI output follows once it is released
+    started_at = time.perf_counter()
+    step = "connect to"
+    try:
+        with st.spinner(f"📊 Extracting {db_type} schema..."), pool.connection() as conn:
+            step = "read catalog change markers from"
+            fingerprints = fetch_object_fingerprints(db_type, conn, schemas)
+            if parallel:
+                step = "list schemas in"
+                schemas = schemas or list_schemas(conn)
+            else:
+                step = "extract the schema from"
+                db_data = extract(conn, schemas)
+    except Exception as e:
+        st.error(f"❌ Could not {step} {db_type}: {str(e)}")
+        return
+    st.success("✅ Connected successfully!")
+
+    failed_schemas = []
+    if parallel:
+        st.markdown(f"**⚡ Extracting {len(schemas)} schema(s) with up to {max_workers} workers**")
+        progress_bar = st.progress(0.0)
+        status_lines = []
+        status_area = st.empty()
+
+        def on_schema_done(schema, part, seconds, error):
+            if error is not None:
+                failed_schemas.append(schema)
+                status_lines.append(f"❌ `{schema}` — {str(error)}")
+            else:
+                status_lines.append(f"✅ `{schema}` — {len(part['tables']):,} tables, "
+                                    f"{len(part['views']):,} views ({seconds:.1f}s)")
+            progress_bar.progress(len(status_lines) / len(schemas),
+                                  text=f"{len(status_lines)}/{len(schemas)} schemas extracted")
+            status_area.markdown("\n".join(f"- {line}" for line in status_lines))
+
+        db_data = extract_schemas_parallel(db_type, pool, schemas, max_workers, on_schema_done)
+        if failed_schemas:
+            if len(failed_schemas) == len(schemas):
+                st.error(f"❌ Schema extraction failed for every schema: {', '.join(failed_schemas)}")
+                return
+            st.warning(f"⚠️ {len(failed_schemas)} of {len(schemas)} schemas could not be extracted and are "
+                       f"missing from this documentation: {', '.join(failed_schemas)}")
+
+    db_data = compact_schema(apply_object_fingerprints(db_data, fingerprints))
+    record_extraction_stats(db_data, started_at)
+    st.session_state.setdefault("live_schemas", {})[db_type] = db_data
+    show_extraction_summary(db_data)
+    show_pool_status(pool)
+    save_snapshot_quietly(db_type, db_data,
+                          f"incomplete: missing {', '.join(failed_schemas)}" if failed_schemas else None)
+
+# Local schema snapshot store
+SNAPSHOT_STORE_PATH = os.environ.get("SCHEMADOC_STORE_PATH", os.path.join(".schemadoc", "snapshots.db"))
+
+SNAPSHOT_STORE_DDL = """
+CREATE TABLE IF NOT EXISTS databases (
+    database_id INTEGER PRIMARY KEY,
+    platform TEXT NOT NULL,
+    name TEXT,
+    version TEXT,
+    size TEXT,
+    label TEXT,
+    captured_at TEXT NOT NULL,
+    info_json TEXT
+);
+CREATE TABLE IF NOT EXISTS tables (
+    table_id INTEGER PRIMARY KEY,
+    database_id INTEGER NOT NULL REFERENCES databases(database_id) ON DELETE CASCADE,
+    schema_name TEXT,
+    table_name TEXT NOT NULL,
+    table_type TEXT,
+    row_count INTEGER,
+    size_mb REAL,
+    description TEXT,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS columns (
+    column_id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(table_id) ON DELETE CASCADE,
+    ordinal INTEGER NOT NULL,
+    column_name TEXT NOT NULL,
+    data_type TEXT,
+    is_nullable INTEGER,
+    default_value TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS indexes (
+    index_id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(table_id) ON DELETE CASCADE,
+    index_name TEXT NOT NULL,
+    columns TEXT,
+    index_type TEXT,
+    is_unique INTEGER
+);
+CREATE TABLE IF NOT EXISTS constraints (
+    constraint_id INTEGER PRIMARY KEY,
+    table_id INTEGER NOT NULL REFERENCES tables(table_id) ON DELETE CASCADE,
+    constraint_name TEXT NOT NULL,
+    constraint_type TEXT,
+    columns TEXT,
+    definition TEXT,
+    references_ref TEXT
+);
+CREATE TABLE IF NOT EXISTS views (
+    view_id INTEGER PRIMARY KEY,
+    database_id INTEGER NOT NULL REFERENCES databases(database_id) ON DELETE CASCADE,
+    schema_name TEXT,
+    view_name TEXT NOT NULL,
+    definition TEXT,
+    description TEXT,
+    fingerprint TEXT
+);
+CREATE TABLE IF NOT EXISTS routines (
+    routine_id INTEGER PRIMARY KEY,
+    database_id INTEGER NOT NULL REFERENCES databases(database_id) ON DELETE CASCADE,
+    routine_type TEXT NOT NULL,
+    schema_name TEXT,
+    routine_name TEXT NOT NULL,
+    return_type TEXT,
+    parameters TEXT,
+    description TEXT,
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_databases_name ON databases(platform, name, captured_at);
+CREATE INDEX IF NOT EXISTS idx_tables_database ON tables(database_id);
+CREATE INDEX IF NOT EXISTS idx_tables_name ON tables(table_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_columns_table ON columns(table_id, ordinal);
+CREATE INDEX IF NOT EXISTS idx_columns_name ON columns(column_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_indexes_table ON indexes(table_id);
+CREATE INDEX IF NOT EXISTS idx_indexes_name ON indexes(index_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_constraints_table ON constraints(table_id);
+CREATE INDEX IF NOT EXISTS idx_constraints_name ON constraints(constraint_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_views_database ON views(database_id);
+CREATE INDEX IF NOT EXISTS idx_views_name ON views(view_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_routines_database ON routines(database_id);
+CREATE INDEX IF NOT EXISTS idx_routines_name ON routines(routine_name COLLATE NOCASE);
+CREATE TABLE IF NOT EXISTS ai_annotations (
+    database_id INTEGER NOT NULL REFERENCES databases(database_id) ON DELETE CASCADE,
+    object_type TEXT NOT NULL,
+    object_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    content TEXT NOT NULL,
+    model TEXT,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (object_type, object_id, kind)
+);
+CREATE TABLE IF NOT EXISTS batch_jobs (
+    job_id INTEGER PRIMARY KEY,
+    database_id INTEGER NOT NULL REFERENCES databases(database_id) ON DELETE CASCADE,
+    endpoint TEXT NOT NULL,
+    batch_id TEXT,
+    status TEXT NOT NULL,
+    request_count INTEGER NOT NULL,
+    succeeded INTEGER NOT NULL DEFAULT 0,
+    errored INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS batch_job_requests (
+    job_id INTEGER NOT NULL REFERENCES batch_jobs(job_id) ON DELETE CASCADE,
+    custom_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    object_type TEXT NOT NULL,
+    object_id INTEGER NOT NULL,
+    params_json TEXT NOT NULL,
+    result_type TEXT,
+    PRIMARY KEY (job_id, custom_id)
+);
+CREATE INDEX IF NOT EXISTS idx_ai_annotations_database ON ai_annotations(database_id, kind);
+CREATE INDEX IF NOT EXISTS idx_batch_jobs_database ON batch_jobs(database_id, status);
+"""
+BATCH_JOB_OPEN_STATUSES = ("pending", "submitted", "ended")
+DESCRIPTION_TARGETS = {"table": ("tables", "table_id"), "view": ("views", "view_id"), "routine": ("routines", "routine_id")}
+
+class SchemaSnapshotStore:
+    """SQLite-backed repository of extracted schema snapshots.
+
+    Each saved snapshot becomes one ``databases`` row with its tables, columns, indexes,
+    constraints, views and routines in normalized child tables, indexed by name and parent,
+    so snapshots reload without touching the source catalog and can be filtered with SQL.
+    """
+
+    def __init__(self, path=SNAPSHOT_STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(SNAPSHOT_STORE_DDL)
+
+    @contextmanager
+    def connect(self, read_only=False):
+        if read_only:
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True, timeout=30)
+            conn.execute("PRAGMA query_only = ON")
+        else:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def save_snapshot(self, platform, db_data, label=None):
+        """Persist a db_data model and return its database_id"""
+        info = db_data.get("database_info", {})
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "INSERT INTO databases (platform, name, version, size, label, captured_at, info_json) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (platform, info.get("name"), info.get("version"), info.get("size"), label,
+                 datetime.now().isoformat(timespec="seconds"), json.dumps(info, default=str))
+            )
+            database_id = cursor.lastrowid
+
+            # Pre-assign table ids so children can be bulk inserted with executemany
+            next_table_id = conn.execute("SELECT COALESCE(MAX(table_id), 0) + 1 FROM tables").fetchone()[0]
+            table_rows, column_rows, index_rows, constraint_rows = [], [], [], []
+            for offset, table in enumerate(db_data.get("tables", [])):
+                table_id = next_table_id + offset
+                table_rows.append((table_id, database_id, table.get("schema"), table["table_name"],
+                                   table.get("table_type"), table.get("row_count"), table.get("size_mb"),
+                                   table.get("description"), table.get("fingerprint")))
+                for ordinal, col in enumerate(table.get("columns", [])):
+                    column_rows.append((table_id, ordinal, col.get("column_name"), col.get("data_type"),
+                                        int(bool(col.get("is_nullable"))),
+                                        None if col.get("default") is None else str(col.get("default")),
+                                        col.get("description")))
+                for idx in table.get("indexes", []):
+                    index_rows.append((table_id, idx.get("index_name"), json.dumps(list(idx.get("columns", []))),
+                                       idx.get("index_type"), int(bool(idx.get("is_unique")))))
+                for constraint in table.get("constraints", []):
+                    constraint_rows.append((table_id, constraint.get("constraint_name"), constraint.get("constraint_type"),
+                                            json.dumps(list(constraint["columns"])) if "columns" in constraint else None,
+                                            constraint.get("definition"), constraint.get("references")))
+
+            conn.executemany("INSERT INTO tables VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", table_rows)
+            conn.executemany(
+                "INSERT INTO columns (table_id, ordinal, column_name, data_type, is_nullable, default_value, description) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", column_rows)
+            conn.executemany(
+                "INSERT INTO indexes (table_id, index_name, columns, index_type, is_unique) VALUES (?, ?, ?, ?, ?)",
+                index_rows)
+            conn.executemany(
+                "INSERT INTO constraints (table_id, constraint_name, constraint_type, columns, definition, references_ref) "
+                "VALUES (?, ?, ?, ?, ?, ?)", constraint_rows)
+            conn.executemany(
+                "INSERT INTO views (database_id, schema_name, view_name, definition, description, fingerprint) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(database_id, v.get("schema"), v["view_name"], v.get("definition"), v.get("description"),
+                  v.get("fingerprint")) for v in db_data.get("views", [])])
+            conn.executemany(
+                "INSERT INTO routines (database_id, routine_type, schema_name, routine_name, return_type, parameters, "
+                "description, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(database_id, "function", f.get("schema"), f["function_name"], f.get("return_type"),
+                  f.get("parameters"), f.get("description"), f.get("fingerprint")) for f in db_data.get("functions", [])]
+                + [(database_id, "procedure", p.get("schema"), p["procedure_name"], None,
+                    p.get("parameters"), p.get("description"), p.get("fingerprint")) for p in db_data.get("procedures", [])])
+        return database_id
+
+    def load_snapshot(self, database_id):
+        """Rebuild the db_data model of a saved snapshot"""
+        with self.connect(read_only=True) as conn:
+            row = conn.execute("SELECT info_json FROM databases WHERE database_id = ?", (database_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Snapshot {database_id} not found")
+
+            tables_by_id = {}
+            for table_id, schema, name, table_type, row_count, size_mb, description, fingerprint in conn.execute(
+                "SELECT table_id, schema_name, table_name, table_type, row_count, size_mb, description, fingerprint "
+                "FROM tables WHERE database_id = ? ORDER BY table_id", (database_id,)
+            ):
+                table = {
+                    "table_name": name,
+                    "schema": schema,
+                    "table_type": table_type,
+                    "row_count": row_count or 0,
+                    "size_mb": size_mb or 0.0,
+                    "description": description or "",
+                    "columns": [],
+                    "indexes": [],
+                    "constraints": []
+                }
+                if fingerprint:
+                    table["fingerprint"] = fingerprint
+                tables_by_id[table_id] = table
+
+            for table_id, name, data_type, is_nullable, default, description in conn.execute(
+                "SELECT c.table_id, c.column_name, c.data_type, c.is_nullable, c.default_value, c.description "
+                "FROM columns c JOIN tables t ON t.table_id = c.table_id "
+                "WHERE t.database_id = ? ORDER BY c.table_id, c.ordinal", (database_id,)
+            ):
+                tables_by_id[table_id]["columns"].append({
+                    "column_name": name,
+                    "data_type": data_type,
+                    "is_nullable": bool(is_nullable),
+                    "default": default,
+                    "description": description or ""
+                })
+
+            for table_id, name, columns, index_type, is_unique in conn.execute(
+                "SELECT i.table_id, i.index_name, i.columns, i.index_type, i.is_unique "
+                "FROM indexes i JOIN tables t ON t.table_id = i.table_id "
+                "WHERE t.database_id = ? ORDER BY i.index_id", (database_id,)
+            ):
+                tables_by_id[table_id]["indexes"].append({
+                    "index_name": name,
+                    "columns": json.loads(columns or "[]"),
+                    "index_type": index_type,
+                    "is_unique": bool(is_unique)
+                })
+
+            for table_id, name, constraint_type, columns, definition, references in conn.execute(
+                "SELECT c.table_id, c.constraint_name, c.constraint_type, c.columns, c.definition, c.references_ref "
+                "FROM constraints c JOIN tables t ON t.table_id = c.table_id "
+                "WHERE t.database_id = ? ORDER BY c.constraint_id", (database_id,)
+            ):
+                constraint = {"constraint_name": name, "constraint_type": constraint_type}
+                if columns is not None:
+                    constraint["columns"] = json.loads(columns)
+                if definition is not None:
+                    constraint["definition"] = definition
+                if references is not None:
+                    constraint["references"] = references
+                tables_by_id[table_id]["constraints"].append(constraint)
+
+            views = []
+            for schema, name, definition, description, fingerprint in conn.execute(
+                "SELECT schema_name, view_name, definition, description, fingerprint "
+                "FROM views WHERE database_id = ? ORDER BY view_id", (database_id,)
+            ):
+                view = {"view_name": name, "schema": schema, "definition": definition or "",
+                        "description": description or ""}
+                if fingerprint:
+                    view["fingerprint"] = fingerprint
+                views.append(view)
+
+            functions, procedures = [], []
+            for routine_type, schema, name, return_type, parameters, description, fingerprint in conn.execute(
+                "SELECT routine_type, schema_name, routine_name, return_type, parameters, description, fingerprint "
+                "FROM routines WHERE database_id = ? ORDER BY routine_id", (database_id,)
+            ):
+                if routine_type == "function":
+                    routine = {"function_name": name, "schema": schema, "return_type": return_type or "",
+                               "parameters": parameters or "", "description": description or ""}
+                    functions.append(routine)
+                else:
+                    routine = {"procedure_name": name, "schema": schema, "parameters": parameters or "",
+                               "description": description or ""}
+                    procedures.append(routine)
+                if fingerprint:
+                    routine["fingerprint"] = fingerprint
+
+            for table_id, content in conn.execute(
+                "SELECT object_id, content FROM ai_annotations "
+                "WHERE database_id = ? AND object_type = 'table' AND kind = 'performance'", (database_id,)
+            ):
+                if table_id in tables_by_id:
+                    tables_by_id[table_id]["performance_analysis"] = content
+
+        return {
+            "database_info": json.loads(row[0] or "{}"),
+            "tables": list(tables_by_id.values()),
+            "views": views,
+            "functions": functions,
+            "procedures": procedures
+        }
+
+    def list_snapshots(self, platform=None):
+        """List saved snapshots, newest first"""
+        sql = ("SELECT d.database_id, d.platform, d.name, d.version, d.label, d.captured_at, "
+               "(SELECT COUNT(*) FROM tables t WHERE t.database_id = d.database_id) AS tables "
+               "FROM databases d")
+        params = ()
+        if platform:
+            sql += " WHERE d.platform = ?"
+            params = (platform,)
+        with self.connect(read_only=True) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql + " ORDER BY d.database_id DESC", params)]
+
+    def latest_snapshot_id(self, platform, name=None):
+        """Most recent snapshot for a platform (and optionally a database name)"""
+        sql = "SELECT MAX(database_id) FROM databases WHERE platform = ?"
+        params = [platform]
+        if name:
+            sql += " AND name = ?"
+            params.append(name)
+        with self.connect(read_only=True) as conn:
+            return conn.execute(sql, params).fetchone()[0]
+
+    def object_ids(self, database_id):
+        """Row ids of a snapshot's tables, views, functions and procedures, in load_snapshot order"""
+        with self.connect(read_only=True) as conn:
+            def ids(sql):
+                return [row[0] for row in conn.execute(sql, (database_id,))]
+            return {
+                "tables": ids("SELECT table_id FROM tables WHERE database_id = ? ORDER BY table_id"),
+                "views": ids("SELECT view_id FROM views WHERE database_id = ? ORDER BY view_id"),
+                "functions": ids("SELECT routine_id FROM routines WHERE database_id = ? "
+                                 "AND routine_type = 'function' ORDER BY routine_id"),
+                "procedures": ids("SELECT routine_id FROM routines WHERE database_id = ? "
+                                  "AND routine_type <> 'function' ORDER BY routine_id"),
+            }
+
+    def update_descriptions(self, object_type, descriptions):
+        """Overwrite the descriptions of saved tables, views or routines from (object_id, text) pairs"""
+        table, id_column = DESCRIPTION_TARGETS[object_type]
+        with self.connect() as conn:
+            conn.executemany(f"UPDATE {table} SET description = ? WHERE {id_column} = ?",
+                             [(text.strip(), object_id) for object_id, text in descriptions])
+
+    def create_batch_job(self, database_id, endpoint, requests):
+        """Record a bulk AI job and its requests before anything is submitted, so it can always be resumed"""
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.connect() as conn:
+            job_id = conn.execute(
+                "INSERT INTO batch_jobs (database_id, endpoint, status, request_count, created_at, updated_at) "
+                "VALUES (?, ?, 'pending', ?, ?, ?)", (database_id, endpoint, len(requests), now, now)
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO batch_job_requests (job_id, custom_id, kind, object_type, object_id, params_json) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(job_id, r["custom_id"], r["kind"], r["object_type"], r["object_id"], json.dumps(r["params"]))
+                 for r in requests])
+        return job_id
+
+    def batch_job(self, job_id):
+        with self.connect(read_only=True) as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute("SELECT * FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            return dict(row) if row else None
+
+    def batch_job_requests(self, job_id):
+        """Messages Batches request entries ({custom_id, params}) for a job"""
+        with self.connect(read_only=True) as conn:
+            return [{"custom_id": custom_id, "params": json.loads(params)} for custom_id, params in conn.execute(
+                "SELECT custom_id, params_json FROM batch_job_requests WHERE job_id = ? ORDER BY rowid", (job_id,))]
+
+    def update_batch_job(self, job_id, **fields):
+        fields["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        with self.connect() as conn:
+            conn.execute(f"UPDATE batch_jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE job_id = ?",
+                         (*fields.values(), job_id))
+
+    def list_batch_jobs(self, database_id=None):
+        sql = "SELECT * FROM batch_jobs"
+        params = ()
+        if database_id is not None:
+            sql += " WHERE database_id = ?"
+            params = (database_id,)
+        with self.connect(read_only=True) as conn:
+            conn.row_factory = sqlite3.Row
+            return [dict(row) for row in conn.execute(sql + " ORDER BY job_id DESC", params)]
+
+    def apply_batch_results(self, job_id, results):
+        """Write (custom_id, result_type, text, model) results into the snapshot in one transaction.
+
+        Descriptions replace the object's description; performance analyses go to ai_annotations. Applying
+        the same results twice is harmless, so a job interrupted while applying can simply be re-applied.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            database_id = conn.execute("SELECT database_id FROM batch_jobs WHERE job_id = ?", (job_id,)).fetchone()[0]
+            targets = {custom_id: (kind, object_type, object_id) for custom_id, kind, object_type, object_id in conn.execute(
+                "SELECT custom_id, kind, object_type, object_id FROM batch_job_requests WHERE job_id = ?", (job_id,))}
+            succeeded = errored = 0
+            for custom_id, result_type, text, model in results:
+                if custom_id not in targets:
+                    continue
+                kind, object_type, object_id = targets[custom_id]
+                conn.execute("UPDATE batch_job_requests SET result_type = ? WHERE job_id = ? AND custom_id = ?",
+                             (result_type, job_id, custom_id))
+                if result_type != "succeeded" or not text:
+                    errored += 1
+                    continue
+                succeeded += 1
+                if kind == "description":
+                    table, id_column = DESCRIPTION_TARGETS[object_type]
+                    conn.execute(f"UPDATE {table} SET description = ? WHERE {id_column} = ?", (text.strip(), object_id))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO ai_annotations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 (database_id, object_type, object_id, kind, text.strip(), model, now))
+            conn.execute("UPDATE batch_jobs SET status = 'applied', succeeded = ?, errored = ?, updated_at = ? "
+                         "WHERE job_id = ?", (succeeded, errored, now, job_id))
+        return succeeded, errored
+
+    def query(self, sql, params=()):
+        """Run a read-only SQL query against the store and return a DataFrame"""
+        with self.connect(read_only=True) as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+@st.cache_resource
+def get_snapshot_store():
+    """Open the local snapshot store (shared by all sessions)"""
+    return SchemaSnapshotStore()
+
+@st.cache_resource(max_entries=4)
+def load_snapshot_cached(database_id):
+    """Load a snapshot once per process; it is shared by every session, so change it only through the store
+    and clear this cache"""
+    return compact_schema(get_snapshot_store().load_snapshot(database_id))
+
+def save_snapshot_quietly(platform, db_data, label=None):
+    """Save a snapshot, reporting (but not failing on) store errors"""
+    try:
+        database_id = get_snapshot_store().save_snapshot(platform, db_data, label)
+        st.caption(f"💾 Saved as snapshot #{database_id}")
+        return database_id
+    except Exception as e:
+        st.warning(f"⚠️ Could not save schema snapshot: {str(e)}")
+        return None
+
+# AI response cache
+AI_CACHE_PATH = os.environ.get("SCHEMADOC_AI_CACHE_PATH", os.path.join(".schemadoc", "ai_cache.db"))
+AI_CACHE_TTL_SECONDS = int(os.environ.get("SCHEMADOC_AI_CACHE_TTL", 7 * 24 * 3600))
+AI_CACHE_MAX_ENTRIES = int(os.environ.get("SCHEMADOC_AI_CACHE_MAX_ENTRIES", 5000))
+
+AI_CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS responses (
+    cache_key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used_at);
+"""
+
+class AIResponseCache:
+    """SQLite-backed cache of Claude responses, content-addressed by model, prompt and object fingerprint.
+
+    Entries older than ``ttl`` seconds are treated as misses and removed; once more than
+    ``max_entries`` are stored the least recently used ones are evicted. Hit and miss counts
+    cover this process.
+    """
+
+    def __init__(self, path=AI_CACHE_PATH, ttl=AI_CACHE_TTL_SECONDS, max_entries=AI_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.executescript(AI_CACHE_DDL)
+
+    @contextmanager
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(model, prompt, fingerprint=None):
+        return hashlib.sha256("\x1f".join((model, fingerprint or "", prompt)).encode("utf-8")).hexdigest()
+
+    def count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """Cached response text, or None when missing or expired"""
+        now = time.time()
+        with self.connect() as conn:
+            row = conn.execute("SELECT response, created_at FROM responses WHERE cache_key = ?", (key,)).fetchone()
+            if row and now - row[1] <= self.ttl:
+                conn.execute("UPDATE responses SET last_used_at = ? WHERE cache_key = ?", (now, key))
+                self.count(True)
+                return row[0]
+            if row:
+                conn.execute("DELETE FROM responses WHERE cache_key = ?", (key,))
+        self.count(False)
+        return None
+
+    def put(self, key, model, response):
+        now = time.time()
+        with self.connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, model, response, now, now))
+            excess = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+            if excess > 0:
+                conn.execute("DELETE FROM responses WHERE cache_key IN "
+                             "(SELECT cache_key FROM responses ORDER BY last_used_at LIMIT ?)", (excess,))
+
+    def stats(self):
+        with self.connect() as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def clear(self):
+        with self.connect() as conn:
+            conn.execute("DELETE FROM responses")
+
+@st.cache_resource
+def get_ai_response_cache():
+    """Open the local AI response cache (shared by all sessions)"""
+    return AIResponseCache()
+
+def cached_claude_text(claude_client, prompt, fingerprint=None, model="claude-3-5-sonnet-20241022",
+                       max_tokens=1000, temperature=0.1):
+    """Claude's reply to a single-message prompt, served from the response cache when possible.
+
+    Returns (text, from_cache). Cache errors never block the request; failed requests are not cached.
+    """
+    try:
+        cache = get_ai_response_cache()
+        key = cache.key(model, prompt, fingerprint)
+        text = cache.get(key)
+    except Exception:
+        cache, text = None, None
+    if text is not None:
+        return text, True
+    message = claude_client.messages.create(
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    text = message.content[0].text
+    if cache is not None:
+        try:
+            cache.put(key, model, text)
+        except Exception:
+            pass
+    return text, False
+
+def show_ai_cache_stats():
+    """One-line hit/miss summary of the AI response cache"""
+    try:
+        stats = get_ai_response_cache().stats()
+    except Exception:
+        return
+    st.caption(f"💾 AI cache: {stats['hits']:,} hits, {stats['misses']:,} misses, {stats['entries']:,} stored responses")
+
+# Concurrent AI description generation
+AI_RETRY_STATUSES = frozenset({429, 529})
+AI_MAX_RETRIES = 6
+AI_BACKOFF_BASE_SECONDS = 1.0
+AI_BACKOFF_MAX_SECONDS = 60.0
+
+def estimate_prompt_tokens(text):
+    """Rough token count for rate limiting (about four characters per token)"""
+    return len(text) // 4 + 1
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute`` tokens per minute.
+
+    The bucket starts full; acquire() waits (in arrival order) until the requested amount is available.
+    Requests larger than the bucket are clamped to its capacity so they can still run.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount=1):
+        amount = min(float(amount), self.capacity)
+        async with self.lock:
+            self.refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= amount
+
+    def refund(self, amount):
+        """Return tokens that were reserved but not used (negative amounts charge extra)"""
+        self.refill()
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets plus a shared pause after rate-limit errors"""
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+
+    async def acquire(self, estimated_tokens):
+        while True:
+            delay = self.paused_until - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens, used_tokens):
+        self.tokens.refund(estimated_tokens - used_tokens)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def retry_delay(attempt, retry_after=None):
+    """Exponential backoff with full jitter, never shorter than the server's retry-after"""
+    delay = random.uniform(0, min(AI_BACKOFF_MAX_SECONDS, AI_BACKOFF_BASE_SECONDS * 2 ** attempt))
+    try:
+        return max(delay, float(retry_after)) if retry_after else delay
+    except ValueError:
+        return delay
+
+async def create_message_with_retries(client, limiter, stats, model, prompt, max_tokens):
+    """One Messages API call through the rate limiter, retrying 429/529 and connection errors with jitter"""
+    estimated = estimate_prompt_tokens(prompt) + max_tokens
+    for attempt in range(AI_MAX_RETRIES + 1):
+        await limiter.acquire(estimated)
+        try:
+            message = await client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}]
+            )
+        except anthropic.APIStatusError as e:
+            limiter.settle(estimated, 0)
+            if e.status_code not in AI_RETRY_STATUSES or attempt == AI_MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt, e.response.headers.get("retry-after"))
+            if e.status_code == 429:
+                limiter.pause(delay)
+        except anthropic.APIConnectionError:
+            limiter.settle(estimated, 0)
+            if attempt == AI_MAX_RETRIES:
+                raise
+            delay = retry_delay(attempt)
+        else:
+            usage = getattr(message, "usage", None)
+            used = (usage.input_tokens + usage.output_tokens) if usage else estimated
+            limiter.settle(estimated, used)
+            stats["tokens"] += used
+            stats["input_tokens"] += usage.input_tokens if usage else estimated - max_tokens
+            return message.content[0].text
+        stats["retries"] += 1
+        await asyncio.sleep(delay)
+
+async def run_ai_jobs(client, jobs, limiter, concurrency=8, model="claude-3-5-sonnet-20241022",
+                      max_tokens=300, on_result=None):
+    """Run (key, prompt) or (key, prompt, max_tokens) jobs with at most ``concurrency`` requests in flight.
+
+    Returns ({key: text}, {key: error message}, stats); on_result(key, text, error) is called as each
+    job finishes, from the event loop thread.
+    """
+    queue = asyncio.Queue()
+    for job in jobs:
+        queue.put_nowait(job)
+    results, errors = {}, {}
+    stats = {"requests": len(jobs), "retries": 0, "tokens": 0, "input_tokens": 0}
+
+    async def worker():
+        while not queue.empty():
+            key, prompt, *job_max_tokens = queue.get_nowait()
+            try:
+                results[key] = await create_message_with_retries(client, limiter, stats, model, prompt,
+                                                                 job_max_tokens[0] if job_max_tokens else max_tokens)
+            except Exception as e:
+                errors[key] = str(e)
+            if on_result:
+                on_result(key, results.get(key), errors.get(key))
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(jobs))))))
+    stats["elapsed"] = time.perf_counter() - started_at
+    return results, errors, stats
+
+def generate_ai_jobs(client_factory, jobs, requests_per_minute, tokens_per_minute, concurrency,
+                     model="claude-3-5-sonnet-20241022", max_tokens=300, on_result=None):
+    """Run AI jobs on a fresh event loop; the async client is created (and closed) inside that loop"""
+    async def main():
+        client = client_factory()
+        try:
+            return await run_ai_jobs(client, jobs, RateLimiter(requests_per_minute, tokens_per_minute),
+                                     concurrency, model, max_tokens, on_result)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+def async_claude_factory(claude_client, base_url=None):
+    """Factory for AsyncAnthropic clients sharing the sync client's key; retries are left to the scheduler"""
+    def factory():
+        return anthropic.AsyncAnthropic(api_key=claude_client.api_key if claude_client else "mock",
+                                        base_url=base_url or (claude_client.base_url if claude_client else None),
+                                        max_retries=0)
+    return factory
+
+DESCRIPTION_INSTRUCTIONS = ("Write a one or two sentence business description of this {db_name} table for a "
+                            "data dictionary. Reply with the description only.")
+BATCH_DESCRIPTION_INSTRUCTIONS = (
+    "Write a one or two sentence business description of each {db_name} table below for a data dictionary. "
+    'Reply with only a JSON array with one object per table: [{{"table": "<name as given>", "description": "..."}}]')
+BATCH_OUTPUT_TOKENS_PER_TABLE = 120
+BATCH_MAX_TABLES = 25
+JSON_ARRAY = re.compile(r"\[.*\]", re.S)
+
+def table_prompt_block(table):
+    columns = ", ".join(f"{c.get('column_name')} {c.get('data_type')}" for c in (table.get("columns") or [])[:60])
+    return f"Table: {qualified_object_name(table, 'table_name')}\nColumns: {columns}"
+
+def table_description_prompt(db_name, table):
+    return f"{DESCRIPTION_INSTRUCTIONS.format(db_name=db_name)}\n\n{table_prompt_block(table)}"
+
+def batch_description_prompt(db_name, tables):
+    return BATCH_DESCRIPTION_INSTRUCTIONS.format(db_name=db_name) + "".join(
+        f"\n\n{table_prompt_block(table)}" for table in tables)
+
+def pack_description_batches(tables, token_budget, max_tables=BATCH_MAX_TABLES):
+    """Group table indexes, in order, into batches whose table blocks fit the input token budget.
+
+    A table too large to share the budget ends up in a batch of its own.
+    """
+    batches, batch, used = [], [], 0
+    for i, table in enumerate(tables):
+        tokens = estimate_prompt_tokens(table_prompt_block(table))
+        if batch and (used + tokens > token_budget or len(batch) == max_tables):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(i)
+        used += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def parse_batch_descriptions(text):
+    """{folded table name: description} from a batched reply; code fences and surrounding prose are ignored"""
+    match = JSON_ARRAY.search(text or "")
+    try:
+        items = json.loads(match.group(0)) if match else []
+    except ValueError:
+        return {}
+    return {strict_name_key(str(item["table"])): str(item["description"]).strip()
+            for item in items if isinstance(item, dict) and item.get("table") and item.get("description")}
+
+def generate_table_descriptions(client_factory, db_name, tables, requests_per_minute, tokens_per_minute,
+                                concurrency, model="claude-3-5-sonnet-20241022", batch_budget=None, on_progress=None):
+    """Descriptions for a list of tables: ({index: text}, {index: error}, stats).
+
+    With batch_budget, small tables are packed into shared prompts that reply with a JSON array; tables
+    a batched reply leaves out are retried with their own prompt. on_progress(n) reports finished tables.
+    """
+    jobs, members = [], {}
+    for n, batch in enumerate(pack_description_batches(tables, batch_budget) if batch_budget else [[i] for i in range(len(tables))]):
+        if len(batch) == 1:
+            jobs.append((batch[0], table_description_prompt(db_name, tables[batch[0]]), 300))
+        else:
+            members[("batch", n)] = batch
+            jobs.append((("batch", n), batch_description_prompt(db_name, [tables[i] for i in batch]),
+                         min(4096, BATCH_OUTPUT_TOKENS_PER_TABLE * len(batch) + 100)))
+
+    def on_result(key, text, error):
+        if on_progress:
+            on_progress(len(members.get(key, [key])))
+
+    results, errors, stats = generate_ai_jobs(client_factory, jobs, requests_per_minute, tokens_per_minute,
+                                              concurrency, model, on_result=on_result)
+    descriptions, failed, retry = {}, {}, []
+    for key, text in results.items():
+        if key not in members:
+            descriptions[key] = text.strip()
+            continue
+        parsed = parse_batch_descriptions(text)
+        for i in members[key]:
+            table = tables[i]
+            description = parsed.get(strict_name_key(qualified_object_name(table, "table_name"))) or \
+                parsed.get(strict_name_key(table["table_name"]))
+            if description:
+                descriptions[i] = description
+            else:
+                retry.append((i, table_description_prompt(db_name, table), 300))
+    for key, error in errors.items():
+        for i in members.get(key, [key]):
+            failed[i] = error
+    stats["batches"] = len(members)
+
+    if retry:
+        results, errors, retry_stats = generate_ai_jobs(client_factory, retry, requests_per_minute, tokens_per_minute,
+                                                        concurrency, model)
+        descriptions.update((i, text.strip()) for i, text in results.items())
+        failed.update(errors)
+        for name in ("requests", "retries", "tokens", "input_tokens", "elapsed"):
+            stats[name] += retry_stats[name]
+    return descriptions, failed, stats
+
+MOCK_TABLE_LINE = re.compile(r"^Table: (.+)$", re.M)
+
+def mock_prompt_text(request):
+    return "".join(m.get("content", "") if isinstance(m.get("content"), str) else json.dumps(m.get("content"))
+                   for m in request.get("messages", []))
+
+class MockMessagesServer:
+    """Local stand-in for the Messages API, for benchmarking the scheduler offline.
+
+    Serves POST /v1/messages on 127.0.0.1 with a simulated latency, enforces its own requests- and
+    tokens-per-minute limits over a sliding window (429 with retry-after when exceeded) and answers
+    a share of requests with 529 overloaded errors. Prompts listing several tables get a JSON array.
+    Message Batches (create, retrieve, results) are kept in memory and end batch_seconds after creation.
+    """
+
+    def __init__(self, requests_per_minute=600, tokens_per_minute=400000, latency=0.2, overload_rate=0.02,
+                 batch_seconds=5.0):
+        self.batch_seconds = batch_seconds
+        self.batches = {}
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.latency = latency
+        self.overload_rate = overload_rate
+        self.window = deque()
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def reply(self, status, body, headers=()):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("content-type", "application/json")
+                self.send_header("content-length", str(len(payload)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("content-length", 0))) or b"{}")
+                if self.path.split("?")[0].rstrip("/").endswith("/messages/batches"):
+                    self.reply(200, server.create_batch(request))
+                    return
+                status, body, headers = server.respond(request, mock_prompt_text(request))
+                if status == 200:
+                    time.sleep(server.latency * random.uniform(0.5, 1.5))
+                self.reply(status, body, headers)
+
+            def do_GET(self):
+                parts = self.path.split("?")[0].strip("/").split("/")
+                batch_id = parts[3] if len(parts) >= 4 and parts[1:3] == ["messages", "batches"] else None
+                if batch_id not in server.batches:
+                    self.reply(404, {"type": "error", "error": {"type": "not_found_error", "message": "Not found"}})
+                elif parts[-1] == "results":
+                    payload = "".join(json.dumps(line) + "\n" for line in server.batch_results(batch_id)).encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("content-type", "application/binary")
+                    self.send_header("content-length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                else:
+                    self.reply(200, server.batch_object(batch_id))
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="mock-messages", daemon=True)
+
+    def respond(self, request, prompt):
+        input_tokens = estimate_prompt_tokens(prompt)
+        output_tokens = min(int(request.get("max_tokens", 100)), 60 * max(1, len(MOCK_TABLE_LINE.findall(prompt))))
+        now = time.monotonic()
+        with self.lock:
+            while self.window and now - self.window[0][0] >= 60:
+                self.window.popleft()
+            used = sum(tokens for _, tokens in self.window)
+            if len(self.window) >= self.requests_per_minute or used + input_tokens + output_tokens > self.tokens_per_minute:
+                self.counts["rate_limited"] += 1
+                retry_after = max(1, int(60 - (now - self.window[0][0]))) if self.window else 1
+                return 429, {"type": "error", "error": {"type": "rate_limit_error", "message": "Rate limited"}}, \
+                    [("retry-after", str(retry_after))]
+            if random.random() < self.overload_rate:
+                self.counts["overloaded"] += 1
+                return 529, {"type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}, []
+            self.window.append((now, input_tokens + output_tokens))
+            self.counts["ok"] += 1
+        return 200, self.message(request, prompt, input_tokens, output_tokens), []
+
+    def message(self, request, prompt, input_tokens, output_tokens):
+        names = MOCK_TABLE_LINE.findall(prompt)
+        if len(names) > 1:
+            text = json.dumps([{"table": name, "description": f"Mock description of {name}."} for name in names])
+        else:
+            text = f"Mock description ({input_tokens} prompt tokens)."
+        return {
+            "id": f"msg_mock_{self.counts['ok']}", "type": "message", "role": "assistant",
+            "model": request.get("model", "mock"), "stop_reason": "end_turn", "stop_sequence": None,
+            "content": [{"type": "text", "text": text}],
+            "usage": {"input_tokens": input_tokens, "output_tokens": output_tokens}
+        }
+
+    def create_batch(self, request):
+        with self.lock:
+            batch_id = f"msgbatch_mock_{len(self.batches) + 1}"
+            self.batches[batch_id] = {"requests": request.get("requests", []), "created": time.monotonic(),
+                                      "created_at": datetime.now().isoformat()}
+        return self.batch_object(batch_id)
+
+    def batch_object(self, batch_id):
+        """Batch status: in progress for batch_seconds after creation, then ended with every request succeeded"""
+        batch = self.batches[batch_id]
+        ended = time.monotonic() - batch["created"] >= self.batch_seconds
+        count = len(batch["requests"])
+        return {
+            "id": batch_id, "type": "message_batch", "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {"processing": 0 if ended else count, "succeeded": count if ended else 0,
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": batch["created_at"], "expires_at": batch["created_at"],
+            "ended_at": datetime.now().isoformat() if ended else None, "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None
+        }
+
+    def batch_results(self, batch_id):
+        for entry in self.batches[batch_id]["requests"]:
+            params = entry.get("params", {})
+            prompt = mock_prompt_text(params)
+            input_tokens = estimate_prompt_tokens(prompt)
+            output_tokens = min(int(params.get("max_tokens", 100)), 60)
+            yield {"custom_id": entry.get("custom_id"),
+                   "result": {"type": "succeeded", "message": self.message(params, prompt, input_tokens, output_tokens)}}
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+# Bulk AI jobs (Message Batches API)
+BATCH_API_MAX_REQUESTS = 100000
+BATCH_POLL_SECONDS = 10
+
+def object_description_prompt(db_name, object_type, record):
+    """Description prompt for a view or routine (tables use table_description_prompt)"""
+    if object_type == "view":
+        name, body = qualified_object_name(record, "view_name"), f"Definition:\n{record.get('definition') or ''}"
+    else:
+        name = qualified_object_name(record, "function_name" if record.get("function_name") else "procedure_name")
+        body = f"Parameters: {record.get('parameters') or ''}\nReturns: {record.get('return_type') or ''}"
+    return (f"Write a one or two sentence business description of this {db_name} {object_type} for a data "
+            f"dictionary. Reply with the description only.\n\n{object_type.title()}: {name}\n{body[:4000]}")
+
+def build_bulk_requests(store, database_id, db_name, db_data, descriptions=True, performance=True,
+                        missing_only=True, model="claude-3-5-sonnet-20241022"):
+    """Message Batches requests for every object of a snapshot, tagged with the store rows they update"""
+    ids = store.object_ids(database_id)
+    requests = []
+
+    def add(kind, object_type, object_id, prompt, max_tokens):
+        requests.append({"custom_id": f"{kind[:4]}-{object_type}-{object_id}", "kind": kind,
+                         "object_type": object_type, "object_id": object_id,
+                         "params": {"model": model, "max_tokens": max_tokens,
+                                    "messages": [{"role": "user", "content": prompt}]}})
+
+    for table_id, table in zip(ids["tables"], db_data.get("tables", [])):
+        if descriptions and not (missing_only and table.get("description")):
+            add("description", "table", table_id, table_description_prompt(db_name, table), 300)
+        if performance and not (missing_only and table.get("performance_analysis")):
+            add("performance", "table", table_id, performance_analysis_prompt(db_name, table), 1000)
+    if descriptions:
+        for object_type, kind_ids, records in (("view", ids["views"], db_data.get("views", [])),
+                                               ("routine", ids["functions"], db_data.get("functions", [])),
+                                               ("routine", ids["procedures"], db_data.get("procedures", []))):
+            for object_id, record in zip(kind_ids, records):
+                if not (missing_only and record.get("description")):
+                    add("description", object_type, object_id, object_description_prompt(db_name, object_type, record), 300)
+    return requests
+
+def submit_batch_job(store, client, job_id):
+    """Send a pending job's requests as one Message Batch and record the batch id"""
+    batch = client.messages.batches.create(requests=store.batch_job_requests(job_id))
+    store.update_batch_job(job_id, batch_id=batch.id, status="submitted", error=None)
+    return batch
+
+def batch_result_rows(client, batch_id):
+    """(custom_id, result type, text, model) for each entry of an ended batch, streamed from the results file"""
+    for entry in client.messages.batches.results(batch_id):
+        message = getattr(entry.result, "message", None) if entry.result.type == "succeeded" else None
+        text = "".join(getattr(block, "text", "") for block in message.content) if message else None
+        yield entry.custom_id, entry.result.type, text, message.model if message else None
+
+def advance_batch_job(store, client, job_id, wait_seconds=0, poll_seconds=BATCH_POLL_SECONDS, on_status=None):
+    """Move a job as far as it can go: submit if pending, poll until ended (or wait_seconds pass), apply results.
+
+    Every step is recorded in the store first, so after a crash calling this again picks up where the job
+    stopped. Returns the job's row.
+    """
+    job = store.batch_job(job_id)
+    if job["status"] == "pending":
+        submit_batch_job(store, client, job_id)
+        job = store.batch_job(job_id)
+    deadline = time.monotonic() + wait_seconds
+    while job["status"] == "submitted":
+        batch = client.messages.batches.retrieve(job["batch_id"])
+        counts = batch.request_counts
+        store.update_batch_job(job_id, succeeded=counts.succeeded,
+                               errored=counts.errored + counts.canceled + counts.expired,
+                               status="ended" if batch.processing_status == "ended" else "submitted")
+        job = store.batch_job(job_id)
+        if on_status:
+            on_status(job, counts)
+        if job["status"] == "submitted":
+            if time.monotonic() + poll_seconds > deadline:
+                return job
+            time.sleep(poll_seconds)
+    if job["status"] == "ended":
+        store.apply_batch_results(job_id, batch_result_rows(client, job["batch_id"]))
+        load_snapshot_cached.clear()
+        job = store.batch_job(job_id)
+    return job
+
+@st.cache_resource
+def get_mock_batch_server():
+    """Local Messages API stand-in kept running across reruns, so mock batch jobs can be polled later"""
+    return MockMessagesServer(batch_seconds=15).__enter__()
+
+def batch_job_client(claude_client, endpoint):
+    if endpoint == "mock":
+        return anthropic.Anthropic(api_key="mock", base_url=get_mock_batch_server().url, max_retries=2)
+    if not claude_client:
+        raise ValueError("Claude API key required for Message Batches jobs")
+    return claude_client
+
+def show_bulk_ai_jobs(store, database_id, db_name, claude_client):
+    """Submit, resume and apply whole-snapshot Message Batches jobs"""
+    st.markdown("Submit descriptions and performance analyses for every object as one Message Batch. "
+                "Batches run asynchronously at reduced cost; results are written back into this snapshot.")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        descriptions = st.checkbox("📝 Descriptions", value=True, key="bulk_descriptions")
+    with col2:
+        performance = st.checkbox("⚡ Performance analyses", value=True, key="bulk_performance")
+    with col3:
+        missing_only = st.checkbox("Only missing results", value=True, key="bulk_missing")
+    with col4:
+        endpoint = st.radio("Endpoint", ["anthropic", "mock"], key="bulk_endpoint",
+                            format_func={"anthropic": "Anthropic API", "mock": "Local mock"}.get)
+    
+    if st.button("📦 Submit Bulk Job", type="primary", key="bulk_submit", disabled=not (descriptions or performance)):
+        try:
+            db_data = load_snapshot_cached(database_id)
+            requests = build_bulk_requests(store, database_id, db_name, db_data, descriptions, performance, missing_only)
+            if not requests:
+                st.info("Nothing to submit: every selected object already has results")
+            elif len(requests) > BATCH_API_MAX_REQUESTS:
+                st.error(f"❌ {len(requests):,} requests exceed the {BATCH_API_MAX_REQUESTS:,} per batch limit")
+            else:
+                client = batch_job_client(claude_client, endpoint)
+                job_id = store.create_batch_job(database_id, endpoint, requests)
+                submit_batch_job(store, client, job_id)
+                st.success(f"✅ Job #{job_id} submitted with {len(requests):,} requests")
+        except Exception as e:
+            st.error(f"❌ Could not submit bulk job: {str(e)}")
+    
+    jobs = store.list_batch_jobs(database_id)
+    if not jobs:
+        return
+    st.dataframe(pd.DataFrame(jobs).drop(columns=["database_id"]), use_container_width=True, hide_index=True)
+    open_jobs = [job["job_id"] for job in jobs if job["status"] in BATCH_JOB_OPEN_STATUSES]
+    if not open_jobs:
+        return
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        job_id = st.selectbox("Open job", open_jobs, key="bulk_job", format_func=lambda i: f"#{i}")
+    with col2:
+        wait_seconds = st.number_input("Wait up to (s)", min_value=0, max_value=600, value=30, key="bulk_wait")
+    with col3:
+        st.write("")
+        resume = st.button("🔄 Check / Resume Job", key="bulk_resume", use_container_width=True)
+    if resume:
+        status = st.empty()
+        def on_status(job, counts):
+            status.caption(f"Batch {job['batch_id']}: {counts.processing:,} processing, "
+                           f"{counts.succeeded:,} succeeded, {job['errored']:,} failed")
+        try:
+            client = batch_job_client(claude_client, store.batch_job(job_id)["endpoint"])
+            job = advance_batch_job(store, client, job_id, wait_seconds, min(BATCH_POLL_SECONDS, max(1, wait_seconds)),
+                                    on_status)
+        except Exception as e:
+            store.update_batch_job(job_id, error=str(e))
+            st.error(f"❌ Could not resume job #{job_id}: {str(e)}")
+            return
+        if job["status"] == "applied":
+            st.success(f"✅ Job #{job_id} applied: {job['succeeded']:,} results written, {job['errored']:,} failed")
+        else:
+            st.info(f"⏳ Job #{job_id} is still {job['status']}; check again later")
+
+def show_ai_description_generator(db_name, db_data, claude_client, snapshot_id=None):
+    """Bulk table descriptions through the async scheduler, or a dry run against the local mock server.
+
+    Descriptions for a saved snapshot are written to the store rather than into db_data, which is shared.
+    """
+    tables = db_data.get("tables", [])
+    with st.expander("🤖 Bulk AI Descriptions"):
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            concurrency = st.slider("Concurrent requests", 1, 32, 8, key=f"ai_concurrency_{db_name}")
+        with col2:
+            requests_per_minute = st.number_input("Requests per minute", min_value=1, value=50,
+                                                  key=f"ai_rpm_{db_name}")
+        with col3:
+            tokens_per_minute = st.number_input("Tokens per minute", min_value=1000, value=40000, step=1000,
+                                                key=f"ai_tpm_{db_name}")
+        with col4:
+            missing_only = st.checkbox("Only tables without a description", value=True, key=f"ai_missing_{db_name}")
+            batching = st.checkbox("📦 Batch small tables", value=True, key=f"ai_batching_{db_name}",
+                                   help="Pack several tables into one request that answers with JSON")
+        batch_budget = None
+        if batching:
+            batch_budget = st.number_input("Batch input token budget", min_value=200, value=3000, step=500,
+                                           key=f"ai_batch_budget_{db_name}")
+        
+        selected = [t for t in tables if not (missing_only and t.get("description"))]
+        st.caption(f"{len(selected):,} of {len(tables):,} tables selected")
+        col1, col2 = st.columns(2)
+        with col1:
+            generate = st.button("🚀 Generate Descriptions", disabled=not (claude_client and selected),
+                                 key=f"ai_generate_{db_name}", use_container_width=True)
+        with col2:
+            benchmark = st.button("🧪 Benchmark with Mock Server", disabled=not selected,
+                                  key=f"ai_benchmark_{db_name}", use_container_width=True,
+                                  help="Run the same requests against a local stand-in that enforces these limits")
+        if not (generate or benchmark):
+            return
+        
+        model = "claude-3-5-sonnet-20241022"
+        cache, cached = None, {}
+        if generate:
+            try:
+                cache = get_ai_response_cache()
+                for i, table in enumerate(selected):
+                    text = cache.get(cache.key(model, table_description_prompt(db_name, table)))
+                    if text is not None:
+                        cached[i] = text
+            except Exception:
+                cache = None
+        pending = [i for i in range(len(selected)) if i not in cached]
+        
+        progress = st.progress(0.0)
+        done = [len(cached)]
+        def on_progress(count):
+            done[0] += count
+            progress.progress(min(1.0, done[0] / len(selected)), text=f"{done[0]:,} / {len(selected):,} tables")
+        
+        try:
+            pending_tables = [selected[i] for i in pending]
+            if benchmark:
+                with MockMessagesServer(requests_per_minute, tokens_per_minute) as mock:
+                    results, errors, stats = generate_table_descriptions(
+                        async_claude_factory(claude_client, mock.url), db_name, pending_tables, requests_per_minute,
+                        tokens_per_minute, concurrency, model, batch_budget, on_progress)
+                    stats.update(mock.counts)
+            else:
+                results, errors, stats = generate_table_descriptions(
+                    async_claude_factory(claude_client), db_name, pending_tables, requests_per_minute,
+                    tokens_per_minute, concurrency, model, batch_budget, on_progress)
+        except Exception as e:
+            st.error(f"❌ Description generation failed: {str(e)}")
+            return
+        results = {pending[i]: text for i, text in results.items()}
+        errors = {pending[i]: error for i, error in errors.items()}
+        
+        if generate:
+            for i, text in results.items():
+                if cache is not None:
+                    try:
+                        cache.put(cache.key(model, table_description_prompt(db_name, selected[i])), model, text)
+                    except Exception:
+                        pass
+            descriptions = {**cached, **results}
+            if snapshot_id is None:
+                for i, text in descriptions.items():
+                    selected[i]["description"] = text
+            elif descriptions:
+                try:
+                    store = get_snapshot_store()
+                    table_ids = dict(zip(map(id, tables), store.object_ids(snapshot_id)["tables"]))
+                    store.update_descriptions("table", [(table_ids[id(selected[i])], text)
+                                                        for i, text in descriptions.items()])
+                    load_snapshot_cached.clear()
+                    st.success(f"💾 Saved {len(descriptions):,} descriptions to snapshot #{snapshot_id}; "
+                               f"they appear in the table browser on the next rerun")
+                except Exception as e:
+                    st.error(f"❌ Could not save descriptions to snapshot #{snapshot_id}: {str(e)}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Generated", f"{len(results):,}", f"{len(cached):,} from cache" if cached else None, delta_color="off")
+        with col2:
+            st.metric("Requests", f"{stats['requests']:,}", f"{stats['batches']:,} batched" if stats["batches"] else None,
+                      delta_color="off")
+        with col3:
+            st.metric("Input Tokens", f"{stats['input_tokens']:,}", f"{len(errors):,} failed, {stats['retries']:,} retries",
+                      delta_color="off")
+        with col4:
+            rate = len(results) / stats["elapsed"] * 60 if stats["elapsed"] else 0
+            st.metric("Throughput", f"{rate:,.0f}/min", f"{stats['elapsed']:.1f}s", delta_color="off")
+        if benchmark:
+            st.caption(f"Mock server: {stats.get('ok', 0):,} served, {stats.get('rate_limited', 0):,} rate limited (429), "
+                       f"{stats.get('overloaded', 0):,} overloaded (529)")
+        if errors:
+            st.dataframe(pd.DataFrame([{"Table": qualified_object_name(selected[i], "table_name"), "Error": error}
+                                       for i, error in errors.items()]), use_container_width=True, hide_index=True)
+
+def show_live_schema_documentation(db_name, claude_client, include_ai_descriptions, include_diagrams,
+                                   include_data_dictionary, include_performance_notes, include_security_analysis):
+    """Render documentation for a schema extracted in the live connection mode"""
+
+    db_data = st.session_state.get("live_schemas", {}).get(db_name)
+    if db_data:
+        st.markdown("---")
+        show_database_documentation(db_name, db_data, claude_client, include_ai_descriptions,
+                                    include_diagrams, include_data_dictionary, include_performance_notes,
+                                    include_security_analysis)
+
+def show_live_connection_mode(claude_client, include_ai_descriptions, include_diagrams,
+                              include_data_dictionary, include_performance_notes, include_security_analysis):
+    """Show live database connection interface"""
+    
+    st.header("📊 Live Database Connection")
+    st.markdown("**Connect to your live databases for real-time schema documentation**")
+    
+    # Connection tabs
+    conn_tabs = st.tabs(["🐘 PostgreSQL", "🔶 Oracle", "🟦 SQL Server"])
+    
+    with conn_tabs[0]:
+        show_postgres_connection()
+        show_live_schema_documentation("PostgreSQL", claude_client, include_ai_descriptions, include_diagrams,
+                                       include_data_dictionary, include_performance_notes, include_security_analysis)
+    
+    with conn_tabs[1]:
+        show_oracle_connection()
+        show_live_schema_documentation("Oracle", claude_client, include_ai_descriptions, include_diagrams,
+                                       include_data_dictionary, include_performance_notes, include_security_analysis)
+    
+    with conn_tabs[2]:
+        show_sqlserver_connection()
+        show_live_schema_documentation("SQL Server", claude_client, include_ai_descriptions, include_diagrams,
+                                       include_data_dictionary, include_performance_notes, include_security_analysis)
+
+def show_postgres_connection():
+    """PostgreSQL connection interface"""
+    
+    st.subheader("🐘 PostgreSQL Connection")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        pg_host = st.text_input("Host", value="localhost", key="pg_host")
+        pg_port = st.number_input("Port", value=5432, key="pg_port")
+        pg_database = st.text_input("Database", key="pg_database")
+    
+    with col2:
+        pg_username = st.text_input("Username", key="pg_username")
+        pg_password = st.text_input("Password", type="password", key="pg_password")
+        pg_schema = st.text_input("Schema (optional)", value="public", key="pg_schema")
+    
+    parallel, max_workers = show_parallel_extraction_options("pg")
+    
+    if st.button("🔗 Connect to PostgreSQL", type="primary"):
+        pool = get_connection_pool("PostgreSQL", pg_host, pg_port, pg_database, pg_username, pg_password)
+        extract_live_schema("PostgreSQL", pool, parse_schema_list(pg_schema), parallel, max_workers)
+    
+    if st.session_state.get("live_schemas", {}).get("PostgreSQL"):
+        if st.button("🔄 Refresh Changed Objects", key="pg_refresh",
+                     help="Re-extract only tables, views and routines whose catalog fingerprint changed"):
+            pool = get_connection_pool("PostgreSQL", pg_host, pg_port, pg_database, pg_username, pg_password)
+            refresh_live_schema("PostgreSQL", pool, parse_schema_list(pg_schema))
+
+def show_oracle_connection():
+    """Oracle connection interface"""
+    
+    st.subheader("🔶 Oracle Connection")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        oracle_host = st.text_input("Host", value="localhost", key="oracle_host")
+        oracle_port = st.number_input("Port", value=1521, key="oracle_port")
+        oracle_service = st.text_input("Service Name", key="oracle_service")
+    
+    with col2:
+        oracle_username = st.text_input("Username", key="oracle_username")
+        oracle_password = st.text_input("Password", type="password", key="oracle_password")
+        oracle_schema = st.text_input("Schema (optional)", key="oracle_schema")
+    
+    parallel, max_workers = show_parallel_extraction_options("oracle")
+    
+    if st.button("🔗 Connect to Oracle", type="primary"):
+        pool = get_connection_pool("Oracle", oracle_host, oracle_port, oracle_service, oracle_username, oracle_password)
+        extract_live_schema("Oracle", pool, parse_schema_list(oracle_schema), parallel, max_workers)
+    
+    if st.session_state.get("live_schemas", {}).get("Oracle"):
+        if st.button("🔄 Refresh Changed Objects", key="oracle_refresh",
+                     help="Re-extract only tables, views and routines whose catalog fingerprint changed"):
+            pool = get_connection_pool("Oracle", oracle_host, oracle_port, oracle_service, oracle_username, oracle_password)
+            refresh_live_schema("Oracle", pool, parse_schema_list(oracle_schema))
+
+def show_sqlserver_connection():
+    """SQL Server connection interface"""
+    
+    st.subheader("🟦 SQL Server Connection")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        sql_server = st.text_input("Server", value="localhost", key="sql_server")
+        sql_port = st.number_input("Port", value=1433, key="sql_port")
+        sql_database = st.text_input("Database", key="sql_database")
+    
+    with col2:
+        sql_username = st.text_input("Username", key="sql_username")
+        sql_password = st.text_input("Password", type="password", key="sql_password")
+        sql_auth = st.selectbox("Authentication", ["SQL Server", "Windows"], key="sql_auth")
+        sql_schema = st.text_input("Schema (optional)", key="sql_schema")
+    
+    parallel, max_workers = show_parallel_extraction_options("sql")
+    
+    if st.button("🔗 Connect to SQL Server", type="primary"):
+        pool = get_connection_pool("SQL Server", sql_server, sql_port, sql_database, sql_username, sql_password, sql_auth)
+        extract_live_schema("SQL Server", pool, parse_schema_list(sql_schema), parallel, max_workers)
+    
+    if st.session_state.get("live_schemas", {}).get("SQL Server"):
+        if st.button("🔄 Refresh Changed Objects", key="sql_refresh",
+                     help="Re-extract only tables, views and routines whose catalog fingerprint changed"):
+            pool = get_connection_pool("SQL Server", sql_server, sql_port, sql_database, sql_username, sql_password, sql_auth)
+            refresh_live_schema("SQL Server", pool, parse_schema_list(sql_schema))
+
+SNAPSHOT_QUERY_EXAMPLE = """SELECT d.platform, t.schema_name, t.table_name, c.column_name, c.data_type
+FROM columns c
+JOIN tables t ON t.table_id = c.table_id
+JOIN databases d ON d.database_id = t.database_id
+WHERE c.data_type LIKE 'DECIMAL%'
+ORDER BY t.table_name
+LIMIT 500"""
+
+def show_snapshot_store_mode(claude_client, include_ai_descriptions, include_diagrams,
+                             include_data_dictionary, include_performance_notes, include_security_analysis):
+    """Browse and query schema snapshots saved in the local store"""
+    
+    st.header("💾 Saved Schema Snapshots")
+    st.markdown("**Document previously extracted schemas without reconnecting to the source database**")
+    
+    store = get_snapshot_store()
+    snapshots = store.list_snapshots()
+    if not snapshots:
+        st.info("📭 No snapshots saved yet. Extract a schema in Live Database Connection mode to create one.")
+        return
+    
+    snapshot_tabs = st.tabs(["📚 Documentation", "🔎 SQL Query", "📈 Fleet Analytics", "📦 Bulk AI Jobs"])
+    labels = {
+        s["database_id"]: f"#{s['database_id']} · {s['platform']} · {s['name'] or 'N/A'} · "
+                          f"{s['tables']:,} tables · {s['captured_at']}" + (f" · {s['label']}" if s["label"] else "")
+        for s in snapshots
+    }
     
-    with st.spinner(f"🤖 Generating comparison report: {source_db} → {target_db}..."):
-        time.sleep(3)
+    with snapshot_tabs[0]:
+        database_id = st.selectbox("Snapshot", list(labels), format_func=labels.get, key="snapshot_id")
+        snapshot = next(s for s in snapshots if s["database_id"] == database_id)
         
-        st.markdown(f"""
-        <div class="success-banner">
-            <h4>✅ Comparison Report Generated</h4>
-            <p><strong>Source:</strong> {source_db} ({source_schema})</p>
-            <p><strong>Target:</strong> {target_db} ({target_schema})</p>
-            <p><strong>Analysis Complete:</strong> Ready for review and export</p>
-        </div>
-        """, unsafe_allow_html=True)
+        started_at = time.perf_counter()
+        db_data = load_snapshot_cached(database_id)
+        st.caption(f"⚡ Loaded from local store in {(time.perf_counter() - started_at) * 1000:.0f} ms")
         
-        # Show sample comparison results
-        st.subheader("📊 Comparison Summary")
+        show_database_documentation(snapshot["platform"], db_data, claude_client, include_ai_descriptions,
+                                    include_diagrams, include_data_dictionary, include_performance_notes,
+                                    include_security_analysis, snapshot_id=database_id)
+    
+    with snapshot_tabs[1]:
+        st.markdown("Query the `databases`, `tables`, `columns`, `indexes`, `constraints`, `views` "
+                    "and `routines` tables (read-only).")
+        sql = st.text_area("SQL", value=SNAPSHOT_QUERY_EXAMPLE, height=180, key="snapshot_sql")
+        if st.button("▶️ Run Query", key="snapshot_run_query"):
+            try:
+                started_at = time.perf_counter()
+                result_df = store.query(sql)
+                st.caption(f"{len(result_df):,} rows in {(time.perf_counter() - started_at) * 1000:.0f} ms")
+                st.dataframe(result_df, use_container_width=True, hide_index=True)
+            except Exception as e:
+                st.error(f"❌ Query failed: {str(e)}")
+    
+    with snapshot_tabs[2]:
+        st.markdown("Search columns across several databases at once, e.g. all `NUMERIC`/`DECIMAL`/`NUMBER` "
+                    "columns with precision greater than 18.")
+        # Snapshots are listed newest first, so the first one per database is its latest capture
+        latest = {}
+        for s in snapshots:
+            latest.setdefault((s["platform"], s["name"]), s["database_id"])
+        selected = st.multiselect("Snapshots", list(labels), default=list(latest.values()),
+                                  format_func=labels.get, key="fleet_snapshots")
+        if st.button("📈 Build Fleet Catalog", key="fleet_build") and selected:
+            started_at = time.perf_counter()
+            with st.spinner(f"Loading {len(selected)} snapshots..."):
+                names = {s["database_id"]: f"{s['platform']}: {s['name'] or s['database_id']}" for s in snapshots}
+                st.session_state["fleet_catalog"] = SchemaCatalog.combine([
+                    SchemaCatalog.from_schema(store.load_snapshot(database_id), database=names[database_id])
+                    for database_id in selected
+                ])
+            st.caption(f"⚡ Built in {time.perf_counter() - started_at:.1f} s")
         
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Tables Compared", "15", "2 differences")
-        with col2:
-            st.metric("Columns Analyzed", "127", "8 type differences")
-        with col3:
-            st.metric("Indexes Reviewed", "34", "5 missing")
-        with col4:
-            st.metric("Compatibility Score", "87%", "+12% with changes")
+        catalog = st.session_state.get("fleet_catalog")
+        if catalog is not None:
+            totals = catalog.totals()
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Tables", f"{totals['tables']:,}")
+            with col2:
+                st.metric("Columns", f"{totals['columns']:,}")
+            with col3:
+                st.metric("Total Size", f"{totals['size_mb'] / 1024:,.1f} GB")
+            show_column_filters(catalog, "fleet")
+    
+    with snapshot_tabs[3]:
+        st.caption(f"Snapshot: {labels[database_id]}")
+        show_bulk_ai_jobs(store, database_id, snapshot["platform"], claude_client)
+
+# DDL file parsing
+class SchemaBuilder:
+    """Assemble parsed DDL events into the db_data model.
+
+    Events for tables that have not been created yet (e.g. ALTER TABLE before CREATE TABLE)
+    are parked until the table appears. A builder without a dialect holds a JSON/XML schema export.
+    """
+
+    def __init__(self, dialect):
+        self.dialect = dialect
+        self.default_schema = DDL_DEFAULT_SCHEMAS.get(dialect, "")
+        self.database_info = {}
+        self.tables = {}
+        self.pending = {}
+        self.views = []
+        self.functions = []
+        self.procedures = []
+        self.statements = 0
+
+    @property
+    def platform(self):
+        """The script's dialect, or the platform named in an export's database info"""
+        return self.dialect or detect_import_platform(self.database_info)
+
+    def key(self, schema, name):
+        return ((schema or self.default_schema).casefold(), name.casefold())
+
+    def add(self, kind, target, payload):
+        if kind == "database":
+            self.database_info.update(payload)
+            return
+        if kind == "table":
+            payload["schema"] = payload["schema"] or self.default_schema
+            key = self.key(*target)
+            self.tables[key] = payload
+            for event in self.pending.pop(key, []):
+                self.add(*event)
+            return
+        if kind in ("view", "function", "procedure"):
+            payload["schema"] = payload["schema"] or self.default_schema
+            {"view": self.views, "function": self.functions, "procedure": self.procedures}[kind].append(payload)
+            return
+
+        table = self.tables.get(self.key(*target))
+        if table is None:
+            self.pending.setdefault(self.key(*target), []).append((kind, target, payload))
+            return
+        if kind == "index":
+            table["indexes"].append(payload)
+        elif kind == "constraint":
+            table["constraints"].append(payload)
+        elif kind == "column":
+            table["columns"].append(payload)
+        elif kind == "table_comment":
+            table["description"] = payload
+        elif kind in ("default", "column_comment"):
+            column_name, value = payload
+            for column in table["columns"]:
+                if column["column_name"].casefold() == column_name.casefold():
+                    column["default" if kind == "default" else "description"] = value
+
+    def add_statement(self, statement):
+        self.statements += 1
+        for event in parse_ddl_statement(statement, self.dialect):
+            self.add(*event)
+
+    def result(self, db_name, source_bytes=0):
+        for table in self.tables.values():
+            for constraint in table["constraints"]:
+                ref_schema = constraint.pop("references_schema", None)
+                if ref_schema and ref_schema.casefold() != table["schema"].casefold():
+                    constraint["references"] = f"{ref_schema}.{constraint['references']}"
+        source = "script" if self.dialect else "export"
+        return compact_schema({
+            "database_info": {
+                "name": db_name,
+                "version": f"{self.dialect} DDL script" if self.dialect else "Schema export",
+                "size": f"{source_bytes / (1024 * 1024):.1f} MB {source}",
+                "created": "N/A",
+                "last_backup": "N/A",
+                **self.database_info
+            },
+            "tables": list(self.tables.values()),
+            "views": self.views,
+            "functions": self.functions,
+            "procedures": self.procedures
+        })
+
+def parse_ddl_stream(chunks, dialect, builder=None):
+    """Parse an iterable of text chunks into a SchemaBuilder, statement by statement"""
+    builder = builder or SchemaBuilder(dialect)
+    for statement in iter_ddl_statements(chunks, dialect):
+        builder.add_statement(statement)
+    return builder
+
+# Parallel (multi-process) parsing
+DDL_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+DDL_STATEMENT_BATCH_SIZE = 2000
+
+def iter_ddl_parse_tasks(files, dialects):
+    """Yield (group, dialect, worker, args): whole files, or statement batches for large files.
+
+    Scripts are grouped by dialect; a JSON/XML schema export (dialect None) is its own group, keyed by file name.
+    """
+    for file, dialect in zip(files, dialects):
+        if dialect is None:
+            yield file.name, None, parse_schema_export_bytes, (file.getvalue(), file.name)
+            continue
+        if file.size < DDL_PARALLEL_MIN_BYTES:
+            yield dialect, dialect, parse_ddl_file_bytes, (file.getvalue(), dialect)
+            continue
+        # Splitting is cheap; statement parsing is what gets spread over the workers
+        batch = []
+        for statement in iter_ddl_statements(iter_upload_text(file), dialect):
+            batch.append(statement)
+            if len(batch) >= DDL_STATEMENT_BATCH_SIZE:
+                yield dialect, dialect, parse_ddl_statement_batch, (batch, dialect)
+                batch = []
+        if batch:
+            yield dialect, dialect, parse_ddl_statement_batch, (batch, dialect)
+
+def parse_pool_context():
+    """Start workers from a clean process, never by forking the multithreaded Streamlit server.
+
+    The workers live in ddl_parser, which imports nothing from the app, so they are cheap to start.
+    """
+    return multiprocessing.get_context("forkserver" if "forkserver" in multiprocessing.get_all_start_methods()
+                                       else "spawn")
+
+def parse_ddl_files_parallel(files, dialects, max_workers, on_task_done=None):
+    """Parse several scripts and schema exports in a process pool.
+
+    Results are merged into one SchemaBuilder per dialect, plus one per export keyed by its file name.
+    """
+    builders = {}
+    completed = 0
+
+    def collect(group, dialect, result):
+        nonlocal completed
+        statements, events = result
+        builder = builders.setdefault(group, SchemaBuilder(dialect))
+        builder.statements += statements
+        for event in events:
+            builder.add(*event)
+        completed += 1
+        if on_task_done:
+            on_task_done(completed)
+
+    tasks = iter_ddl_parse_tasks(files, dialects)
+    if max_workers <= 1:
+        for group, dialect, worker, args in tasks:
+            collect(group, dialect, worker(*args))
+        return builders
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=parse_pool_context()) as executor:
+        # Results are merged in submission order so ALTERs land after their CREATE TABLE,
+        # and only a bounded number of batches is in flight at once
+        in_flight = deque()
+        for group, dialect, worker, args in tasks:
+            in_flight.append((group, dialect, executor.submit(worker, *args)))
+            if len(in_flight) >= max_workers * 2:
+                group, dialect, future = in_flight.popleft()
+                collect(group, dialect, future.result())
+        while in_flight:
+            group, dialect, future = in_flight.popleft()
+            collect(group, dialect, future.result())
+    return builders
+
+# Schema export importers (JSON / XML)
+def import_schema_export(file):
+    """Import an uploaded JSON or XML schema export into (platform, db_data)"""
+    builder = SchemaBuilder(None)
+    for event in iter_schema_export_events(file, file.name):
+        builder.add(*event)
+    return builder.platform, builder.result(file.name, file.size)
+
+def is_schema_export(file):
+    return file.name.lower().endswith((".json", ".xml"))
+
+DDL_PREVIEW_BYTES = 4096
+
+def show_batch_parse(files, parsed_schemas):
+    """Parse all uploaded scripts and schema exports at once in a process pool, one schema per dialect or export"""
+    
+    st.subheader("⚡ Batch Parse")
+    col1, col2 = st.columns(2)
+    with col1:
+        max_workers = st.number_input("Worker processes", min_value=1, max_value=64,
+                                      value=os.cpu_count() or 1, key="batch_parse_workers")
+    with col2:
+        dialect = st.selectbox("SQL Dialect", ["Auto-detect", "PostgreSQL", "Oracle", "SQL Server"],
+                               key="batch_parse_dialect")
+    
+    if st.button(f"⚡ Parse All {len(files)} Files", type="primary", use_container_width=True):
+        if dialect == "Auto-detect":
+            dialects = [None if is_schema_export(f) else detect_ddl_dialect(next(iter_upload_text(f, DDL_PREVIEW_BYTES), ""))
+                        for f in files]
+        else:
+            dialects = [None if is_schema_export(f) else dialect for f in files]
+
+        started_at = time.perf_counter()
+        status = st.empty()
+        try:
+            with st.spinner(f"Parsing {len(files)} files with {int(max_workers)} worker processes..."):
+                builders = parse_ddl_files_parallel(
+                    files, dialects, int(max_workers),
+                    on_task_done=lambda done: status.caption(f"⚙️ {done:,} parse tasks completed")
+                )
+            status.empty()
+            for group, builder in builders.items():
+                if builder.dialect is None:
+                    # Each schema export stays its own schema, under its file name
+                    name = group
+                    db_data = builder.result(name, next(f.size for f in files if f.name == group))
+                    message = f"imported {len(db_data['tables']):,} tables from {group}"
+                    label = f"Schema export: {group}"
+                else:
+                    file_count = dialects.count(group)
+                    name = f"📦 {group} batch ({file_count} files)"
+                    db_data = builder.result(name, sum(f.size for f, d in zip(files, dialects) if d == group))
+                    message = f"parsed {builder.statements:,} statements from {file_count} files"
+                    label = f"DDL batch upload ({file_count} files)"
+                record_extraction_stats(db_data, started_at)
+                parsed_schemas[name] = {"dialect": builder.platform, "db_data": db_data}
+                st.success(f"✅ {builder.platform}: {message}")
+                show_extraction_summary(db_data)
+                save_snapshot_quietly(builder.platform, db_data, label=label)
+        except Exception as e:
+            status.empty()
+            st.error(f"❌ Batch parse failed: {str(e)}")
+
+def show_file_upload_mode(claude_client, include_ai_descriptions, include_diagrams,
+                          include_data_dictionary, include_performance_notes, include_security_analysis):
+    """Show file upload interface for schema files"""
+    
+    st.header("📁 Schema File Upload")
+    st.markdown("**Upload schema files or DDL scripts for documentation generation**")
+    
+    # File upload area
+    uploaded_files = st.file_uploader(
+        "Choose schema files",
+        accept_multiple_files=True,
+        type=['sql', 'ddl', 'json', 'xml', 'txt'],
+        help="Upload DDL scripts, schema exports, or metadata files"
+    )
+    
+    if uploaded_files:
+        st.subheader("📋 Uploaded Files")
+        parsed_schemas = st.session_state.setdefault("parsed_schemas", {})
+        
+        for file in uploaded_files:
+            with st.expander(f"📄 {file.name} ({file.size:,} bytes)"):
+                # Show file preview
+                if file.name.endswith(('.sql', '.ddl', '.txt')):
+                    preview = next(iter_upload_text(file, DDL_PREVIEW_BYTES), "")
+                    st.code(preview[:1000] + "..." if file.size > 1000 else preview, language="sql")
+                    
+                    dialect = st.selectbox("SQL Dialect", ["Auto-detect", "PostgreSQL", "Oracle", "SQL Server"],
+                                           key=f"dialect_{file.name}")
+                    if dialect == "Auto-detect":
+                        dialect = detect_ddl_dialect(preview)
+                        st.caption(f"Detected dialect: {dialect}")
+                    
+                    if st.button(f"📊 Parse {file.name}", key=f"parse_{file.name}"):
+                        started_at = time.perf_counter()
+                        progress = st.progress(0.0, text=f"Parsing {file.name}...")
+                        
+                        def tracked_chunks():
+                            for chunk in iter_upload_text(file):
+                                progress.progress(min(file.tell() / max(file.size, 1), 1.0),
+                                                  text=f"Parsing {file.name}... {file.tell():,} / {file.size:,} bytes")
+                                yield chunk
+                        
+                        try:
+                            builder = parse_ddl_stream(tracked_chunks(), dialect)
+                            db_data = builder.result(file.name, file.size)
+                            record_extraction_stats(db_data, started_at)
+                            parsed_schemas[file.name] = {"dialect": dialect, "db_data": db_data}
+                            progress.empty()
+                            st.success(f"✅ Successfully parsed {builder.statements:,} statements from {file.name}")
+                            if builder.pending:
+                                st.warning(f"⚠️ {len(builder.pending):,} tables were altered or indexed "
+                                           f"but never created in this script")
+                            show_extraction_summary(db_data)
+                            save_snapshot_quietly(dialect, db_data, label=f"DDL upload: {file.name}")
+                        except Exception as e:
+                            progress.empty()
+                            st.error(f"❌ Failed to parse {file.name}: {str(e)}")
+                
+                elif is_schema_export(file):
+                    preview = next(iter_upload_text(file, DDL_PREVIEW_BYTES), "")
+                    st.code(preview[:1000] + "..." if file.size > 1000 else preview,
+                            language="xml" if file.name.lower().endswith(".xml") else "json")
+                    
+                    if st.button(f"📥 Import {file.name}", key=f"import_{file.name}"):
+                        started_at = time.perf_counter()
+                        try:
+                            with st.spinner(f"Importing {file.name}..."):
+                                platform, db_data = import_schema_export(file)
+                            record_extraction_stats(db_data, started_at)
+                            parsed_schemas[file.name] = {"dialect": platform, "db_data": db_data}
+                            st.success(f"✅ Successfully imported {len(db_data['tables']):,} tables from {file.name}")
+                            show_extraction_summary(db_data)
+                            save_snapshot_quietly(platform, db_data, label=f"Schema export: {file.name}")
+                        except (ValueError, ET.ParseError) as e:
+                            st.error(f"❌ {file.name} is not a valid schema export: {str(e)}")
+                        except Exception as e:
+                            st.error(f"❌ Failed to import {file.name}: {str(e)}")
+        
+        batch_files = [f for f in uploaded_files if f.name.endswith(('.sql', '.ddl', '.txt')) or is_schema_export(f)]
+        if len(batch_files) > 1 or any(f.size >= DDL_PARALLEL_MIN_BYTES for f in batch_files):
+            show_batch_parse(batch_files, parsed_schemas)
+        
+        parsed_files = [name for name in parsed_schemas
+                        if name in {f.name for f in uploaded_files} or name.startswith("📦")]
+        if parsed_files:
+            st.markdown("---")
+            file_name = st.selectbox("📖 Document parsed file", parsed_files, key="parsed_file")
+            parsed = parsed_schemas[file_name]
+            show_database_documentation(parsed["dialect"], parsed["db_data"], claude_client, include_ai_descriptions,
+                                        include_diagrams, include_data_dictionary, include_performance_notes,
+                                        include_security_analysis)
+
+# Cross-dialect data types
+CanonicalType = namedtuple("CanonicalType", "kind size scale unicode fixed timezone identity text")
+CanonicalType.__doc__ = """Dialect-neutral column type.
+
+size is the length for strings/binary (None = unbounded), the digit count for integers and decimals,
+the mantissa bits for floats and the fractional-second digits for times and timestamps.
+"""
+
+# base type -> (kind, defaults); dialect entries override the shared ones
+DATA_TYPE_ALIASES = {
+    None: {
+        "TINYINT": ("integer", {"size": 3}),
+        "SMALLINT": ("integer", {"size": 5}), "INT2": ("integer", {"size": 5}),
+        "INTEGER": ("integer", {"size": 10}), "INT": ("integer", {"size": 10}), "INT4": ("integer", {"size": 10}),
+        "BIGINT": ("integer", {"size": 19}), "INT8": ("integer", {"size": 19}),
+        "SMALLSERIAL": ("integer", {"size": 5, "identity": True}),
+        "SERIAL": ("integer", {"size": 10, "identity": True}),
+        "BIGSERIAL": ("integer", {"size": 19, "identity": True}),
+        "DECIMAL": ("decimal", {}), "NUMERIC": ("decimal", {}), "DEC": ("decimal", {}), "NUMBER": ("decimal", {}),
+        "MONEY": ("decimal", {"size": 19, "scale": 4}), "SMALLMONEY": ("decimal", {"size": 10, "scale": 4}),
+        "REAL": ("float", {"size": 24}), "FLOAT4": ("float", {"size": 24}), "BINARY_FLOAT": ("float", {"size": 24}),
+        "FLOAT": ("float", {"size": 53}), "FLOAT8": ("float", {"size": 53}), "DOUBLE PRECISION": ("float", {"size": 53}),
+        "BINARY_DOUBLE": ("float", {"size": 53}),
+        "BOOLEAN": ("boolean", {}), "BOOL": ("boolean", {}), "BIT": ("boolean", {}),
+        "VARCHAR": ("string", {}), "CHARACTER VARYING": ("string", {}), "VARCHAR2": ("string", {}),
+        "NVARCHAR": ("string", {}), "NVARCHAR2": ("string", {}), "NATIONAL CHARACTER VARYING": ("string", {}),
+        "CHAR": ("string", {"fixed": True, "size": 1}), "CHARACTER": ("string", {"fixed": True, "size": 1}),
+        "BPCHAR": ("string", {"fixed": True, "size": 1}), "NCHAR": ("string", {"fixed": True, "size": 1}),
+        "TEXT": ("string", {}), "CITEXT": ("string", {}), "NTEXT": ("string", {}), "CLOB": ("string", {}),
+        "NCLOB": ("string", {}), "LONG": ("string", {}),
+        "BYTEA": ("binary", {}), "BLOB": ("binary", {}), "IMAGE": ("binary", {}), "LONG RAW": ("binary", {}),
+        "VARBINARY": ("binary", {}), "RAW": ("binary", {}), "BINARY": ("binary", {"fixed": True, "size": 1}),
+        "ROWVERSION": ("binary", {"fixed": True, "size": 8}),
+        "DATE": ("date", {}),
+        "TIME": ("time", {"size": 6}), "TIME WITHOUT TIME ZONE": ("time", {"size": 6}),
+        "TIMETZ": ("time", {"size": 6, "timezone": True}), "TIME WITH TIME ZONE": ("time", {"size": 6, "timezone": True}),
+        "TIMESTAMP": ("timestamp", {"size": 6}), "TIMESTAMP WITHOUT TIME ZONE": ("timestamp", {"size": 6}),
+        "TIMESTAMPTZ": ("timestamp", {"size": 6, "timezone": True}),
+        "TIMESTAMP WITH TIME ZONE": ("timestamp", {"size": 6, "timezone": True}),
+        "TIMESTAMP WITH LOCAL TIME ZONE": ("timestamp", {"size": 6, "timezone": True}),
+        "DATETIME": ("timestamp", {"size": 3}), "SMALLDATETIME": ("timestamp", {"size": 0}),
+        "DATETIME2": ("timestamp", {"size": 7}), "DATETIMEOFFSET": ("timestamp", {"size": 7, "timezone": True}),
+        "INTERVAL": ("interval", {}),
+        "JSON": ("json", {}), "JSONB": ("json", {}),
+        "UUID": ("uuid", {}), "UNIQUEIDENTIFIER": ("uuid", {}),
+        "XML": ("xml", {}), "XMLTYPE": ("xml", {})
+    },
+    # Oracle DATE carries a time of day; SQL Server TIME defaults to 7 fractional digits and its
+    # TIMESTAMP is a row version, not a date/time
+    "Oracle": {"DATE": ("timestamp", {"size": 0})},
+    "SQL Server": {"TIME": ("time", {"size": 7}), "TIMESTAMP": ("binary", {"fixed": True, "size": 8})}
+}
+# Character types that are not Unicode: every string in PostgreSQL and Oracle (AL32UTF8) databases is
+NON_UNICODE_STRING_TYPES = {"SQL Server": {"VARCHAR", "CHAR", "CHARACTER", "CHARACTER VARYING", "TEXT"}}
+DATA_TYPE_TEXT = re.compile(r"^(?P<base>[A-Z_][A-Z0-9_ ]*?)\s*(?:\((?P<args>[^)]*)\))?(?:\s+(?P<suffix>[A-Z][A-Z ]*))?$")
+DATA_TYPE_IDENTITY = re.compile(r"\s+IDENTITY\s*(?:\(\s*-?\d+\s*,\s*-?\d+\s*\))?", re.I)
+DATA_TYPE_NUMBER = re.compile(r"-?\d+|\*|MAX", re.I)
+TYPE_COMPATIBILITY_LABELS = {
+    "compatible": "🟢 Compatible",
+    "identity": "🟡 Different approaches",
+    "representation": "🟡 Different implementations",
+    "precision": "🟡 Precision differences",
+    "conversion": "🔴 Requires conversion"
+}
+NUMERIC_TYPE_KINDS = {"integer", "decimal", "float"}
+
+@lru_cache(maxsize=8192)
+def parse_data_type(type_text, dialect=None):
+    """Parse a dialect type string (VARCHAR2(100), NVARCHAR(MAX), INT IDENTITY(1,1), ...) into a CanonicalType"""
+    text = normalize_ddl_type(type_text or "")
+    identity = bool(DATA_TYPE_IDENTITY.search(text))
+    if identity:
+        text = DATA_TYPE_IDENTITY.sub("", text)
+    match = DATA_TYPE_TEXT.match(text)
+    if not match:
+        kind = "interval" if text.startswith("INTERVAL") else "other"
+        return CanonicalType(kind, None, None, True, False, False, identity, text)
+    base, suffix = match.group("base"), match.group("suffix")
+    args = [a.upper() for a in DATA_TYPE_NUMBER.findall(match.group("args") or "")]
+    aliases = DATA_TYPE_ALIASES.get(dialect, {})
+    name = f"{base} {suffix}" if suffix else base
+    entry = aliases.get(name) or DATA_TYPE_ALIASES[None].get(name)
+    if entry is None:
+        entry = aliases.get(base) or DATA_TYPE_ALIASES[None].get(base)
+    if entry is None:
+        return CanonicalType("other", None, None, True, False, False, identity, text)
+
+    kind, defaults = entry
+    size, scale = defaults.get("size"), defaults.get("scale")
+    if args and args[0] not in ("*", "MAX"):
+        size = int(args[0])
+    elif args and args[0] == "MAX":
+        size = None
+    elif args and args[0] == "*":
+        size = 38
+    if len(args) > 1:
+        scale = int(args[1])
+    if kind == "decimal" and dialect == "Oracle" and base == "NUMBER" and args and not scale:
+        # NUMBER(p) / NUMBER(p,0) is how Oracle spells an integer
+        kind, scale = "integer", None
+    elif kind == "float" and args:
+        size = 24 if size <= 24 else 53
+    elif kind == "decimal" and size is not None and scale is None:
+        scale = 0
+    unicode = kind == "string" and base not in NON_UNICODE_STRING_TYPES.get(dialect, ())
+    return CanonicalType(kind, size, scale, unicode, defaults.get("fixed", False),
+                         defaults.get("timezone", False), identity or defaults.get("identity", False), text)
+
+def render_postgres_type(t):
+    if t.kind == "integer":
+        names = ("SMALLSERIAL", "SERIAL", "BIGSERIAL") if t.identity else ("SMALLINT", "INTEGER", "BIGINT")
+        if t.size is not None and t.size > 19:
+            return f"NUMERIC({t.size})"
+        return names[0] if (t.size or 10) <= 5 else names[1] if (t.size or 10) <= 10 else names[2]
+    if t.kind == "decimal":
+        return f"NUMERIC({t.size},{t.scale or 0})" if t.size is not None else "NUMERIC"
+    if t.kind == "float":
+        return "REAL" if t.size == 24 else "DOUBLE PRECISION"
+    if t.kind == "string":
+        if t.size is None:
+            return "TEXT"
+        return f"CHAR({t.size})" if t.fixed else f"VARCHAR({t.size})"
+    if t.kind in ("time", "timestamp"):
+        name = t.kind.upper() + (f"({t.size})" if t.size is not None and t.size < 6 else "")
+        return name + (" WITH TIME ZONE" if t.timezone else "")
+    return {"boolean": "BOOLEAN", "binary": "BYTEA", "date": "DATE", "interval": "INTERVAL", "json": "JSONB",
+            "uuid": "UUID", "xml": "XML"}.get(t.kind, t.text)
+
+def render_oracle_type(t):
+    if t.kind == "integer":
+        return f"NUMBER({t.size or 10})" + (" GENERATED BY DEFAULT AS IDENTITY" if t.identity else "")
+    if t.kind == "decimal":
+        return f"NUMBER({t.size},{t.scale or 0})" if t.size is not None else "NUMBER"
+    if t.kind == "float":
+        return "BINARY_FLOAT" if t.size == 24 else "BINARY_DOUBLE"
+    if t.kind == "string":
+        if t.size is None or t.size > 4000:
+            return "CLOB"
+        return f"CHAR({t.size})" if t.fixed else f"VARCHAR2({t.size})"
+    if t.kind == "binary":
+        return "BLOB" if t.size is None or t.size > 2000 else f"RAW({t.size})"
+    if t.kind == "time":
+        return f"INTERVAL DAY(0) TO SECOND({min(t.size if t.size is not None else 6, 9)})"
+    if t.kind == "timestamp":
+        if t.size == 0 and not t.timezone:
+            return "DATE"
+        size = min(t.size if t.size is not None else 6, 9)
+        return ("TIMESTAMP" if size == 6 else f"TIMESTAMP({size})") + (" WITH TIME ZONE" if t.timezone else "")
+    return {"boolean": "NUMBER(1)", "date": "DATE", "interval": "INTERVAL DAY TO SECOND", "json": "CLOB",
+            "uuid": "RAW(16)", "xml": "XMLTYPE"}.get(t.kind, t.text)
+
+def render_sqlserver_type(t):
+    if t.kind == "integer":
+        size = t.size or 10
+        name = "SMALLINT" if size <= 5 else "INT" if size <= 10 else "BIGINT" if size <= 19 else f"DECIMAL({size},0)"
+        return name + (" IDENTITY(1,1)" if t.identity else "")
+    if t.kind == "decimal":
+        return f"DECIMAL({min(t.size, 38)},{t.scale or 0})" if t.size is not None else "DECIMAL(38,10)"
+    if t.kind == "float":
+        return "REAL" if t.size == 24 else "FLOAT"
+    if t.kind == "string":
+        prefix = "N" if t.unicode else ""
+        if t.size is None or t.size > (4000 if t.unicode else 8000):
+            return f"{prefix}VARCHAR(MAX)"
+        return f"{prefix}CHAR({t.size})" if t.fixed else f"{prefix}VARCHAR({t.size})"
+    if t.kind == "binary":
+        if t.size is None or t.size > 8000:
+            return "VARBINARY(MAX)"
+        return f"BINARY({t.size})" if t.fixed else f"VARBINARY({t.size})"
+    if t.kind == "time":
+        return "TIME" if t.size in (None, 7) else f"TIME({min(t.size, 7)})"
+    if t.kind == "timestamp":
+        name = "DATETIMEOFFSET" if t.timezone else "DATETIME2"
+        return name if t.size in (None, 7) else f"{name}({min(t.size, 7)})"
+    return {"boolean": "BIT", "date": "DATE", "interval": "NVARCHAR(100)", "json": "NVARCHAR(MAX)",
+            "uuid": "UNIQUEIDENTIFIER", "xml": "XML"}.get(t.kind, t.text)
+
+TYPE_RENDERERS = {"PostgreSQL": render_postgres_type, "Oracle": render_oracle_type, "SQL Server": render_sqlserver_type}
+
+@lru_cache(maxsize=8192)
+def map_data_type(type_text, source_dialect, target_dialect, keep_identity=True):
+    """Translate a column type from one dialect to another (unknown types pass through unchanged).
+
+    keep_identity=False drops SERIAL/IDENTITY, for statements such as ALTER COLUMN that cannot add it.
+    """
+    if target_dialect not in TYPE_RENDERERS:
+        return type_text
+    canonical = parse_data_type(type_text, source_dialect)
+    if canonical.identity and not keep_identity:
+        canonical = canonical._replace(identity=False)
+    elif source_dialect == target_dialect:
+        return type_text
+    return TYPE_RENDERERS[target_dialect](canonical)
+
+@lru_cache(maxsize=16384)
+def compare_data_types(source_type, source_dialect, target_type, target_dialect):
+    """Classify how two column types relate; the result is a TYPE_COMPATIBILITY_LABELS key"""
+    source = parse_data_type(source_type, source_dialect)
+    target = parse_data_type(target_type, target_dialect)
+    if source.kind == "other" or target.kind == "other":
+        return "compatible" if source.text == target.text else "conversion"
+    if source[:6] == target[:6]:
+        return "compatible" if source.identity == target.identity else "identity"
+    if source.kind == target.kind or {source.kind, target.kind} <= NUMERIC_TYPE_KINDS \
+            or {source.kind, target.kind} == {"date", "timestamp"}:
+        return "precision"
+    if {source.kind, target.kind} in ({"boolean", "integer"}, {"uuid", "binary"}, {"uuid", "string"}):
+        return "representation"
+    return "conversion"
+
+# Schema diff engine
+DIFF_OBJECT_TYPES = ("table", "column", "index", "constraint", "view", "routine")
+DIFF_STATUS_LABELS = {
+    "identical": "🟢 Identical",
+    "changed": "🟡 Changed",
+    "only_in_source": "🔴 Missing in target",
+    "only_in_target": "🔵 Only in target"
+}
+LOOSE_NAME_CHARS = re.compile(r"[^0-9a-z]+")
+
+def strict_name_key(name):
+    """Case-insensitive name key"""
+    return (name or "").casefold()
+
+def loose_name_key(name):
+    """Naming-convention-insensitive key: customer_id, CUSTOMER_ID and CustomerID all match"""
+    return LOOSE_NAME_CHARS.sub("", (name or "").casefold())
+
+def qualified_object_name(record, name_field):
+    return f"{record['schema']}.{record[name_field]}" if record.get("schema") else record[name_field]
+
+# Fuzzy name matching
+NAME_TOKEN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+NAME_PREFIXES = frozenset({"tbl", "tb", "t", "vw", "v", "col", "fld"})
+FUZZY_JOIN_SCORE = 0.8
+NameMatch = namedtuple("NameMatch", "source target score")
+
+def singular_token(token):
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+@lru_cache(maxsize=131072)
+def name_tokens(name):
+    """Singular lowercase words of an identifier, split on snake_case and camelCase, without a tbl_/vw_-style prefix"""
+    tokens = [token.lower() for token in NAME_TOKEN.findall(name or "")]
+    if len(tokens) > 1 and tokens[0] in NAME_PREFIXES:
+        del tokens[0]
+    return tuple(singular_token(token) for token in tokens)
+
+@lru_cache(maxsize=131072)
+def name_bigrams(key):
+    return frozenset(key[i:i + 2] for i in range(len(key) - 1)) or frozenset((key,))
+
+def name_similarity(source_tokens, target_tokens):
+    """Score two tokenized names: 1.0 for the same words, otherwise character bigram overlap (Dice) blended with shared words"""
+    source_key, target_key = "".join(source_tokens), "".join(target_tokens)
+    if source_key == target_key:
+        return 1.0
+    source_bigrams, target_bigrams = name_bigrams(source_key), name_bigrams(target_key)
+    dice = 2 * len(source_bigrams & target_bigrams) / (len(source_bigrams) + len(target_bigrams))
+    source_words, target_words = set(source_tokens), set(target_tokens)
+    shared = len(source_words & target_words) / len(source_words | target_words)
+    return 0.6 * dice + 0.4 * shared
+
+def name_match_score(source_name, target_name):
+    """Confidence that two identifiers name the same thing (1.0 when only case and separators differ)"""
+    if loose_name_key(source_name) == loose_name_key(target_name):
+        return 1.0
+    return round(0.95 * name_similarity(name_tokens(source_name), name_tokens(target_name)), 3)
+
+def name_blocking_keys(tokens):
+    """Blocks a tokenized name falls in: each word of three or more letters plus the first four characters"""
+    key = "".join(tokens)
+    return {token for token in tokens if len(token) >= 3} | ({key[:4]} if key else set())
+
+def fuzzy_match(source_items, target_items, name, min_score=0.6, max_candidates=8, max_block=256):
+    """Rank one-to-one matches between two lists of named items, scoring only plausible candidates.
+
+    Items whose normalized names are equal pair up first. The rest are grouped by blocking keys (shared
+    words and name prefixes; blocks larger than max_block are too common to be informative), each
+    source is scored against the max_candidates targets it shares most blocks with, and pairs are
+    assigned greedily from the highest score down. Returns NameMatch(source, target, score) tuples,
+    best first.
+    """
+    source_tokens = [name_tokens(name(item)) for item in source_items]
+    target_tokens = [name_tokens(name(item)) for item in target_items]
+    same_words = {}
+    for j in range(len(target_items) - 1, -1, -1):
+        if target_tokens[j]:
+            same_words.setdefault(target_tokens[j], []).append(j)
+    matches, scored, leftover = [], [], []
+    used_targets = set()
+    for i, tokens in enumerate(source_tokens):
+        bucket = same_words.get(tokens)
+        if bucket:
+            j = bucket.pop()
+            used_targets.add(j)
+            matches.append(NameMatch(source_items[i], target_items[j],
+                                     name_match_score(name(source_items[i]), name(target_items[j]))))
+        elif tokens:
+            leftover.append(i)
+
+    if leftover and len(used_targets) < len(target_items):
+        blocks = {}
+        for j, tokens in enumerate(target_tokens):
+            if j not in used_targets:
+                for key in name_blocking_keys(tokens):
+                    blocks.setdefault(key, []).append(j)
+        for i in leftover:
+            tokens = source_tokens[i]
+            hits = Counter()
+            for key in name_blocking_keys(tokens):
+                block = blocks.get(key)
+                if block and len(block) <= max_block:
+                    hits.update(block)
+            for j, _ in hits.most_common(max_candidates):
+                score = round(0.95 * name_similarity(tokens, target_tokens[j]), 3)
+                if score >= min_score:
+                    scored.append((score, i, j))
+
+    scored.sort(key=lambda candidate: -candidate[0])
+    used_sources = set()
+    for score, i, j in scored:
+        if i not in used_sources and j not in used_targets:
+            used_sources.add(i)
+            used_targets.add(j)
+            matches.append(NameMatch(source_items[i], target_items[j], score))
+    matches.sort(key=lambda match: -match.score)
+    return matches
+
+def hash_join(source_items, target_items, keys, fuzzy=None):
+    """Pair source and target items with equal keys, trying each key function on what is still unmatched.
+
+    Every pass builds one hash table over the target side, so matching stays linear in the number of
+    objects. Items whose key is None never match. fuzzy, a name function, adds a last fuzzy_match pass
+    that pairs what remains when the names score at least FUZZY_JOIN_SCORE. Returns (pairs,
+    unmatched_source, unmatched_target).
+    """
+    pairs, passes = [], 0
+    positions = {id(item): i for i, item in enumerate(source_items)} if len(keys) > 1 or fuzzy else None
+    for key in keys:
+        if not source_items or not target_items:
+            break
+        passes += 1
+        buckets = {}
+        for item in reversed(target_items):
+            item_key = key(item)
+            if item_key is not None:
+                buckets.setdefault(item_key, []).append(item)
+        unmatched = []
+        for item in source_items:
+            bucket = buckets.get(key(item))
+            if bucket:
+                pairs.append((item, bucket.pop()))
+            else:
+                unmatched.append(item)
+        matched = {id(target) for _, target in pairs}
+        source_items = unmatched
+        target_items = [item for item in target_items if id(item) not in matched]
+    if fuzzy is not None and source_items and target_items:
+        passes += 1
+        fuzzy_pairs = [(match.source, match.target)
+                       for match in fuzzy_match(source_items, target_items, fuzzy, FUZZY_JOIN_SCORE)]
+        if fuzzy_pairs:
+            pairs.extend(fuzzy_pairs)
+            matched_source = {id(source) for source, _ in fuzzy_pairs}
+            matched_target = {id(target) for _, target in fuzzy_pairs}
+            source_items = [item for item in source_items if id(item) not in matched_source]
+            target_items = [item for item in target_items if id(item) not in matched_target]
+    if passes > 1:
+        pairs.sort(key=lambda pair: positions[id(pair[0])])
+    return pairs, source_items, target_items
+
+def comparable_columns(columns):
+    return tuple(loose_name_key(c) for c in columns or ())
+
+def comparable_text(text):
+    return WHITESPACE_RUN.sub(" ", str(text or "")).strip().casefold()
+
+class SchemaDiff:
+    """Structured differences between a source and a target schema.
+
+    Each record has object_type, name, target_name, status (a DIFF_STATUS_LABELS key) and changes,
+    a list of (property, source value, target value), plus the matched source/target objects and, for
+    columns, indexes and constraints, the (source table, target table) parent pair. counts tallies every
+    (object_type, status), including identical objects that were not kept as records. table_map and
+    column_map record how matched source names translate to the target.
+    """
+
+    def __init__(self, include_identical=True):
+        self.include_identical = include_identical
+        self.records = []
+        self.counts = Counter()
+        self.table_map = {}
+        self.column_map = {}
+
+    def add(self, object_type, name, target_name, status, changes=(), source=None, target=None, parent=None):
+        self.counts[object_type, status] += 1
+        if status != "identical" or self.include_identical:
+            self.records.append({"object_type": object_type, "name": name, "target_name": target_name,
+                                 "status": status, "changes": list(changes),
+                                 "source": source, "target": target, "parent": parent})
+
+    def total(self, object_type, statuses=tuple(DIFF_STATUS_LABELS)):
+        return sum(self.counts[object_type, status] for status in statuses)
+
+    def compatibility_score(self):
+        """Share of source objects that exist unchanged in the target"""
+        present = sum(n for (_, status), n in self.counts.items() if status != "only_in_target")
+        identical = sum(n for (_, status), n in self.counts.items() if status == "identical")
+        return identical / present * 100 if present else 100.0
+
+    def to_frame(self):
+        return pd.DataFrame([{
+            "Object": r["object_type"].title(),
+            "Name": r["name"],
+            "Target Name": r["target_name"] or "",
+            "Status": DIFF_STATUS_LABELS[r["status"]],
+            "Changes": "; ".join(f"{prop}: {src} → {tgt}" for prop, src, tgt in r["changes"])
+        } for r in self.records])
+
+def diff_schemas(source, target, object_types=DIFF_OBJECT_TYPES, include_identical=True,
+                 source_platform=None, target_platform=None):
+    """Match tables, columns, indexes, constraints, views and routines with hash joins on normalized names.
+
+    Tables, columns and views left over after the exact passes are paired by fuzzy_match, so tbl_customer
+    still lines up with Customers.
+
+    Column types are compared through the data type engine, so VARCHAR2(50) and NVARCHAR(50) match.
+    Properties whose spelling is platform-specific (defaults, index types, view and check definitions,
+    routine signatures) are only compared when both schemas come from the same platform.
+    """
+    object_types = set(object_types)
+    same_platform = source_platform == target_platform
+    diff = SchemaDiff(include_identical)
+
+    def report_unmatched(object_type, prefix, unmatched_source, unmatched_target, name_field, parent):
+        for record in unmatched_source:
+            diff.add(object_type, prefix + record[name_field], None, "only_in_source", source=record, parent=parent)
+        for record in unmatched_target:
+            diff.add(object_type, prefix + record[name_field], record[name_field], "only_in_target",
+                     target=record, parent=parent)
+
+    table_pairs, source_only, target_only = hash_join(
+        source.get("tables", []), target.get("tables", []),
+        (lambda t: (strict_name_key(t.get("schema")), strict_name_key(t["table_name"])),
+         lambda t: strict_name_key(t["table_name"]),
+         lambda t: loose_name_key(t["table_name"])),
+        fuzzy=lambda t: t["table_name"])
+    if "table" in object_types:
+        for table in source_only:
+            diff.add("table", qualified_object_name(table, "table_name"), None, "only_in_source", source=table)
+        for table in target_only:
+            diff.add("table", qualified_object_name(table, "table_name"), qualified_object_name(table, "table_name"),
+                     "only_in_target", target=table)
+
+    for source_table, target_table in table_pairs:
+        table_name = qualified_object_name(source_table, "table_name")
+        prefix = f"{table_name}."
+        parent = (source_table, target_table)
+        diff.table_map[source_table.get("schema") or "", source_table["table_name"]] = target_table
+        source_columns = source_table.get("columns") or []
+        target_columns = target_table.get("columns") or []
+
+        if "table" in object_types:
+            changes = []
+            if len(source_columns) != len(target_columns):
+                changes.append(("columns", len(source_columns), len(target_columns)))
+            if same_platform and source_table.get("table_type") != target_table.get("table_type"):
+                changes.append(("table_type", source_table.get("table_type"), target_table.get("table_type")))
+            diff.add("table", table_name, qualified_object_name(target_table, "table_name"),
+                     "changed" if changes else "identical", changes, source_table, target_table)
+
+        if "column" in object_types:
+            pairs, only_source, only_target = hash_join(
+                source_columns, target_columns,
+                (lambda c: strict_name_key(c["column_name"]), lambda c: loose_name_key(c["column_name"])),
+                fuzzy=lambda c: c["column_name"])
+            renamed = {s["column_name"]: t["column_name"] for s, t in pairs if s["column_name"] != t["column_name"]}
+            if renamed:
+                diff.column_map[source_table.get("schema") or "", source_table["table_name"]] = renamed
+            for source_column, target_column in pairs:
+                changes = []
+                source_type, target_type = source_column.get("data_type"), target_column.get("data_type")
+                if source_type != target_type or not same_platform:
+                    verdict = compare_data_types(source_type or "", source_platform, target_type or "", target_platform)
+                    if verdict != "compatible":
+                        note = TYPE_COMPATIBILITY_LABELS[verdict].split(" ", 1)[1].lower()
+                        changes.append((f"data_type ({note})", source_type, target_type))
+                if bool(source_column.get("is_nullable")) != bool(target_column.get("is_nullable")):
+                    changes.append(("nullable", source_column.get("is_nullable"), target_column.get("is_nullable")))
+                source_default, target_default = source_column.get("default"), target_column.get("default")
+                if same_platform and source_default != target_default and \
+                        comparable_text(source_default) != comparable_text(target_default):
+                    changes.append(("default", source_default, target_default))
+                diff.add("column", prefix + source_column["column_name"], target_column["column_name"],
+                         "changed" if changes else "identical", changes, source_column, target_column, parent)
+            report_unmatched("column", prefix, only_source, only_target, "column_name", parent)
+
+        if "index" in object_types:
+            pairs, only_source, only_target = hash_join(
+                source_table.get("indexes") or [], target_table.get("indexes") or [],
+                (lambda i: strict_name_key(i["index_name"]),
+                 lambda i: (bool(i.get("is_unique")), comparable_columns(i.get("columns")))))
+            for source_index, target_index in pairs:
+                changes = []
+                if comparable_columns(source_index.get("columns")) != comparable_columns(target_index.get("columns")):
+                    changes.append(("columns", ", ".join(source_index.get("columns") or []),
+                                    ", ".join(target_index.get("columns") or [])))
+                if bool(source_index.get("is_unique")) != bool(target_index.get("is_unique")):
+                    changes.append(("unique", source_index.get("is_unique"), target_index.get("is_unique")))
+                if same_platform and source_index.get("index_type") != target_index.get("index_type"):
+                    changes.append(("index_type", source_index.get("index_type"), target_index.get("index_type")))
+                diff.add("index", prefix + source_index["index_name"], target_index["index_name"],
+                         "changed" if changes else "identical", changes, source_index, target_index, parent)
+            report_unmatched("index", prefix, only_source, only_target, "index_name", parent)
+
+        if "constraint" in object_types:
+            pairs, only_source, only_target = hash_join(
+                source_table.get("constraints") or [], target_table.get("constraints") or [],
+                (lambda c: strict_name_key(c["constraint_name"]),
+                 lambda c: (c.get("constraint_type"), comparable_columns(c.get("columns")))
+                           if c.get("columns") else None))
+            for source_constraint, target_constraint in pairs:
+                changes = []
+                for prop in ("constraint_type", "columns"):
+                    source_value, target_value = source_constraint.get(prop), target_constraint.get(prop)
+                    if (comparable_columns(source_value) != comparable_columns(target_value) if prop == "columns"
+                            else source_value != target_value):
+                        changes.append((prop, source_value, target_value))
+                source_ref = split_reference_target(source_constraint.get("references"))
+                target_ref = split_reference_target(target_constraint.get("references"))
+                if (loose_name_key(source_ref[1]), comparable_columns(source_ref[2])) != \
+                        (loose_name_key(target_ref[1]), comparable_columns(target_ref[2])):
+                    changes.append(("references", source_constraint.get("references"), target_constraint.get("references")))
+                if same_platform and comparable_text(source_constraint.get("definition")) != \
+                        comparable_text(target_constraint.get("definition")):
+                    changes.append(("definition", source_constraint.get("definition"), target_constraint.get("definition")))
+                diff.add("constraint", prefix + source_constraint["constraint_name"], target_constraint["constraint_name"],
+                         "changed" if changes else "identical", changes, source_constraint, target_constraint, parent)
+            report_unmatched("constraint", prefix, only_source, only_target, "constraint_name", parent)
+
+    if "view" in object_types:
+        pairs, only_source, only_target = hash_join(
+            source.get("views", []), target.get("views", []),
+            (lambda v: (strict_name_key(v.get("schema")), strict_name_key(v["view_name"])),
+             lambda v: strict_name_key(v["view_name"]),
+             lambda v: loose_name_key(v["view_name"])),
+            fuzzy=lambda v: v["view_name"])
+        for source_view, target_view in pairs:
+            changes = []
+            if same_platform and comparable_text(source_view.get("definition")) != comparable_text(target_view.get("definition")):
+                changes.append(("definition", "…", "…"))
+            diff.add("view", qualified_object_name(source_view, "view_name"), qualified_object_name(target_view, "view_name"),
+                     "changed" if changes else "identical", changes, source_view, target_view)
+        for view in only_source:
+            diff.add("view", qualified_object_name(view, "view_name"), None, "only_in_source", source=view)
+        for view in only_target:
+            diff.add("view", qualified_object_name(view, "view_name"), qualified_object_name(view, "view_name"),
+                     "only_in_target", target=view)
+
+    if "routine" in object_types:
+        def routines(db_data):
+            return [(r, "function_name") for r in db_data.get("functions", [])] + \
+                   [(r, "procedure_name") for r in db_data.get("procedures", [])]
+
+        def routine_name(item):
+            routine, name_field = item
+            return qualified_object_name(routine, name_field)
+
+        pairs, only_source, only_target = hash_join(
+            routines(source), routines(target),
+            (lambda r: (strict_name_key(r[0].get("schema")), strict_name_key(r[0][r[1]])),
+             lambda r: strict_name_key(r[0][r[1]]),
+             lambda r: loose_name_key(r[0][r[1]])))
+        for (source_routine, source_field), (target_routine, target_field) in pairs:
+            changes = []
+            if same_platform:
+                if source_field != target_field:
+                    changes.append(("kind", source_field.split("_")[0], target_field.split("_")[0]))
+                for prop in ("parameters", "return_type"):
+                    if comparable_text(source_routine.get(prop)) != comparable_text(target_routine.get(prop)):
+                        changes.append((prop, source_routine.get(prop), target_routine.get(prop)))
+            diff.add("routine", routine_name((source_routine, source_field)), routine_name((target_routine, target_field)),
+                     "changed" if changes else "identical", changes, source_routine, target_routine)
+        for item in only_source:
+            diff.add("routine", routine_name(item), None, "only_in_source", source=item[0])
+        for item in only_target:
+            diff.add("routine", routine_name(item), routine_name(item), "only_in_target", target=item[0])
+
+    return diff
+
+def filter_schema(db_data, schema_name):
+    """Restrict a schema to the objects in one schema/owner (case-insensitive); blank keeps everything"""
+    if not schema_name or not schema_name.strip():
+        return db_data
+    wanted = strict_name_key(schema_name.strip())
+    filtered = {"database_info": db_data.get("database_info", {})}
+    for kind in ("tables", "views", "functions", "procedures"):
+        filtered[kind] = [o for o in db_data.get(kind, []) if strict_name_key(o.get("schema")) == wanted]
+    return filtered
+
+def comparison_schema_sources(platform):
+    """Schemas that can be compared for one platform: sample data, live extraction, parsed uploads, snapshots"""
+    sources = {"🎯 Sample data": lambda: compact_schema(get_sample_schema_data()[platform])}
+    live = st.session_state.get("live_schemas", {}).get(platform)
+    if live:
+        sources["📊 Live connection"] = lambda: live
+    for name, parsed in st.session_state.get("parsed_schemas", {}).items():
+        if parsed["dialect"] == platform:
+            sources[f"📁 {name}"] = lambda db_data=parsed["db_data"]: db_data
+    try:
+        snapshots = get_snapshot_store().list_snapshots(platform)
+    except Exception:
+        snapshots = []
+    for snapshot in snapshots:
+        label = f"💾 Snapshot #{snapshot['database_id']} · {snapshot['name'] or 'N/A'} · {snapshot['captured_at']}"
+        sources[label] = lambda database_id=snapshot["database_id"]: load_snapshot_cached(database_id)
+    return sources
+
+# Migration script generation
+MIGRATION_PLAIN_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_$#]*$")
+MIGRATION_TERMINATORS = {"SQL Server": ";\nGO\n\n"}
+
+@lru_cache(maxsize=65536)
+def quote_sql_identifier(name, dialect):
+    """Quote an identifier for a dialect only when it needs it, so unquoted names fold the platform's way"""
+    if MIGRATION_PLAIN_IDENTIFIER.match(name) or "(" in name:
+        return name
+    if dialect == "SQL Server":
+        return "[" + name.replace("]", "]]") + "]"
+    return '"' + name.replace('"', '""') + '"'
+
+class MigrationPlanner:
+    """Turns a SchemaDiff into target-dialect DDL that makes the target match the source.
+
+    statements() yields DDL in dependency order: new tables (with their keys and checks), changes to
+    existing tables, indexes, foreign keys, views ordered by the views they select from, routine stubs,
+    and finally commented-out drops for objects that only exist in the target.
+    """
+
+    def __init__(self, diff, source_data, source_platform, target_platform, target_schema=None):
+        self.diff = diff
+        self.index = schema_index(source_data)
+        self.source_platform = source_platform
+        self.target_platform = target_platform
+        self.target_schema = (target_schema or "").strip() or None
+        self.same_platform = source_platform == target_platform
+        self.terminator = MIGRATION_TERMINATORS.get(target_platform, ";\n\n")
+
+    def quote(self, name):
+        return quote_sql_identifier(name, self.target_platform)
+
+    def qualified(self, schema, name):
+        return f"{self.quote(schema)}.{self.quote(name)}" if schema else self.quote(name)
+
+    def target_table(self, source_key):
+        """(schema, name) a source table has, or will have, in the target"""
+        target = self.diff.table_map.get(source_key)
+        if target is not None:
+            return target.get("schema") or "", target["table_name"]
+        return self.target_schema or source_key[0], source_key[1]
+
+    def record_schema(self, record):
+        """Target schema a diff record's DDL belongs to"""
+        if record["parent"] is not None:
+            table = record["parent"][1]
+            return table.get("schema") or ""
+        if record["status"] == "only_in_target":
+            return record["target"].get("schema") or ""
+        if record["object_type"] == "table":
+            return self.target_table((record["source"].get("schema") or "", record["source"]["table_name"]))[0]
+        return self.target_schema or record["source"].get("schema") or ""
+
+    def column_names(self, source_key, columns):
+        renamed = self.diff.column_map.get(source_key, {})
+        return ", ".join(self.quote(renamed.get(c, c)) for c in columns or [])
+
+    def column_type(self, column, keep_identity=True):
+        return map_data_type(column.get("data_type") or "", self.source_platform, self.target_platform, keep_identity)
+
+    def column_definition(self, column):
+        definition = f"{self.quote(column['column_name'])} {self.column_type(column)}"
+        default = column.get("default")
+        if default is not None and self.same_platform and not parse_data_type(
+                column.get("data_type") or "", self.source_platform).identity:
+            definition += f" DEFAULT {default}"
+        return definition + ("" if column.get("is_nullable", True) else " NOT NULL")
+
+    def statement(self, sql):
+        return sql + self.terminator
+
+    def comment(self, text):
+        return "".join(f"-- {line}\n" for line in text.splitlines()) + "\n"
+
+    def constraint_clause(self, constraint, source_key):
+        """Inline/ALTER TABLE clause for a key or check constraint; None if it must be reviewed by hand"""
+        constraint_type = constraint.get("constraint_type")
+        name = f"CONSTRAINT {self.quote(constraint['constraint_name'])} "
+        if constraint_type in ("PRIMARY KEY", "UNIQUE") and constraint.get("columns"):
+            return f"{name}{constraint_type} ({self.column_names(source_key, constraint['columns'])})"
+        if constraint_type == "CHECK" and self.same_platform and constraint.get("definition"):
+            return f"{name}CHECK ({constraint['definition']})"
+        return None
+
+    def foreign_key(self, table_name, constraint, source_key):
+        """(referenced target schema, ALTER TABLE statement) for a foreign key"""
+        ref_schema, ref_table, ref_columns = split_reference_target(constraint.get("references"))
+        ref_key = self.index.table_key(ref_table, ref_schema, prefer_schema=source_key[0]) if ref_table else None
+        if ref_key is None:
+            ref_key = (ref_schema or source_key[0], ref_table or "")
+        target_ref = self.target_table(ref_key)
+        sql = (f"ALTER TABLE {table_name} ADD CONSTRAINT {self.quote(constraint['constraint_name'])} "
+               f"FOREIGN KEY ({self.column_names(source_key, constraint.get('columns'))}) "
+               f"REFERENCES {self.qualified(*target_ref)}")
+        if ref_columns:
+            sql += f" ({self.column_names(ref_key, ref_columns)})"
+        return target_ref[0], self.statement(sql)
+
+    def create_table(self, table):
+        source_key = (table.get("schema") or "", table["table_name"])
+        lines = [self.column_definition(column) for column in table.get("columns") or []]
+        manual = []
+        for constraint in table.get("constraints") or []:
+            if constraint.get("constraint_type") == "FOREIGN KEY":
+                continue
+            clause = self.constraint_clause(constraint, source_key)
+            if clause:
+                lines.append(clause)
+            else:
+                manual.append(constraint)
+        body = ",\n    ".join(lines)
+        sql = self.statement(f"CREATE TABLE {self.qualified(*self.target_table(source_key))} (\n    {body}\n)")
+        for constraint in manual:
+            sql += self.comment(f"Review {constraint.get('constraint_type')} {constraint['constraint_name']} "
+                                f"({self.source_platform}): {constraint.get('definition', '')}")
+        return sql
+
+    def add_column(self, table_name, column):
+        definition = self.column_definition(column)
+        if self.target_platform == "Oracle":
+            return self.statement(f"ALTER TABLE {table_name} ADD ({definition})")
+        keyword = "ADD COLUMN" if self.target_platform == "PostgreSQL" else "ADD"
+        return self.statement(f"ALTER TABLE {table_name} {keyword} {definition}")
+
+    def same_target_type(self, data_type, target_type):
+        """Whether a mapped type is what the target column already has, up to spelling and identity"""
+        render = TYPE_RENDERERS.get(self.target_platform)
+        if render is None:
+            return normalize_ddl_type(data_type) == normalize_ddl_type(target_type)
+        mapped, current = (parse_data_type(t, self.target_platform)._replace(identity=False)
+                           for t in (data_type, target_type))
+        return render(mapped) == render(current)
+
+    def alter_column(self, table_name, column, target_column, changes):
+        name = self.quote(target_column["column_name"])
+        data_type = self.column_type(column, keep_identity=False)
+        nullability = "NULL" if column.get("is_nullable", True) else "NOT NULL"
+        properties = {prop.split(" ")[0] for prop, _, _ in changes}
+        sql = ""
+        # A precision difference can map back to the column's current type; leave that to review
+        type_change = next((change for change in changes if change[0].startswith("data_type")), None)
+        if type_change and self.same_target_type(data_type, target_column.get("data_type") or ""):
+            properties.discard("data_type")
+            sql += self.comment(f"Review {type_change[0]} of {table_name}.{name}: {self.source_platform} "
+                                f"{type_change[1]} maps to {data_type}, the column's current type")
+        if self.target_platform == "PostgreSQL":
+            if "data_type" in properties:
+                sql += self.statement(f"ALTER TABLE {table_name} ALTER COLUMN {name} TYPE {data_type}")
+            if "nullable" in properties:
+                action = "DROP NOT NULL" if column.get("is_nullable", True) else "SET NOT NULL"
+                sql += self.statement(f"ALTER TABLE {table_name} ALTER COLUMN {name} {action}")
+        elif self.target_platform == "Oracle":
+            if properties & {"data_type", "nullable"}:
+                modify = f"{name} {data_type}" if "data_type" in properties else name
+                if "nullable" in properties:
+                    modify += f" {nullability}"
+                sql += self.statement(f"ALTER TABLE {table_name} MODIFY ({modify})")
+        elif properties & {"data_type", "nullable"}:
+            sql += self.statement(f"ALTER TABLE {table_name} ALTER COLUMN {name} {data_type} {nullability}")
+        if "default" in properties:
+            sql += self.comment(f"Review default of {table_name}.{name}: {column.get('default')}")
+        return sql
+
+    def create_index(self, table_name, index, source_key):
+        columns = self.column_names(source_key, index.get("columns"))
+        unique = "UNIQUE " if index.get("is_unique") else ""
+        return self.statement(f"CREATE {unique}INDEX {self.quote(index['index_name'])} ON {table_name} ({columns})")
+
+    def backs_constraint(self, index, table):
+        """Primary key / unique indexes are created by their constraints"""
+        if index.get("index_type") == "PRIMARY KEY":
+            return True
+        names = {strict_name_key(c["constraint_name"]) for c in table.get("constraints") or []}
+        return strict_name_key(index["index_name"]) in names
+
+    def ordered_views(self, views):
+        """Views after the views they select from (Kahn's algorithm; cycles keep their input order)"""
+        by_name = {strict_name_key(v["view_name"]): v for v in views}
+        depends = {}
+        for view in views:
+            tokens = {strict_name_key(unquote_identifier(t)) for t in SQL_IDENTIFIER_RE.findall(view.get("definition") or "")}
+            depends[id(view)] = {by_name[t] for t in tokens & by_name.keys() if by_name[t] is not view}
+        dependents = {id(v): [] for v in views}
+        remaining = {id(v): len(depends[id(v)]) for v in views}
+        for view in views:
+            for dependency in depends[id(view)]:
+                dependents[id(dependency)].append(view)
+        queue = deque(v for v in views if not remaining[id(v)])
+        ordered = []
+        while queue:
+            view = queue.popleft()
+            ordered.append(view)
+            for dependent in dependents[id(view)]:
+                remaining[id(dependent)] -= 1
+                if not remaining[id(dependent)]:
+                    queue.append(dependent)
+        placed = {id(v) for v in ordered}
+        return ordered + [v for v in views if id(v) not in placed]
+
+    def create_view(self, view):
+        name = self.qualified(self.target_schema or view.get("schema") or "", view["view_name"])
+        definition = (view.get("definition") or "").strip().rstrip(";")
+        sql = "" if self.same_platform else self.comment(f"Review: definition written for {self.source_platform}")
+        if definition.upper().startswith("CREATE"):
+            return sql + self.statement(definition)
+        return sql + self.statement(f"CREATE VIEW {name} AS\n{definition}")
+
+    def statements(self, records, deferred=None):
+        """Yield DDL for the given diff records in dependency order.
+
+        Foreign keys that point into another target schema go to ``deferred`` when it is a list, so
+        per-schema scripts can run in any order before the cross-schema constraints are added.
+        """
+        new_tables = [r["source"] for r in records if r["object_type"] == "table" and r["status"] == "only_in_source"]
+        for table in new_tables:
+            yield self.create_table(table)
+
+        for record in records:
+            if record["parent"] is None or record["status"] in ("identical", "only_in_target"):
+                continue
+            source_table, target_table = record["parent"]
+            source_key = (source_table.get("schema") or "", source_table["table_name"])
+            table_name = self.qualified(target_table.get("schema") or "", target_table["table_name"])
+            if record["object_type"] == "column":
+                if record["status"] == "only_in_source":
+                    yield self.add_column(table_name, record["source"])
+                else:
+                    yield self.alter_column(table_name, record["source"], record["target"], record["changes"])
+            elif record["object_type"] == "constraint" and record["status"] == "only_in_source" and \
+                    record["source"].get("constraint_type") != "FOREIGN KEY":
+                clause = self.constraint_clause(record["source"], source_key)
+                if clause:
+                    yield self.statement(f"ALTER TABLE {table_name} ADD {clause}")
+                else:
+                    yield self.comment(f"Review {record['source'].get('constraint_type')} {record['name']} "
+                                       f"({self.source_platform}): {record['source'].get('definition', '')}")
+            elif record["status"] == "changed" and record["object_type"] in ("index", "constraint"):
+                yield self.comment(f"Review changed {record['object_type']} {record['name']}: " + "; ".join(
+                    f"{prop} {src} → {tgt}" for prop, src, tgt in record["changes"]))
+
+        for table in new_tables:
+            source_key = (table.get("schema") or "", table["table_name"])
+            table_name = self.qualified(*self.target_table(source_key))
+            for index in table.get("indexes") or []:
+                if not self.backs_constraint(index, table):
+                    yield self.create_index(table_name, index, source_key)
+        for record in records:
+            if record["object_type"] == "index" and record["status"] == "only_in_source":
+                source_table, target_table = record["parent"]
+                if not self.backs_constraint(record["source"], source_table):
+                    source_key = (source_table.get("schema") or "", source_table["table_name"])
+                    yield self.create_index(self.qualified(target_table.get("schema") or "", target_table["table_name"]),
+                                            record["source"], source_key)
+
+        foreign_keys = [(table, constraint) for table in new_tables for constraint in table.get("constraints") or []
+                        if constraint.get("constraint_type") == "FOREIGN KEY"]
+        foreign_keys += [(record["parent"][0], record["source"]) for record in records
+                         if record["object_type"] == "constraint" and record["status"] == "only_in_source"
+                         and record["source"].get("constraint_type") == "FOREIGN KEY"]
+        for table, constraint in foreign_keys:
+            source_key = (table.get("schema") or "", table["table_name"])
+            schema, table_name = self.target_table(source_key)
+            ref_schema, sql = self.foreign_key(self.qualified(schema, table_name), constraint, source_key)
+            if deferred is not None and ref_schema != schema:
+                deferred.append(sql)
+            else:
+                yield sql
+
+        views = [r["source"] for r in records if r["object_type"] == "view" and r["status"] == "only_in_source"]
+        for view in self.ordered_views(views):
+            yield self.create_view(view)
+
+        for record in records:
+            if record["object_type"] == "routine" and record["status"] == "only_in_source":
+                routine = record["source"]
+                kind = "FUNCTION" if routine.get("function_name") else "PROCEDURE"
+                yield self.comment(f"Port {kind} {record['name']}({routine.get('parameters') or ''}) "
+                                   f"from {self.source_platform} manually")
+
+        for record in records:
+            if record["status"] == "only_in_target" and record["object_type"] in ("table", "view", "column"):
+                if record["object_type"] == "column":
+                    target_table = record["parent"][1]
+                    table_name = self.qualified(target_table.get("schema") or "", target_table["table_name"])
+                    yield self.comment(f"Only in target: ALTER TABLE {table_name} DROP COLUMN "
+                                       f"{self.quote(record['target_name'])};")
+                else:
+                    yield self.comment(f"Only in target: DROP {record['object_type'].upper()} "
+                                       f"{record['target_name']};")
+
+def write_migration_script(diff, source_data, source_platform, target_platform, target_schema=None, per_schema=False):
+    """Stream the migration DDL into a temporary file and return (path, statement count).
+
+    With per_schema the file is a zip holding one script per target schema plus a final script for
+    foreign keys that cross schemas; each entry is written and closed before the next one starts.
+    """
+    planner = MigrationPlanner(diff, source_data, source_platform, target_platform, target_schema)
+    header = planner.comment(f"Migration script: {source_platform} → {target_platform}\n"
+                             f"Generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}; review before running")
+    statements = 0
+    handle = tempfile.NamedTemporaryFile(prefix="schema_migration_", suffix=".zip" if per_schema else ".sql",
+                                         delete=False)
+    with handle:
+        if not per_schema:
+            script = io.TextIOWrapper(handle, encoding="utf-8")
+            script.write(header)
+            for statement in planner.statements(diff.records):
+                script.write(statement)
+                statements += 1
+            script.flush()
+            script.detach()
+        else:
+            groups = {}
+            for record in diff.records:
+                if record["status"] != "identical":
+                    groups.setdefault(planner.record_schema(record), []).append(record)
+            deferred = []
+            with zipfile.ZipFile(handle, "w", zipfile.ZIP_DEFLATED) as archive:
+                for number, schema in enumerate(sorted(groups), 1):
+                    with archive.open(f"{number:03d}_{schema or 'default'}.sql", "w") as entry:
+                        script = io.TextIOWrapper(entry, encoding="utf-8")
+                        script.write(header)
+                        for statement in planner.statements(groups[schema], deferred):
+                            script.write(statement)
+                            statements += 1
+                        script.flush()
+                        script.detach()
+                if deferred:
+                    with archive.open("zzz_cross_schema_foreign_keys.sql", "w") as entry:
+                        script = io.TextIOWrapper(entry, encoding="utf-8")
+                        script.write(header + planner.comment("Run after every schema script"))
+                        for statement in deferred:
+                            script.write(statement)
+                            statements += 1
+                        script.flush()
+                        script.detach()
+    return handle.name, statements
+
+def deferred_file_download(path):
+    """Download-button data callable that reads ``path`` only when the user clicks.
+
+    The callable owns the file: it is deleted once Streamlit drops the callable (on the next
+    rerun or when the session ends), so nothing is read into memory for a script nobody downloads.
+    """
+    def read_file():
+        with open(path, "rb") as file:
+            return file.read()
+
+    weakref.finalize(read_file, os.remove, path)
+    return read_file
+
+def show_cross_platform_comparison():
+    """Show cross-platform comparison interface"""
+    
+    st.header("🔄 Cross-Platform Schema Comparison")
+    st.markdown("**Compare schemas across different database platforms**")
+    
+    # Source and target selection
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("📊 Source Database")
+        source_db = st.selectbox("Source Platform", ["PostgreSQL", "Oracle", "SQL Server"], key="source")
+        source_sources = comparison_schema_sources(source_db)
+        source_origin = st.selectbox("Source Schema Data", list(source_sources), key="source_origin")
+        source_schema = st.text_input("Source Schema/Database", key="source_schema",
+                                      help="Compare only this schema/owner (blank compares everything)")
+    
+    with col2:
+        st.subheader("🎯 Target Database")
+        target_db = st.selectbox("Target Platform", ["PostgreSQL", "Oracle", "SQL Server"], key="target")
+        target_sources = comparison_schema_sources(target_db)
+        target_origin = st.selectbox("Target Schema Data", list(target_sources), key="target_origin")
+        target_schema = st.text_input("Target Schema/Database", key="target_schema",
+                                      help="Compare only this schema/owner (blank compares everything)")
+    
+    # Comparison options
+    st.subheader("🔧 Comparison Options")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        compare_tables = st.checkbox("📋 Compare Tables", value=True)
+        compare_columns = st.checkbox("📝 Compare Columns", value=True)
+        compare_indexes = st.checkbox("🔍 Compare Indexes", value=True)
+    
+    with col2:
+        compare_constraints = st.checkbox("🔒 Compare Constraints", value=True)
+        compare_views = st.checkbox("👁️ Compare Views", value=True)
+        compare_procedures = st.checkbox("⚙️ Compare Procedures", value=True)
+    
+    with col3:
+        show_differences = st.checkbox("🔍 Show Only Differences", value=False)
+        include_migration_script = st.checkbox("📜 Generate Migration Script", value=True)
+        include_mapping_report = st.checkbox("📊 Include Mapping Report", value=True)
+        split_migration_script = st.checkbox("🗂️ One Script per Schema", value=False,
+                                             help="Download the migration as a zip with one script per target schema")
+    
+    # Generate comparison
+    if st.button("🔄 Generate Comparison Report", type="primary", use_container_width=True):
+        if (source_db, source_origin, source_schema) == (target_db, target_origin, target_schema):
+            st.warning("⚠️ Source and target databases are the same!")
+        else:
+            try:
+                source_data = filter_schema(source_sources[source_origin](), source_schema)
+                target_data = filter_schema(target_sources[target_origin](), target_schema)
+            except Exception as e:
+                st.error(f"❌ Could not load schema data: {str(e)}")
+                return
+            generate_comparison_report(source_db, target_db, source_schema, target_schema,
+                                     compare_tables, compare_columns, compare_indexes, 
+                                     compare_constraints, compare_views, compare_procedures,
+                                     show_differences, include_migration_script, include_mapping_report,
+                                     source_data, target_data, split_migration_script)
+
+def generate_comparison_report(source_db, target_db, source_schema, target_schema,
+                             compare_tables, compare_columns, compare_indexes, 
+                             compare_constraints, compare_views, compare_procedures,
+                             show_differences, include_migration_script, include_mapping_report,
+                             source_data, target_data, split_migration_script=False):
+    """Generate cross-platform comparison report"""
+    
+    object_types = [object_type for object_type, enabled in zip(DIFF_OBJECT_TYPES, (
+        compare_tables, compare_columns, compare_indexes, compare_constraints, compare_views, compare_procedures
+    )) if enabled]
+    
+    with st.spinner(f"🔄 Comparing schemas: {source_db} → {target_db}..."):
+        started_at = time.perf_counter()
+        diff = diff_schemas(source_data, target_data, object_types, include_identical=not show_differences,
+                            source_platform=source_db, target_platform=target_db)
+        elapsed = time.perf_counter() - started_at
+    
+    st.markdown(f"""
+    <div class="success-banner">
+        <h4>✅ Comparison Report Generated</h4>
+        <p><strong>Source:</strong> {source_db} ({source_schema or 'all schemas'})</p>
+        <p><strong>Target:</strong> {target_db} ({target_schema or 'all schemas'})</p>
+        <p><strong>Analysis Complete:</strong> {len(diff.records):,} records in {elapsed:.2f}s</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.subheader("📊 Comparison Summary")
+    
+    changed = ("changed", "only_in_source", "only_in_target")
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Tables Compared", f"{diff.total('table'):,}", f"{diff.total('table', changed):,} differences",
+                  delta_color="off")
+    with col2:
+        st.metric("Columns Analyzed", f"{diff.total('column'):,}", f"{diff.total('column', changed):,} differences",
+                  delta_color="off")
+    with col3:
+        st.metric("Indexes Reviewed", f"{diff.total('index'):,}", f"{diff.counts['index', 'only_in_source']:,} missing",
+                  delta_color="off")
+    with col4:
+        st.metric("Compatibility Score", f"{diff.compatibility_score():.0f}%")
+    
+    if not diff.records:
+        st.success("🎉 No differences found for the selected object types")
+        return
+    
+    st.subheader("🔍 Differences" if show_differences else "🔍 Comparison Details")
+    diff_df = diff.to_frame()
+    if len(diff_df) > 5000:
+        st.caption(f"Showing the first 5,000 of {len(diff_df):,} records; download the CSV for all of them")
+    st.dataframe(diff_df.head(5000), use_container_width=True, hide_index=True)
+    st.download_button("📥 Download Differences (CSV)", diff_df.to_csv(index=False),
+                       file_name=f"{source_db.lower()}_vs_{target_db.lower()}_diff.csv".replace(" ", "_"),
+                       mime="text/csv")
+    
+    if include_mapping_report:
+        renamed = [r for r in diff.records if r["target_name"] and r["status"] in ("identical", "changed")
+                   and r["name"].rsplit(".", 1)[-1] != r["target_name"].rsplit(".", 1)[-1]]
+        if renamed:
+            st.subheader("📊 Name Mapping Report")
+            mapping_df = pd.DataFrame([{"Object": r["object_type"].title(), "Source Name": r["name"],
+                                        "Target Name": r["target_name"],
+                                        "Confidence": name_match_score(r["name"].rsplit(".", 1)[-1],
+                                                                       r["target_name"].rsplit(".", 1)[-1])}
+                                       for r in renamed[:5000]])
+            st.dataframe(mapping_df.sort_values("Confidence", ascending=False, kind="stable"),
+                         use_container_width=True, hide_index=True)
+    
+    if include_migration_script:
+        st.subheader("📜 Migration Script")
+        try:
+            with st.spinner(f"📜 Writing {target_db} migration script..."):
+                started_at = time.perf_counter()
+                path, statements = write_migration_script(diff, source_data, source_db, target_db,
+                                                          target_schema, split_migration_script)
+                script_data = deferred_file_download(path)
+                elapsed = time.perf_counter() - started_at
+            size_kb = os.path.getsize(path) / 1024
+            st.caption(f"{statements:,} statements, {size_kb:,.1f} KB, written in {elapsed:.2f}s")
+            if not split_migration_script:
+                with open(path, encoding="utf-8") as script_file:
+                    preview = "".join(line for _, line in zip(range(60), script_file))
+                st.code(preview, language="sql")
+            base_name = f"{source_db.lower()}_to_{target_db.lower()}_migration".replace(" ", "_")
+            st.download_button("📥 Download Migration Script", script_data,
+                               file_name=base_name + (".zip" if split_migration_script else ".sql"),
+                               mime="application/zip" if split_migration_script else "application/sql")
+        except Exception as e:
+            st.error(f"❌ Could not generate migration script: {str(e)}")
 
 def generate_complete_documentation(db_name, db_data, claude_client, include_ai_descriptions,
                                   include_diagrams, include_data_dictionary, include_performance_notes,
@@ -1340,6 +6323,8 @@ def generate_complete_documentation(db_name, db_data, claude_client, include_ai_
         
         # Generate documentation content
         html_content = generate_detailed_html_documentation(db_name, db_data)
+        if include_diagrams and db_data.get('tables'):
+            html_content += er_diagrams_html(schema_er_diagrams(db_data))
         markdown_content = generate_detailed_markdown_documentation(db_name, db_data)
         json_content = convert_to_json_schema(db_data)
         
@@ -1389,7 +6374,7 @@ def generate_complete_documentation(db_name, db_data, claude_client, include_ai_
         with col3:
             # JSON Download
             json_filename = f"{db_name.lower()}_schema.json"
-            json_str = json.dumps(json_content, indent=2)
+            json_str = json.dumps(json_content, indent=2, default=schema_json_default)
             st.download_button(
                 label="📋 Download JSON",
                 data=json_str,
@@ -1896,10 +6881,11 @@ def generate_pdf_documentation(db_name, db_data, markdown_content, doc_options=N
         story.append(Spacer(1, 24))
         
         # Database Statistics Summary
-        total_rows = sum(table.get('row_count', 0) for table in db_data.get('tables', []))
-        total_size = sum(table.get('size_mb', 0) for table in db_data.get('tables', []))
-        total_columns = sum(len(table.get('columns', [])) for table in db_data.get('tables', []))
-        total_indexes = sum(len(table.get('indexes', [])) for table in db_data.get('tables', []))
+        totals = schema_catalog(db_data).totals()
+        total_rows = totals['rows']
+        total_size = totals['size_mb']
+        total_columns = totals['columns']
+        total_indexes = totals['indexes']
         
         stats_data = [
             ['Metric', 'Count', 'Details'],
@@ -2347,10 +7333,11 @@ def generate_pdf_documentation(db_name, db_data, markdown_content, doc_options=N
         story.append(Spacer(1, 24))
         
         # Database Statistics Summary
-        total_rows = sum(table.get('row_count', 0) for table in db_data.get('tables', []))
-        total_size = sum(table.get('size_mb', 0) for table in db_data.get('tables', []))
-        total_columns = sum(len(table.get('columns', [])) for table in db_data.get('tables', []))
-        total_indexes = sum(len(table.get('indexes', [])) for table in db_data.get('tables', []))
+        totals = schema_catalog(db_data).totals()
+        total_rows = totals['rows']
+        total_size = totals['size_mb']
+        total_columns = totals['columns']
+        total_indexes = totals['indexes']
         
         stats_data = [
             ['Metric', 'Count', 'Details'],
@@ -2622,9 +7609,10 @@ def convert_to_json_schema(db_data):
             "row_count": table.get('row_count'),
             "size_mb": table.get('size_mb'),
             "description": table.get('description'),
-            "columns": table.get('columns', []),
-            "indexes": table.get('indexes', []),
-            "constraints": table.get('constraints', [])
+            # Plain dicts, so st.json and json.dumps see fields rather than record objects
+            "columns": [dict(c) for c in table.get('columns', [])],
+            "indexes": [dict(i) for i in table.get('indexes', [])],
+            "constraints": [dict(c) for c in table.get('constraints', [])]
         }
         schema["tables"].append(table_schema)
     